@@ -4,14 +4,21 @@ import os
 os.environ["MODAL_ENVIRONMENT"] = "ai-game"
 
 import asyncio
+import json
 import modal
-from pydantic import BaseModel, Field, field_validator
+from pydantic import BaseModel, Field, ValidationError, field_validator
 from typing import List, Dict, Optional, Literal
 import time
 import uuid
 import random
+import threading
+import zlib
 
 import prompts
+import spend
+import telemetry
+from json_repair import extract_json, parse_json_tolerant
+from state_backends import STATE_BACKEND, open_store
 
 # --- Input Validation Constants ---
 MAX_STRATEGY_LENGTH = 2000
@@ -365,14 +372,16 @@ def calculate_ranked_points(num_players: int, rank: int) -> int:
 image = modal.Image.debian_slim().pip_install(
     "pydantic",
     "shortuuid",
-    "requests",
-    "openai",
     "fastapi[standard]",
     "httpx",  # For async HTTP requests
     "pyyaml"  # For config loading
 ).add_local_dir("frontend/dist", remote_path="/assets"
 ).add_local_file("config.yaml", remote_path="/config.yaml"
-).add_local_file("backend/prompts.py", remote_path="/root/prompts.py")
+).add_local_file("backend/prompts.py", remote_path="/root/prompts.py"
+).add_local_file("backend/json_repair.py", remote_path="/root/json_repair.py"
+).add_local_file("backend/state_backends.py", remote_path="/root/state_backends.py"
+).add_local_file("backend/telemetry.py", remote_path="/root/telemetry.py"
+).add_local_file("backend/spend.py", remote_path="/root/spend.py")
 
 app = modal.App("survaive", image=image)
 
@@ -398,6 +407,16 @@ def load_config():
 # Load config at module level for easy access
 CONFIG = load_config()
 
+# Endpoint overrides, e.g. to point a local run at stub LLM/FAL servers
+if os.environ.get("SURVAIVE_LLM_BASE_URL"):
+    CONFIG["llm"]["base_url"] = os.environ["SURVAIVE_LLM_BASE_URL"]
+if os.environ.get("SURVAIVE_FAL_BASE_URL"):
+    CONFIG["image_generation"]["fal_base_url"] = os.environ["SURVAIVE_FAL_BASE_URL"]
+if os.environ.get("SURVAIVE_FAL_QUEUE_URL"):
+    CONFIG["image_generation"]["fal_queue_url"] = os.environ["SURVAIVE_FAL_QUEUE_URL"]
+
+telemetry.configure(json_lines=CONFIG.get("telemetry", {}).get("json_lines", False))
+
 # Helper functions to access config values
 def get_model(use_case: str) -> str:
     """Get the LLM model for a specific use case."""
@@ -429,63 +448,171 @@ def get_round_config() -> list[str]:
 
 
 # --- Clients ---
-def get_llm_client():
-    import openai
-    return openai.OpenAI(
-        base_url=CONFIG["llm"]["base_url"],
-        api_key=os.environ["MOONSHOT_API_KEY"],
-    )
-
-def generate_scenario_llm(round_num: int, max_rounds: int = 5):
-    """Generate a scenario with Corrupted Simulation narrative framing."""
-    client = get_llm_client()
+# One pooled httpx.AsyncClient per event loop. The ASGI app and the worker classes each
+# run on a single long-lived container loop, so every LLM/FAL call shares keep-alive
+# connections.
+_http_clients: dict = {}
+# Close tasks for clients of loops that have since closed (held so they aren't collected)
+_closing_http_clients: set = set()
 
-    prompt = prompts.format_prompt(
-        prompts.SCENARIO_GENERATION,
-        round_num=round_num,
-        max_rounds=max_rounds
-    )
 
+async def _close_stale_http_client(client):
     try:
-        print(f"SCENARIO GEN: Calling LLM for round {round_num}...", flush=True)
-        completion = client.chat.completions.create(
-            model=get_model("scenario_generation"),
-            messages=[{"role": "user", "content": prompt}],
-        )
-        result = completion.choices[0].message.content.strip()
-        print(f"SCENARIO GEN: Success - {result[:50]}...", flush=True)
-        return result
+        await client.aclose()
     except Exception as e:
-        import traceback
-        print(f"SCENARIO GEN Error: {type(e).__name__}: {e}", flush=True)
-        print(f"SCENARIO GEN Traceback: {traceback.format_exc()}", flush=True)
-        return prompts.FALLBACK_SCENARIO
+        print(f"HTTP: Could not close a stale client: {e}", flush=True)
 
 
-async def generate_last_stand_scenario_async():
-    """Generate the EVIL SANTA final boss scenario."""
+def get_http_client():
+    """Get the shared pooled AsyncClient for the running event loop."""
     import httpx
 
+    loop = asyncio.get_running_loop()
+    client = _http_clients.get(loop)
+    if client is None or client.is_closed:
+        # Close clients that belonged to loops that have since closed so their pools release sockets
+        for stale_loop in [l for l in _http_clients if l.is_closed()]:
+            stale = _http_clients.pop(stale_loop)
+            if not stale.is_closed:
+                task = loop.create_task(_close_stale_http_client(stale))
+                _closing_http_clients.add(task)
+                task.add_done_callback(_closing_http_clients.discard)
+        client = httpx.AsyncClient(
+            timeout=float(CONFIG["llm"]["default_timeout_seconds"]),
+            limits=httpx.Limits(max_connections=100, max_keepalive_connections=20),
+        )
+        _http_clients[loop] = client
+    return client
+
+
+async def close_http_client():
+    """Close the pooled client for the running event loop (app shutdown)."""
+    client = _http_clients.pop(asyncio.get_running_loop(), None)
+    if client is not None:
+        await client.aclose()
+
+
+# --- LLM Response Schemas ---
+# Sent to the provider as a JSON-schema response_format and used to validate locally.
+
+class JudgementResponse(BaseModel):
+    survived: bool
+    reason: str
+    visual_prompt: str
+
+class RankedEntry(BaseModel):
+    player_id: str
+    rank: int
+    commentary: str
+    visual_prompt: str
+
+class RankedResponse(BaseModel):
+    rankings: List[RankedEntry]
+
+class SacrificeResponse(BaseModel):
+    epic: bool
+    reason: str
+    visual_prompt: str
+
+class SacrificeTimeoutDeath(BaseModel):
+    player_id: str
+    reason: str
+    visual_prompt: str
+
+class SacrificeTimeoutDeathsResponse(BaseModel):
+    deaths: List[SacrificeTimeoutDeath]
+
+class VideoScriptResponse(BaseModel):
+    scene: str
+    audio_type: str
+    audio: str
+    voice: str
+    sfx: str
+
+class VideoScriptBatchEntry(BaseModel):
+    player_id: str
+    winner: VideoScriptResponse
+    loser: VideoScriptResponse
+
+class VideoScriptBatchResponse(BaseModel):
+    scripts: List[VideoScriptBatchEntry]
+
+
+def build_response_format(response_model: type[BaseModel]) -> dict:
+    """Build an OpenAI-style JSON-schema response_format for a response model."""
+    return {
+        "type": "json_schema",
+        "json_schema": {
+            "name": response_model.__name__,
+            "schema": response_model.model_json_schema(),
+        },
+    }
+
+
+async def chat_completion_async(
+    use_case: str,
+    prompt: str,
+    timeout: float | None = None,
+    response_model: type[BaseModel] | None = None,
+    temperature: float | None = None,
+) -> str:
+    """Call /chat/completions with the model configured for use_case and return the message content.
+
+    When a response_model is given (and llm.structured_output is enabled), the request
+    asks the provider for schema-constrained JSON. Providers that reject response_format
+    with a 400 are retried once as a plain prompt.
+    """
+    payload = {
+        "model": get_model(use_case),
+        "messages": [{"role": "user", "content": prompt}]
+    }
+    if temperature is not None:
+        payload["temperature"] = temperature
+    if response_model is not None and CONFIG["llm"].get("structured_output", True):
+        payload["response_format"] = build_response_format(response_model)
+
+    if timeout is None:
+        timeout = CONFIG["llm"]["default_timeout_seconds"]
+
+    url = f"{CONFIG['llm']['base_url']}/chat/completions"
+    headers = {
+        "Authorization": f"Bearer {os.environ['MOONSHOT_API_KEY']}",
+        "Content-Type": "application/json"
+    }
+    client = get_http_client()
+    with telemetry.span("llm", use_case=use_case) as span:
+        response = await client.post(url, headers=headers, json=payload, timeout=float(timeout))
+        if response.status_code == 400 and "response_format" in payload:
+            print(f"LLM [{use_case}]: response_format rejected, retrying without schema", flush=True)
+            del payload["response_format"]
+            response = await client.post(url, headers=headers, json=payload, timeout=float(timeout))
+        span["status"] = response.status_code
+        response.raise_for_status()
+        data = response.json()
+    meter_llm_call(use_case, payload["model"], data.get("usage"))
+    return data["choices"][0]["message"]["content"]
+
+
+def validate_llm_json(parsed, response_model: type[BaseModel] | None) -> dict | None:
+    """Validate parsed JSON against a response model, returning a plain dict or None."""
+    if not isinstance(parsed, dict):
+        return None
+    if response_model is None:
+        return parsed
+    try:
+        return response_model.model_validate(parsed).model_dump()
+    except ValidationError as e:
+        print(f"LLM JSON: {response_model.__name__} validation failed: {e.error_count()} errors", flush=True)
+        return None
+
+
+async def generate_last_stand_scenario_async():
+    """Generate the EVIL SANTA final boss scenario."""
     prompt = prompts.LAST_STAND_SCENARIO
 
     try:
         print(f"LAST STAND SCENARIO: Generating Evil Santa scenario...", flush=True)
-        timeout = CONFIG["llm"]["default_timeout_seconds"]
-        async with httpx.AsyncClient(timeout=float(timeout)) as client:
-            response = await client.post(
-                f"{CONFIG['llm']['base_url']}/chat/completions",
-                headers={
-                    "Authorization": f"Bearer {os.environ['MOONSHOT_API_KEY']}",
-                    "Content-Type": "application/json"
-                },
-                json={
-                    "model": get_model("scenario_generation"),
-                    "messages": [{"role": "user", "content": prompt}]
-                }
-            )
-            response.raise_for_status()
-            data = response.json()
-            result = data["choices"][0]["message"]["content"].strip()
+        result = (await chat_completion_async("scenario_generation", prompt)).strip()
         print(f"LAST STAND SCENARIO: Success - {result[:50]}...", flush=True)
         return result
     except Exception as e:
@@ -496,9 +623,7 @@ async def generate_last_stand_scenario_async():
 
 
 async def generate_scenario_llm_async(round_num: int, max_rounds: int = 5):
-    """Async version of generate_scenario_llm for parallel pre-warming."""
-    import httpx
-
+    """Generate a scenario with Corrupted Simulation narrative framing."""
     prompt = prompts.format_prompt(
         prompts.SCENARIO_GENERATION,
         round_num=round_num,
@@ -507,22 +632,7 @@ async def generate_scenario_llm_async(round_num: int, max_rounds: int = 5):
 
     try:
         print(f"SCENARIO GEN ASYNC: Calling LLM for round {round_num}...", flush=True)
-        timeout = CONFIG["llm"]["default_timeout_seconds"]
-        async with httpx.AsyncClient(timeout=float(timeout)) as client:
-            response = await client.post(
-                f"{CONFIG['llm']['base_url']}/chat/completions",
-                headers={
-                    "Authorization": f"Bearer {os.environ['MOONSHOT_API_KEY']}",
-                    "Content-Type": "application/json"
-                },
-                json={
-                    "model": get_model("scenario_generation"),
-                    "messages": [{"role": "user", "content": prompt}]
-                }
-            )
-            response.raise_for_status()
-            data = response.json()
-            result = data["choices"][0]["message"]["content"].strip()
+        result = (await chat_completion_async("scenario_generation", prompt)).strip()
         print(f"SCENARIO GEN ASYNC: Success round {round_num} - {result[:50]}...", flush=True)
         return result
     except Exception as e:
@@ -533,9 +643,7 @@ async def generate_scenario_llm_async(round_num: int, max_rounds: int = 5):
 
 
 async def judge_strategy_llm_async(scenario: str, strategy: str):
-    """Async version of judge_strategy_llm for parallel execution with simulation flavor."""
-    import re
-    import httpx
+    """Judge one survival strategy against the scenario, returning the verdict as a JSON string (the fallback verdict on failure)."""
 
     prompt = prompts.format_prompt(
         prompts.STRATEGY_JUDGEMENT,
@@ -544,51 +652,26 @@ async def judge_strategy_llm_async(scenario: str, strategy: str):
     )
     try:
         print(f"LLM Judge: Calling API for strategy: {strategy[:50]}...", flush=True)
-        timeout = CONFIG["llm"]["default_timeout_seconds"]
-        async with httpx.AsyncClient(timeout=float(timeout)) as client:
-            response = await client.post(
-                f"{CONFIG['llm']['base_url']}/chat/completions",
-                headers={
-                    "Authorization": f"Bearer {os.environ['MOONSHOT_API_KEY']}",
-                    "Content-Type": "application/json"
-                },
-                json={
-                    "model": get_model("strategy_judgement"),
-                    "messages": [{"role": "user", "content": prompt}]
-                }
-            )
-            response.raise_for_status()
-            data = response.json()
-            content = data["choices"][0]["message"]["content"]
-
+        content = await chat_completion_async(
+            "strategy_judgement", prompt, response_model=JudgementResponse
+        )
         print(f"LLM Judge: Raw response: {content[:200]}...", flush=True)
 
-        # Try to extract JSON from markdown code blocks if present
-        json_match = re.search(r'```(?:json)?\s*([\s\S]*?)\s*```', content)
-        if json_match:
-            content = json_match.group(1)
-
-        # Also try to find JSON object directly
-        json_obj_match = re.search(r'\{[\s\S]*\}', content)
-        if json_obj_match:
-            content = json_obj_match.group(0)
-
-        return content.strip()
+        result = await parse_json_with_repair(content, "judge", JudgementResponse)
+        if result is not None:
+            return json.dumps(result)
+        print(f"LLM Judge: Unparseable judgement, using fallback", flush=True)
     except Exception as e:
         print(f"LLM Judge Error: {e}", flush=True)
-        return prompts.FALLBACK_STRATEGY_JUDGEMENT
+    return prompts.FALLBACK_STRATEGY_JUDGEMENT
 
 
 async def rank_all_strategies_llm_async(scenario: str, strategies: list[dict]) -> str:
     """Rank all strategies comparatively for ranked rounds."""
-    import re
-    import httpx
-    import json
-    import random
 
-    # Build strategies list for prompt
+    # Build strategies list for prompt; the rankings must name players by these IDs
     strategy_list = "\n".join([
-        f"PLAYER {i+1} ({s['name']}): {s['strategy']}"
+        f"PLAYER {i+1} - {s['name']} (ID: {s['player_id']}): {s['strategy']}"
         for i, s in enumerate(strategies)
     ])
 
@@ -601,30 +684,17 @@ async def rank_all_strategies_llm_async(scenario: str, strategies: list[dict]) -
 
     try:
         print(f"RANKED JUDGE: Calling LLM for {len(strategies)} strategies...", flush=True)
-        timeout = CONFIG["llm"]["extended_timeout_seconds"]
-        async with httpx.AsyncClient(timeout=float(timeout)) as client:
-            response = await client.post(
-                f"{CONFIG['llm']['base_url']}/chat/completions",
-                headers={
-                    "Authorization": f"Bearer {os.environ['MOONSHOT_API_KEY']}",
-                    "Content-Type": "application/json"
-                },
-                json={
-                    "model": get_model("ranked_judgement"),
-                    "messages": [{"role": "user", "content": prompt}]
-                }
-            )
-            response.raise_for_status()
-            data = response.json()
-            content = data["choices"][0]["message"]["content"]
-
-            print(f"RANKED JUDGE: Raw response: {content[:300]}...", flush=True)
+        content = await chat_completion_async(
+            "ranked_judgement", prompt,
+            timeout=CONFIG["llm"]["extended_timeout_seconds"],
+            response_model=RankedResponse
+        )
+        print(f"RANKED JUDGE: Raw response: {content[:300]}...", flush=True)
 
-            # Extract JSON from potential markdown code blocks
-            json_match = re.search(r'\{[\s\S]*\}', content)
-            if json_match:
-                return json_match.group(0)
-            return content.strip()
+        result = await parse_json_with_repair(content, "ranked", RankedResponse)
+        if result is None:
+            raise ValueError("Unparseable ranking response")
+        return json.dumps(result)
     except Exception as e:
         print(f"RANKED JUDGE Error: {e}", flush=True)
         # Return fallback with random ordering
@@ -641,9 +711,7 @@ async def rank_all_strategies_llm_async(scenario: str, strategies: list[dict]) -
 
 
 async def generate_image_fal_async(prompt: str, use_case: str = "result_image"):
-    """Async version of generate_image_fal for parallel execution."""
-    import httpx
-
+    """Generate an image with FAL for the given use case, returning its URL (or None)."""
     url = get_image_url(use_case)
     headers = {
         "Authorization": f"Key {os.environ['FAL_KEY']}",
@@ -656,10 +724,11 @@ async def generate_image_fal_async(prompt: str, use_case: str = "result_image"):
     }
     try:
         timeout = CONFIG["image_generation"]["timeout_seconds"]
-        async with httpx.AsyncClient(timeout=float(timeout)) as client:
-            response = await client.post(url, json=payload, headers=headers)
+        with telemetry.span("fal_image", use_case=use_case):
+            response = await get_http_client().post(url, json=payload, headers=headers, timeout=float(timeout))
             response.raise_for_status()
-            return response.json()["images"][0]["url"]
+        meter_image(use_case)
+        return response.json()["images"][0]["url"]
     except Exception as e:
         print(f"FAL Error: {e}", flush=True)
         return None
@@ -667,8 +736,6 @@ async def generate_image_fal_async(prompt: str, use_case: str = "result_image"):
 
 async def generate_character_image_async(character_prompt: str, style_theme: str | None = None):
     """Generate a character avatar image based on the player's description with game style."""
-    import httpx
-
     # Pick a random style theme if not provided
     if not style_theme:
         style_theme = random.choice(IMAGE_STYLE_THEMES)
@@ -724,56 +791,18 @@ async def generate_character_image_async(character_prompt: str, style_theme: str
     }
     try:
         timeout = CONFIG["image_generation"]["timeout_seconds"]
-        async with httpx.AsyncClient(timeout=float(timeout)) as client:
-            response = await client.post(url, json=payload, headers=headers)
+        with telemetry.span("fal_image", use_case="character_image"):
+            response = await get_http_client().post(url, json=payload, headers=headers, timeout=float(timeout))
             response.raise_for_status()
-            return response.json()["images"][0]["url"]
+        meter_image("character_image")
+        return response.json()["images"][0]["url"]
     except Exception as e:
         print(f"Character Image Error: {e}", flush=True)
         return None
 
 
-# Keep sync versions for backwards compatibility
-def judge_strategy_llm(scenario: str, strategy: str):
-    """Sync version of judgement with simulation flavor."""
-    import re
-    client = get_llm_client()
-    prompt = prompts.format_prompt(
-        prompts.STRATEGY_JUDGEMENT,
-        scenario=scenario,
-        strategy=strategy
-    )
-    try:
-        print(f"LLM Judge: Calling API for strategy: {strategy[:50]}...", flush=True)
-        completion = client.chat.completions.create(
-            model=get_model("strategy_judgement"),
-            messages=[{"role": "user", "content": prompt}],
-        )
-        content = completion.choices[0].message.content
-        print(f"LLM Judge: Raw response: {content[:200]}...", flush=True)
-
-        # Try to extract JSON from markdown code blocks if present
-        json_match = re.search(r'```(?:json)?\s*([\s\S]*?)\s*```', content)
-        if json_match:
-            content = json_match.group(1)
-
-        # Also try to find JSON object directly
-        json_obj_match = re.search(r'\{[\s\S]*\}', content)
-        if json_obj_match:
-            content = json_obj_match.group(0)
-
-        return content.strip()
-    except Exception as e:
-        print(f"LLM Judge Error: {e}", flush=True)
-        return prompts.FALLBACK_STRATEGY_JUDGEMENT
-
-
-async def repair_json_with_llm(malformed_json: str, player_name: str) -> dict | None:
-    """Use Kimi K2 to repair malformed JSON from video script generation."""
-    import httpx
-    import json
-    import re
-
+async def repair_json_with_llm(malformed_json: str, label: str, response_model: type[BaseModel] | None = None) -> dict | None:
+    """Ask the LLM to repair malformed JSON - last resort after local repair has failed."""
     repair_prompt = f"""Fix this malformed JSON. It has invalid control characters or syntax errors.
 Do not change the content/meaning, just fix the JSON syntax (escape special characters, fix quotes, etc).
 
@@ -783,50 +812,42 @@ Malformed JSON:
 IMPORTANT: Output ONLY the corrected valid JSON object. No explanation, no markdown, no code blocks - just the raw JSON."""
 
     try:
-        async with httpx.AsyncClient(timeout=30.0) as client:
-            response = await client.post(
-                f"{CONFIG['llm']['base_url']}/chat/completions",
-                headers={
-                    "Authorization": f"Bearer {os.environ['MOONSHOT_API_KEY']}",
-                    "Content-Type": "application/json"
-                },
-                json={
-                    "model": "moonshotai/kimi-k2-0905",
-                    "messages": [{"role": "user", "content": repair_prompt}]
-                }
-            )
-            response.raise_for_status()
-            data = response.json()
-            content = data["choices"][0]["message"]["content"]
-
-            json_match = re.search(r'\{[\s\S]*\}', content)
-            if json_match:
-                result = json.loads(json_match.group(0))
-                print(f"JSON REPAIR [{player_name}]: Successfully repaired JSON", flush=True)
-                return result
+        content = await chat_completion_async(
+            "json_repair", repair_prompt, timeout=30.0, response_model=response_model
+        )
+        result = validate_llm_json(parse_json_tolerant(content), response_model)
+        if result is not None:
+            print(f"JSON REPAIR [{label}]: Successfully repaired JSON", flush=True)
+            return result
+        print(f"JSON REPAIR [{label}]: Repaired output still invalid", flush=True)
     except Exception as e:
-        print(f"JSON REPAIR [{player_name}]: Repair failed: {e}", flush=True)
+        print(f"JSON REPAIR [{label}]: Repair failed: {e}", flush=True)
 
     return None
 
 
-async def parse_json_with_repair(json_str: str, player_name: str) -> dict | None:
-    """Try to parse JSON, repair with LLM if invalid."""
-    import json
+async def parse_json_with_repair(content: str, label: str, response_model: type[BaseModel] | None = None) -> dict | None:
+    """Parse (and optionally validate) JSON from an LLM response.
 
-    try:
-        return json.loads(json_str)
-    except json.JSONDecodeError as e:
-        print(f"JSON PARSE [{player_name}]: Invalid JSON, attempting repair: {e}", flush=True)
+    Tries the local tolerant parser first (code fences, control characters,
+    trailing commas, unescaped quotes) and only falls back to an LLM repair
+    round trip when that fails.
+    """
+    with telemetry.span("json_parse", label=label) as span:
+        result = validate_llm_json(parse_json_tolerant(content), response_model)
+        span["parsed"] = result is not None
+    if result is not None:
+        return result
 
-    return await repair_json_with_llm(json_str, player_name)
+    print(f"JSON PARSE [{label}]: Local parse failed, attempting LLM repair", flush=True)
+    with telemetry.span("json_repair", label=label) as span:
+        result = await repair_json_with_llm(extract_json(content) or content, label, response_model)
+        span["repaired"] = result is not None
+    return result
 
 
 async def generate_video_prompt_llm_async(player_name: str, rank: int, total_players: int, score: int, video_theme: str):
     """Use a fast LLM to generate personalized video scene and dialogue with simulation narrative."""
-    import httpx
-    import json
-    import re
 
     is_winner = rank == 1
     is_last = rank == total_players
@@ -843,29 +864,13 @@ async def generate_video_prompt_llm_async(player_name: str, rank: int, total_pla
     )
 
     try:
-        async with httpx.AsyncClient(timeout=30.0) as client:
-            response = await client.post(
-                f"{CONFIG['llm']['base_url']}/chat/completions",
-                headers={
-                    "Authorization": f"Bearer {os.environ['MOONSHOT_API_KEY']}",
-                    "Content-Type": "application/json"
-                },
-                json={
-                    "model": get_model("video_script_generation"),
-                    "messages": [{"role": "user", "content": prompt}]
-                }
-            )
-            response.raise_for_status()
-            data = response.json()
-            content = data["choices"][0]["message"]["content"]
-
-            # Extract JSON
-            json_match = re.search(r'\{[\s\S]*\}', content)
-            if json_match:
-                result = await parse_json_with_repair(json_match.group(0), player_name)
-                if result:
-                    print(f"VIDEO PROMPT LLM: Generated for {player_name}: {result}", flush=True)
-                    return result
+        content = await chat_completion_async(
+            "video_script_generation", prompt, timeout=30.0, response_model=VideoScriptResponse
+        )
+        result = await parse_json_with_repair(content, player_name, VideoScriptResponse)
+        if result:
+            print(f"VIDEO PROMPT LLM: Generated for {player_name}: {result}", flush=True)
+            return result
 
     except Exception as e:
         print(f"VIDEO PROMPT LLM Error for {player_name}: {e}", flush=True)
@@ -890,9 +895,6 @@ async def generate_video_prompt_llm_async(player_name: str, rank: int, total_pla
 
 async def generate_video_prompt_winner_async(player_name: str, video_theme: str):
     """Generate winner video script using LLM - triumphant tone."""
-    import httpx
-    import json
-    import re
 
     # Get duration and calculate word limit
     duration = CONFIG["video_generation"]["duration_seconds"]
@@ -907,28 +909,13 @@ async def generate_video_prompt_winner_async(player_name: str, video_theme: str)
     )
 
     try:
-        async with httpx.AsyncClient(timeout=30.0) as client:
-            response = await client.post(
-                f"{CONFIG['llm']['base_url']}/chat/completions",
-                headers={
-                    "Authorization": f"Bearer {os.environ['MOONSHOT_API_KEY']}",
-                    "Content-Type": "application/json"
-                },
-                json={
-                    "model": get_model("video_script_generation"),
-                    "messages": [{"role": "user", "content": prompt}]
-                }
-            )
-            response.raise_for_status()
-            data = response.json()
-            content = data["choices"][0]["message"]["content"]
-
-            json_match = re.search(r'\{[\s\S]*\}', content)
-            if json_match:
-                result = await parse_json_with_repair(json_match.group(0), player_name)
-                if result:
-                    print(f"VIDEO WINNER PROMPT: Generated for {player_name} (audio_type: {result.get('audio_type', 'dialogue')})", flush=True)
-                    return result
+        content = await chat_completion_async(
+            "video_script_generation", prompt, timeout=30.0, response_model=VideoScriptResponse
+        )
+        result = await parse_json_with_repair(content, player_name, VideoScriptResponse)
+        if result:
+            print(f"VIDEO WINNER PROMPT: Generated for {player_name} (audio_type: {result.get('audio_type', 'dialogue')})", flush=True)
+            return result
 
     except Exception as e:
         print(f"VIDEO WINNER PROMPT Error for {player_name}: {e}", flush=True)
@@ -941,9 +928,6 @@ async def generate_video_prompt_winner_async(player_name: str, video_theme: str)
 
 async def generate_video_prompt_loser_async(player_name: str, video_theme: str):
     """Generate loser video script using LLM - consoling but humorous tone."""
-    import httpx
-    import json
-    import re
 
     # Get duration and calculate word limit
     duration = CONFIG["video_generation"]["duration_seconds"]
@@ -958,28 +942,13 @@ async def generate_video_prompt_loser_async(player_name: str, video_theme: str):
     )
 
     try:
-        async with httpx.AsyncClient(timeout=30.0) as client:
-            response = await client.post(
-                f"{CONFIG['llm']['base_url']}/chat/completions",
-                headers={
-                    "Authorization": f"Bearer {os.environ['MOONSHOT_API_KEY']}",
-                    "Content-Type": "application/json"
-                },
-                json={
-                    "model": get_model("video_script_generation"),
-                    "messages": [{"role": "user", "content": prompt}]
-                }
-            )
-            response.raise_for_status()
-            data = response.json()
-            content = data["choices"][0]["message"]["content"]
-
-            json_match = re.search(r'\{[\s\S]*\}', content)
-            if json_match:
-                result = await parse_json_with_repair(json_match.group(0), player_name)
-                if result:
-                    print(f"VIDEO LOSER PROMPT: Generated for {player_name} (audio_type: {result.get('audio_type', 'dialogue')})", flush=True)
-                    return result
+        content = await chat_completion_async(
+            "video_script_generation", prompt, timeout=30.0, response_model=VideoScriptResponse
+        )
+        result = await parse_json_with_repair(content, player_name, VideoScriptResponse)
+        if result:
+            print(f"VIDEO LOSER PROMPT: Generated for {player_name} (audio_type: {result.get('audio_type', 'dialogue')})", flush=True)
+            return result
 
     except Exception as e:
         print(f"VIDEO LOSER PROMPT Error for {player_name}: {e}", flush=True)
@@ -990,26 +959,89 @@ async def generate_video_prompt_loser_async(player_name: str, video_theme: str):
     return fallback
 
 
-def generate_image_fal(prompt: str, use_case: str = "result_image"):
-    import requests
-    url = get_image_url(use_case)
-    headers = {
-        "Authorization": f"Key {os.environ['FAL_KEY']}",
-        "Content-Type": "application/json"
-    }
-    payload = {
-        "prompt": prompt,
-        "image_size": CONFIG["image_generation"]["default_image_size"],
-        "num_inference_steps": CONFIG["image_generation"]["num_inference_steps"]
+def validate_video_script(script) -> dict | None:
+    """Return a cleaned video script dict, or None if required fields are missing."""
+    if not isinstance(script, dict):
+        return None
+    scene = script.get("scene")
+    audio = script.get("audio")
+    if not isinstance(scene, str) or not scene.strip():
+        return None
+    if not isinstance(audio, str) or not audio.strip():
+        return None
+
+    audio_type = script.get("audio_type")
+    if audio_type not in ("dialogue", "singing", "narration"):
+        audio_type = "dialogue"
+
+    return {
+        "scene": scene.strip(),
+        "audio_type": audio_type,
+        "audio": audio.strip(),
+        "voice": script.get("voice") or "enthusiastic announcer voice",
+        "sfx": script.get("sfx") or "crowd cheering, dramatic music",
     }
+
+
+async def generate_video_scripts_batch_async(players: list[tuple[str, str]], video_theme: str) -> dict[str, dict]:
+    """Generate winner AND loser video scripts for every player in a single LLM call.
+
+    Args:
+        players: List of (player_id, player_name) tuples
+        video_theme: The visual theme/setting shared by all videos
+
+    Returns:
+        {player_id: {"winner": {...}, "loser": {...}}} containing only the scripts
+        that validated. Callers fall back per player for anything missing.
+    """
+    if not players:
+        return {}
+
+    duration = CONFIG["video_generation"]["duration_seconds"]
+    word_limit = prompts.get_word_limit_for_duration(duration)
+    player_list = "\n".join(f"- {pid}: {name}" for pid, name in players)
+
+    prompt = prompts.format_prompt(
+        prompts.VIDEO_SCRIPT_BATCH,
+        video_theme=video_theme,
+        player_list=player_list,
+        duration=duration,
+        word_limit=word_limit
+    )
+
+    scripts = {}
     try:
-        timeout = CONFIG["image_generation"]["timeout_seconds"]
-        response = requests.post(url, json=payload, headers=headers, timeout=timeout)
-        response.raise_for_status()
-        return response.json()["images"][0]["url"]
+        content = await chat_completion_async(
+            "video_script_generation", prompt,
+            timeout=CONFIG["llm"]["extended_timeout_seconds"],
+            response_model=VideoScriptBatchResponse
+        )
+
+        # Parse without the batch schema so one malformed entry doesn't reject the rest
+        result = await parse_json_with_repair(content, "batch")
+        entries = result.get("scripts", []) if isinstance(result, dict) else []
+        if not isinstance(entries, list):
+            entries = []
+
+        # Validate each entry on its own so one bad script doesn't sink the batch
+        names = dict(players)
+        for entry in entries:
+            if not isinstance(entry, dict) or entry.get("player_id") not in names:
+                continue
+            pid = entry["player_id"]
+            player_scripts = {}
+            for video_type in ("winner", "loser"):
+                script = validate_video_script(entry.get(video_type))
+                if script:
+                    player_scripts[video_type] = script
+            if player_scripts:
+                scripts[pid] = player_scripts
+
+        print(f"VIDEO BATCH PROMPT: Got valid scripts for {len(scripts)}/{len(players)} players", flush=True)
     except Exception as e:
-        print(f"FAL Error: {e}")
-        return None
+        print(f"VIDEO BATCH PROMPT Error: {e}", flush=True)
+
+    return scripts
 
 
 async def submit_video_request_async(player_name: str, image_url: str, script_data: dict, video_theme: str, client: "httpx.AsyncClient"):
@@ -1034,13 +1066,15 @@ async def submit_video_request_async(player_name: str, image_url: str, script_da
 
     try:
         print(f"VIDEO SUBMIT [{player_name}]: Submitting request...", flush=True)
-        response = await client.post(submit_url, json=payload, headers=headers)
-        response.raise_for_status()
+        with telemetry.span("fal_submit"):
+            response = await client.post(submit_url, json=payload, headers=headers)
+            response.raise_for_status()
         queue_data = response.json()
         request_id = queue_data.get("request_id")
 
         if request_id:
             print(f"VIDEO SUBMIT [{player_name}]: Got request_id: {request_id}", flush=True)
+            meter_video(int(duration))
         else:
             print(f"VIDEO SUBMIT [{player_name}]: No request_id in response: {queue_data}", flush=True)
 
@@ -1050,23 +1084,50 @@ async def submit_video_request_async(player_name: str, image_url: str, script_da
         return None
 
 
-async def poll_video_status_async(player_name: str, request_id: str, client: "httpx.AsyncClient"):
-    """Poll for video completion given a request_id."""
-    import asyncio
-    import json
-
-    if not request_id:
-        return None
-
+def video_request_url(request_id: str) -> str:
+    """Base URL for a queued video request (status/result/cancel hang off it)."""
     # FAL queue API uses base model path for status/result (not full endpoint path)
     # Submit: fal-ai/kling-video/v2.6/pro/image-to-video
     # Status/Result: fal-ai/kling-video/requests/{request_id}/...
     fal_queue_url = CONFIG["image_generation"]["fal_queue_url"]
     full_model = CONFIG["video_generation"]["model"]
     base_model = "/".join(full_model.split("/")[:2])  # "fal-ai/kling-video"
+    return f"{fal_queue_url}/{base_model}/requests/{request_id}"
+
 
-    status_url = f"{fal_queue_url}/{base_model}/requests/{request_id}/status"
-    result_url = f"{fal_queue_url}/{base_model}/requests/{request_id}"
+async def cancel_video_request_async(player_name: str, request_id: str, client: "httpx.AsyncClient"):
+    """Ask FAL to drop a queued/running video we no longer want, freeing the queue slot."""
+    headers = {"Authorization": f"Key {os.environ['FAL_KEY']}"}
+    try:
+        response = await client.put(f"{video_request_url(request_id)}/cancel", headers=headers)
+        print(f"VIDEO CANCEL [{player_name}]: HTTP {response.status_code}", flush=True)
+    except Exception as e:
+        print(f"VIDEO CANCEL Error [{player_name}]: {e}", flush=True)
+
+
+async def poll_video_status_async(player_name: str, request_id: str, client: "httpx.AsyncClient"):
+    """Poll for video completion given a request_id.
+
+    If polling gives up or the worker is cancelled, the FAL request is cancelled too.
+    """
+
+    if not request_id:
+        return None
+
+    try:
+        with telemetry.span("fal_wait") as span:
+            video_url = await _poll_video_status(player_name, request_id, client)
+            span["completed"] = video_url is not None
+            return video_url
+    except asyncio.CancelledError:
+        # Shielded so the cancel request still goes out while this task unwinds
+        await asyncio.shield(cancel_video_request_async(player_name, request_id, client))
+        raise
+
+
+async def _poll_video_status(player_name: str, request_id: str, client: "httpx.AsyncClient"):
+    status_url = f"{video_request_url(request_id)}/status"
+    result_url = video_request_url(request_id)
     headers = {
         "Authorization": f"Key {os.environ['FAL_KEY']}",
         "Content-Type": "application/json"
@@ -1112,6 +1173,7 @@ async def poll_video_status_async(player_name: str, request_id: str, client: "ht
             # Continue polling on transient errors
 
     print(f"VIDEO POLL [{player_name}]: Timeout after max attempts", flush=True)
+    await cancel_video_request_async(player_name, request_id, client)
     return None
 
 
@@ -1127,7 +1189,9 @@ class Player(BaseModel):
     survival_reason: Optional[str] = None  # How they survived
     strategy: Optional[str] = None  # Current round strategy
     result_image_url: Optional[str] = None # Image of death or glory
+    result_image_pending: bool = False  # True when the verdict is published but its image is still rendering
     judgement_pending: bool = False  # True when judgement is in progress for this player
+    judgement_claimed_at: Optional[float] = None  # When judgement_pending was set (stale claims get the fallback verdict)
     last_active: float = Field(default_factory=time.time) # Heartbeat
     # Character creation fields
     character_description: Optional[str] = None  # Combined prompt for image gen
@@ -1187,6 +1251,9 @@ class Round(BaseModel):
     vote_start_time: Optional[float] = None        # When voting phase started
     timed_out_players: Dict[str, bool] = {}        # player_id -> True if timed out
 
+    # True once the full round has moved to round_archive (only a summary stays here)
+    archived: bool = False
+
 class GameState(BaseModel):
     id: str
     code: str
@@ -1207,24 +1274,521 @@ class GameState(BaseModel):
     videos_started_at: Optional[float] = None  # Timestamp when video generation started (for stuck-job detection)
     video_theme: Optional[str] = None  # Consistent theme for all videos
     winner_id: Optional[str] = None
+    revision: str = ""  # Changes on every save (mirrored in game_revisions for cache checks)
+    updated_at: Optional[float] = None  # Last save, used for TTL eviction
+
+# --- Persistent Storage ---
+# Stores open on the backend chosen by SURVAIVE_STATE_BACKEND (modal.Dict when deployed,
+# memory/sqlite for local runs - see state_backends.py).
+# Game states live in a sharded registry (see Game Registry below). Key=GameCode
+GAME_SHARD_COUNT = CONFIG.get("registry", {}).get("shards", 8)
+game_shards = [
+    open_store(f"survaive-games-{i}")
+    for i in range(GAME_SHARD_COUNT)
+]
+# Pre-sharding single Dict; read as a fallback and migrated into the shards on access
+games = open_store("survaive-games")
+# Warm-pool demand per active game (code -> {"players", "updated_at"}) and
+# per-container worker warm/cold counters (MODAL_TASK_ID -> counters)
+warm_pool_demand = open_store("survaive-warm-pool")
+worker_stats = open_store("survaive-worker-stats")
+# Completed rounds, moved out of the hot game document. Key = f"{code}:{round_idx}"
+round_archive = open_store("survaive-round-archive")
+# Revision stamp per game, bumped by every save. Key=GameCode
+game_revisions = open_store("survaive-game-revisions")
+# Player presence per game (code -> {player_id: last_seen}), written in batches
+presence = open_store("survaive-presence")
+# Speculative sacrifice outcome images. Key = f"{code}:{round_idx}"
+sacrifice_prerenders = open_store("survaive-sacrifice-prerenders")
+# Speculative coop verdicts, one per submitted strategy. Key = f"{code}:{round_idx}:{player_id}"
+coop_prejudgements = open_store("survaive-coop-prejudgements")
+# Background calls spawned once per round (or game). Key = f"{code}:{round_idx}:{method}" or f"{code}:{method}"
+spawned_calls = open_store("survaive-spawned-calls")
+# In-flight round-scoped calls (code:round_idx -> {call_id: method}), cancelled when the round ends
+round_calls = open_store("survaive-round-calls")
+# Token/image/video meters per game, one slot per container. Key = f"{code}:{n}" -> {"source", "meters"}
+game_spend = open_store("survaive-game-spend")
+
+# --- Secrets ---
+# Use Modal's secret storage - create with: modal secret create ai-game-secrets MOONSHOT_API_KEY=xxx FAL_KEY=xxx
+secrets = [modal.Secret.from_name("ai-game-secrets")]
+
+# --- Helper Functions ---
+# GameState fields whose default_factory reads config.yaml
+CONFIG_DERIVED_FIELDS = ("max_rounds", "round_config")
+
+
+def encode_game(game: GameState) -> bytes:
+    """Compact storage encoding: JSON bytes with default-valued fields left out.
+
+    Each round only carries the fields its round type actually touched, so the empty
+    per-type dicts (trap_proposals, coop_votes, sacrifice_votes, ranked_*, ...) and
+    unset optionals never reach storage. Decoding restores them from the model defaults.
+    Config-derived fields are always written: their defaults come from the live config,
+    so a redeploy with a new round plan must not change games already in progress.
+    """
+    data = game.model_dump(mode="json", exclude_defaults=True)
+    for field in CONFIG_DERIVED_FIELDS:
+        data[field] = getattr(game, field)
+    return json.dumps(data, separators=(",", ":")).encode()
+
+
+def decode_game(data) -> GameState:
+    """Decode a stored game; legacy records are plain model_dump() dicts."""
+    if isinstance(data, dict):
+        return GameState.model_validate(data)
+    return GameState.model_validate_json(data)
+
+
+def get_game(code: str) -> Optional[GameState]:
+    if not code:
+        return None
+    with telemetry.span("state_read"):
+        data = game_shard(code).get(code)
+        game = decode_game(data) if data else None
+    if game:
+        tag_game(game)
+        return game
+    # Game created before sharding: move it into its shard on first access
+    data = games.get(code)
+    if data:
+        game = decode_game(data)
+        game_shard(code)[code] = encode_game(game)
+        _discard(games, code)
+        return game
+    return None
+
+def save_game(game: GameState):
+    """Persist the whole game document.
+
+    In actor write mode the game's GameOwner is its only writer: other containers send
+    the document there, and the owner also replaces its actor's in-memory copy.
+    """
+    if WRITE_MODE == "actor":
+        if not owns_game(game.code):
+            game.revision, game.updated_at = game_owner(game.code).replace.remote(encode_game(game))
+            _game_cache.pop(game.code, None)
+            return
+        replace_owned_game(game)
+        return
+    write_game(game)
+
+
+def write_game(game: GameState):
+    game.revision = uuid.uuid4().hex[:12]
+    game.updated_at = time.time()
+    with telemetry.span("state_write"):
+        # Stamp first: a reader that sees the new revision before the document lands
+        # finds the two disagreeing and does not cache the old document (get_game_cached)
+        game_revisions[game.code] = game.revision
+        game_shard(game.code)[game.code] = encode_game(game)
+    _game_cache.pop(game.code, None)
+
+
+def tag_game(game: GameState):
+    """Tag telemetry spans in the current context with the game and its current round type."""
+    round_type = game.rounds[game.current_round_idx].type if 0 <= game.current_round_idx < len(game.rounds) else None
+    telemetry.set_tags(game=game.code, round_type=round_type)
+
+
+# --- Game Registry ---
+# Codes are spread over GAME_SHARD_COUNT Dicts by a stable hash so no single Dict grows
+# with the total number of games. Codes are reserved with an atomic put-if-absent, and
+# finished or abandoned games are evicted by the scheduled compact_game_registry job.
+# Changing registry.shards remaps codes, so only do it between deployments with no live games.
+
+def game_shard_index(code: str) -> int:
+    return zlib.crc32(code.encode()) % GAME_SHARD_COUNT
+
+
+def game_shard(code: str):
+    return game_shards[game_shard_index(code)]
+
+
+def create_game_record(game: GameState) -> bool:
+    """Store a new game only if its code is unused. Returns False on a code collision."""
+    if game.code in games:
+        return False
+    game.revision = uuid.uuid4().hex[:12]
+    game.updated_at = time.time()
+    # Stamp before the document, as in save_game; the stamp doubles as the code reservation
+    if not game_revisions.put(game.code, game.revision, skip_if_exists=True):
+        return False
+    if not game_shard(game.code).put(game.code, encode_game(game), skip_if_exists=True):
+        # A document without a stamp already holds this code; leave it as it was
+        _discard(game_revisions, game.code)
+        return False
+    return True
+
+
+def is_game_expired(game: GameState, now: float) -> bool:
+    """Finished games expire after registry.finished_ttl_seconds, idle ones after abandoned_ttl_seconds."""
+    registry_config = CONFIG.get("registry", {})
+    idle = now - (game.updated_at or game.created_at)
+    if game.status == "finished":
+        return idle > registry_config.get("finished_ttl_seconds", 6 * 3600)
+    return idle > registry_config.get("abandoned_ttl_seconds", 24 * 3600)
+
+
+def _discard(store, key: str):
+    try:
+        store.pop(key)
+    except KeyError:
+        pass
+
+
+def evict_game(code: str, game: GameState, store):
+    """Delete a game and everything keyed by its code."""
+    for idx in range(len(game.rounds)):
+        _discard(round_archive, f"{code}:{idx}")
+        _discard(sacrifice_prerenders, f"{code}:{idx}")
+        _discard(round_calls, f"{code}:{idx}")
+        for pid in game.players:
+            _discard(coop_prejudgements, f"{code}:{idx}:{pid}")
+    forget_spawns(code, len(game.rounds))
+    forget_spend(code)
+    for side_store in (game_revisions, presence, warm_pool_demand):
+        _discard(side_store, code)
+    _discard(store, code)
+
+
+def compact_game_store() -> dict:
+    """Scan every shard (and the legacy Dict) and evict expired games."""
+    now = time.time()
+    scanned = evicted = 0
+    for store in [*game_shards, games]:
+        for code, data in list(store.items()):
+            scanned += 1
+            try:
+                game = decode_game(data)
+            except Exception as e:
+                print(f"REGISTRY: Skipping undecodable game {code}: {e}", flush=True)
+                continue
+            if is_game_expired(game, now):
+                evict_game(code, game, store)
+                evicted += 1
+    print(f"REGISTRY: Compaction scanned {scanned} games, evicted {evicted}", flush=True)
+    return {"scanned": scanned, "evicted": evicted}
+
+
+# --- Presence ---
+# Heartbeats from get_game_state polls are buffered per container and merged into the
+# presence Dict at most once per presence.flush_interval_seconds per game.
+_presence_buffer: Dict[str, Dict[str, float]] = {}
+_presence_flushed_at: Dict[str, float] = {}
+
+
+def record_heartbeat(code: str, player_id: str):
+    """Note that a player is connected; flushes the game's buffered heartbeats when due."""
+    now = time.time()
+    _presence_buffer.setdefault(code, {})[player_id] = now
+    interval = CONFIG.get("presence", {}).get("flush_interval_seconds", 5)
+    if now - _presence_flushed_at.get(code, 0) >= interval:
+        flush_presence(code)
+
+
+def flush_presence(code: str):
+    """Merge this container's buffered heartbeats for a game into the presence Dict."""
+    pending = _presence_buffer.pop(code, None)
+    _presence_flushed_at[code] = time.time()
+    if not pending:
+        return
+    try:
+        merged = presence.get(code) or {}
+        for pid, seen in pending.items():
+            merged[pid] = max(seen, merged.get(pid, 0))
+        presence[code] = merged
+    except Exception as e:
+        print(f"PRESENCE: Flush failed for {code}: {e}", flush=True)
+
+
+def get_connected_players(code: str, within_seconds: float | None = None) -> set[str]:
+    """Player IDs that polled within the window (presence Dict plus this container's buffer)."""
+    if within_seconds is None:
+        within_seconds = CONFIG.get("presence", {}).get("connected_window_seconds", 15)
+    seen = dict(presence.get(code) or {})
+    for pid, ts in _presence_buffer.get(code, {}).items():
+        seen[pid] = max(ts, seen.get(pid, 0))
+    cutoff = time.time() - within_seconds
+    return {pid for pid, ts in seen.items() if ts >= cutoff}
+
+
+# --- Spend Accounting ---
+# LLM tokens, FAL images and video seconds are metered against the game and round type
+# in the current telemetry tags (see spend.py for the meter layout). Each container keeps
+# its own meters per game in memory; a timer thread publishes them at most once per
+# spend.flush_interval_seconds, and containers flush what is left on exit. A container
+# publishes only to its own slot of the game (game_spend[f"{code}:{n}"]), claimed once
+# with put-if-absent, so no flush rewrites another container's meters. Slots are claimed
+# in order, so /api/spend and eviction walk them from 0 up to the first missing one.
+SPEND_SOURCE = os.environ.get("MODAL_TASK_ID") or f"local-{os.getpid()}"
+SPEND_MAX_GAMES = 512
+_spend: Dict[str, dict] = {}
+# This container's slot per game; a cached game without one hasn't folded in its stored meters yet
+_spend_slots: Dict[str, int] = {}
+_spend_flush_timers: Dict[str, threading.Timer] = {}
+_spend_flushed_at: Dict[str, float] = {}
+_spend_lock = threading.Lock()
+# Work for the whole game rather than the round that happens to be current
+GAME_LEVEL_USE_CASES = {"character_image", "video_script_generation", "video_base_image", "player_video"}
+
+
+def record_spend(kind: str, use_case: str, **counts):
+    """Add one call's usage to the current game's meters. Calls outside a game are not metered.
+
+    Only touches memory; the game's flush timer publishes the meters (see flush_spend).
+    GAME_LEVEL_USE_CASES are booked under round type "-".
+    """
+    context = telemetry.current_tags()
+    code = context.get("game")
+    if not code:
+        return
+    round_type = None if use_case in GAME_LEVEL_USE_CASES else context.get("round_type")
+    with _spend_lock:
+        # Evicted from this container's cache (or first call here): the flush continues our stored slot
+        meters = _spend.pop(code, None) or {}
+        _spend[code] = meters
+        spend.add(meters, round_type, kind, use_case, **counts)
+        if code not in _spend_flush_timers:
+            interval = CONFIG.get("spend", {}).get("flush_interval_seconds", 5)
+            delay = max(0.0, interval - (time.time() - _spend_flushed_at.get(code, 0)))
+            timer = threading.Timer(delay, flush_spend, (code,))
+            timer.daemon = True
+            _spend_flush_timers[code] = timer
+            timer.start()
+
+
+def claim_spend_slot(code: str) -> tuple[int, dict]:
+    """This container's slot for a game and the meters stored there, claiming the first free slot."""
+    slot = 0
+    while True:
+        key = f"{code}:{slot}"
+        entry = game_spend.get(key)
+        if entry is None:
+            if game_spend.put(key, {"source": SPEND_SOURCE, "meters": {}}, skip_if_exists=True):
+                return slot, {}
+            continue  # Another container claimed it first; look at it again
+        if entry.get("source") == SPEND_SOURCE:
+            return slot, entry.get("meters") or {}
+        slot += 1
+
+
+def spend_slots(code: str) -> List[dict]:
+    """Every container's published slot for a game, in slot order."""
+    entries = []
+    while True:
+        entry = game_spend.get(f"{code}:{len(entries)}")
+        if entry is None:
+            return entries
+        entries.append(entry)
+
+
+def flush_spend(code: str):
+    """Publish this container's meters for a game to its own slot."""
+    with _spend_lock:
+        timer = _spend_flush_timers.pop(code, None)
+        if timer:
+            timer.cancel()
+        _spend_flushed_at[code] = time.time()
+        if code not in _spend:
+            return
+        slot = _spend_slots.get(code)
+    try:
+        if slot is None:
+            slot, stored = claim_spend_slot(code)
+            with _spend_lock:
+                meters = _spend.get(code)
+                if meters is None:
+                    return
+                spend.merge(meters, stored)
+                _spend_slots[code] = slot
+        with _spend_lock:
+            meters = _spend.get(code)
+            if meters is None:
+                return
+            snapshot = spend.merge({}, meters)
+        game_spend[f"{code}:{slot}"] = {"source": SPEND_SOURCE, "meters": snapshot}
+    except Exception as e:
+        print(f"SPEND: Could not publish meters for {code}: {e}", flush=True)
+    with _spend_lock:
+        # Published games can be dropped from the cache; their next call continues the stored slot
+        idle = [c for c in _spend if c not in _spend_flush_timers and c in _spend_slots]
+        for stale in idle[:max(0, len(_spend) - SPEND_MAX_GAMES)]:
+            _spend.pop(stale)
+            _spend_slots.pop(stale, None)
+            _spend_flushed_at.pop(stale, None)
+
+
+def flush_all_spend():
+    """Publish every game's pending meters (container shutdown)."""
+    for code in list(_spend_flush_timers):
+        flush_spend(code)
+
+
+def meter_llm_call(use_case: str, model: str, usage: dict | None):
+    """Meter a /chat/completions call from its usage block (token counts stay 0 if absent)."""
+    usage = usage or {}
+    prompt_tokens = usage.get("prompt_tokens") or 0
+    completion_tokens = usage.get("completion_tokens") or 0
+    prices = CONFIG.get("spend", {}).get("llm_usd_per_million_tokens", {})
+    record_spend(
+        "llm", use_case, llm_calls=1, prompt_tokens=prompt_tokens, completion_tokens=completion_tokens,
+        usd=spend.llm_usd(prices, model, prompt_tokens, completion_tokens),
+    )
+
+
+def meter_image(use_case: str):
+    prices = CONFIG.get("spend", {}).get("image_usd", {})
+    record_spend("images", use_case, images=1, usd=prices.get(get_image_model(use_case), 0))
+
+
+def meter_video(seconds: int):
+    price = CONFIG.get("spend", {}).get("video_usd_per_second", 0)
+    record_spend("video", "player_video", videos=1, video_seconds=seconds, usd=seconds * price)
+
+
+def forget_spend(code: str):
+    """Drop every container's meters for an evicted game."""
+    with _spend_lock:
+        timer = _spend_flush_timers.pop(code, None)
+        if timer:
+            timer.cancel()
+        _spend.pop(code, None)
+        _spend_slots.pop(code, None)
+        _spend_flushed_at.pop(code, None)
+    for slot in range(len(spend_slots(code))):
+        _discard(game_spend, f"{code}:{slot}")
+
+
+def load_spend(code: str) -> dict:
+    """A game's spend summed over every container (see spend.summarize).
+
+    This container's unpublished meters are included; other containers' lag by up to
+    spend.flush_interval_seconds.
+    """
+    entries = {entry.get("source"): entry.get("meters") or {} for entry in spend_slots(code)}
+    with _spend_lock:
+        if code in _spend:
+            local = spend.merge({}, _spend[code])
+            if code not in _spend_slots:
+                spend.merge(local, entries.get(SPEND_SOURCE) or {})
+            entries[SPEND_SOURCE] = local
+    return {"code": code, "containers": len(entries), **spend.summarize(list(entries.values()))}
+
+
+# --- Game State Read Cache ---
+# Decoded GameState objects per web container. An entry is trusted for
+# state_cache.ttl_seconds; after that only the small revision stamp is read, and the
+# full document is fetched and validated again only when a writer has bumped it.
+_game_cache: Dict[str, dict] = {}
+GAME_CACHE_MAX_ENTRIES = 512
+
+
+def get_game_cached(code: str) -> Optional[GameState]:
+    """Read-through cached get_game for polling. Treat the returned game as read-only."""
+    ttl = CONFIG.get("state_cache", {}).get("ttl_seconds", 1.0)
+    now = time.time()
+    entry = _game_cache.get(code)
+    if entry:
+        if now - entry["checked_at"] < ttl:
+            return entry["game"]
+        if game_revisions.get(code) == entry["game"].revision:
+            entry["checked_at"] = now
+            return entry["game"]
+
+    game = get_game(code)
+    _game_cache.pop(code, None)
+    # Only cache a document its revision stamp vouches for; a mismatch means a write is landing
+    if game and game_revisions.get(code) == game.revision:
+        _game_cache[code] = {"game": game, "checked_at": now}
+        while len(_game_cache) > GAME_CACHE_MAX_ENTRIES:
+            _game_cache.pop(next(iter(_game_cache)))
+    return game
+
 
-# --- Persistent Storage ---
-# We use a Dict to store game states. Key=GameCode
-games = modal.Dict.from_name("survaive-games", create_if_missing=True)
+def round_timer_may_fire(game: GameState) -> bool:
+    """True when get_game_state might apply a timeout or fallback transition.
 
-# --- Secrets ---
-# Use Modal's secret storage - create with: modal secret create ai-game-secrets MOONSHOT_API_KEY=xxx FAL_KEY=xxx
-secrets = [modal.Secret.from_name("ai-game-secrets")]
+    Transitions must run against fresh state, never a cached copy, or they could
+    overwrite a submission or vote that landed since the cache entry was read.
+    """
+    if game.status != "playing" or game.current_round_idx < 0:
+        return False
+    current_round = game.rounds[game.current_round_idx]
+    now = time.time()
 
-# --- Helper Functions ---
-def get_game(code: str) -> Optional[GameState]:
-    data = games.get(code)
-    if data:
-        return GameState.model_validate(data)
-    return None
+    submission_timeouts = {
+        "strategy": CONFIG["game"]["submission_timeout_seconds"],
+        "trap_creation": CONFIG["game"]["submission_timeout_seconds"],
+        "sacrifice_volunteer": CONFIG["game"]["volunteer_timeout_seconds"],
+        "sacrifice_submission": CONFIG["game"]["sacrifice_submission_timeout_seconds"],
+    }
+    if current_round.status in submission_timeouts and current_round.submission_start_time:
+        if now - current_round.submission_start_time >= submission_timeouts[current_round.status]:
+            return True
 
-def save_game(game: GameState):
-    games[game.code] = game.model_dump()
+    if current_round.status in ("trap_voting", "coop_voting", "sacrifice_voting", "last_stand_revival"):
+        if current_round.vote_start_time and now - current_round.vote_start_time >= CONFIG["game"]["vote_timeout_seconds"]:
+            return True
+
+    # Stuck-judgement fallback inspects per-player judgement flags
+    return current_round.status == "judgement"
+
+
+# Per-player fields that describe how a round went (reset when the next round starts)
+ROUND_OUTCOME_FIELDS = {"is_alive", "death_reason", "survival_reason", "strategy", "result_image_url", "score"}
+
+
+def archive_round(game: GameState, round_idx: int):
+    """Move a completed round to round_archive, leaving a summary stub in game.rounds.
+
+    The stub keeps number/type/status so round indexing is unchanged. The archive
+    record also snapshots each player's outcome, since those fields are reset when
+    the next round starts.
+    """
+    past_round = game.rounds[round_idx]
+    if past_round.archived:
+        return
+    record = {
+        "round": past_round.model_dump(exclude_defaults=True),
+        "players": {
+            pid: p.model_dump(include=ROUND_OUTCOME_FIELDS)
+            for pid, p in game.players.items()
+        },
+    }
+    round_archive[f"{game.code}:{round_idx}"] = json.dumps(record).encode()
+    game.rounds[round_idx] = Round(
+        number=past_round.number,
+        type=past_round.type,
+        status=past_round.status,
+        sector_name=past_round.sector_name,
+        archived=True,
+    )
+
+
+def load_round_history(game: GameState) -> list[dict]:
+    """Full history of every round so far, reading archived rounds from cold storage."""
+    history = []
+    for idx, r in enumerate(game.rounds):
+        data = round_archive.get(f"{game.code}:{idx}") if r.archived else None
+        if data:
+            record = json.loads(data)
+            record["round"] = Round.model_validate(record["round"]).model_dump()
+        else:
+            record = {
+                "round": r.model_dump(),
+                "players": {
+                    pid: p.model_dump(include=ROUND_OUTCOME_FIELDS)
+                    for pid, p in game.players.items()
+                },
+            }
+        history.append(record)
+    return history
+
+
+# Per-container counters for update_game_with_retry, served by /api/update_stats so load
+# tests can see how much write contention a workload causes
+update_stats = {"calls": 0, "retries": 0, "exhausted": 0}
 
 
 async def update_game_with_retry(
@@ -1261,36 +1825,198 @@ async def update_game_with_retry(
         HTTPException(404) if game not found
         HTTPException(500) if all retries fail
         Any HTTPException raised by the mutator
+
+    In actor write mode (state.write_mode: actor) the mutation is applied and saved by the
+    game's GameActor on the shard's GameOwner, the only writer of the document, so it
+    can't be overwritten and is neither verified nor retried.
     """
-    for attempt in range(max_retries):
-        game = get_game(code)
-        if not game:
-            raise HTTPException(status_code=404, detail="Game not found")
-        
-        # Apply mutation - may raise HTTPException for validation errors
-        should_save, result = mutator(game)
-        
-        if not should_save:
-            # Mutation determined no save needed (e.g., already applied)
-            return result
-        
-        save_game(game)
+    update_stats["calls"] += 1
+    if WRITE_MODE == "actor":
+        with telemetry.span("state_update", mode="actor"):
+            return await apply_owned(code, mutator)
+
+    with telemetry.span("state_update", mode="retry") as span:
+        for attempt in range(max_retries):
+            span["attempts"] = attempt + 1
+            game = get_game(code)
+            if not game:
+                raise HTTPException(status_code=404, detail="Game not found")
+
+            # Apply mutation - may raise HTTPException for validation errors
+            should_save, result = mutator(game)
+
+            if not should_save:
+                # Mutation determined no save needed (e.g., already applied)
+                return result
+
+            save_game(game)
         
-        # Wait before verification with jitter to reduce collision probability
-        jitter = random.uniform(0.05, 0.15)
-        await asyncio.sleep(0.1 + jitter)
+            # Wait before verification with jitter to reduce collision probability
+            jitter = random.uniform(0.05, 0.15)
+            await asyncio.sleep(0.1 + jitter)
         
-        # Verify the mutation was applied
-        verification = get_game(code)
-        if verification and verify(verification):
-            return result
+            # Verify the mutation was applied
+            verification = get_game(code)
+            if verification and verify(verification):
+                return result
         
-        # Retry with exponential backoff
-        print(f"UPDATE_GAME: Race condition detected, retry {attempt + 1}/{max_retries}", flush=True)
-        backoff = (0.15 * (2 ** attempt)) + random.uniform(0, 0.1)
-        await asyncio.sleep(min(backoff, 2.0))
+            # Retry with exponential backoff
+            update_stats["retries"] += 1
+            print(f"UPDATE_GAME: Race condition detected, retry {attempt + 1}/{max_retries}", flush=True)
+            backoff = (0.15 * (2 ** attempt)) + random.uniform(0, 0.1)
+            await asyncio.sleep(min(backoff, 2.0))
     
-    raise HTTPException(status_code=500, detail=error_message)
+        update_stats["exhausted"] += 1
+        raise HTTPException(status_code=500, detail=error_message)
+
+
+# --- Per-Game Write Actor ---
+# Optional write path. With state.write_mode "actor" every game is owned by the GameOwner
+# of its registry shard (one container per shard, see Background Workers). Web routes,
+# timer transitions and workers all send their writes there: update_game_with_retry
+# mutators are queued on the game's mailbox and applied in order against one in-memory
+# GameState, and whole-document save_game calls replace that copy. Mutations that queue
+# up while a save is in flight are applied together and persisted with one write. With
+# a single writer nothing can land on top of a save, so there is no verify or retry.
+# Locally (LOCAL_WORKERS) this process owns every shard.
+WRITE_MODE = CONFIG.get("state", {}).get("write_mode", "retry")
+
+# Shards whose games this container writes itself (set by GameOwner on start)
+_owned_shards: set[int] = set()
+
+_game_actors: Dict[str, "GameActor"] = {}
+_game_owners: Dict[int, "GameOwner"] = {}
+
+
+class OwnerHTTPError(Exception):
+    """An HTTPException raised by a mutator on the owner, in a form that survives pickling."""
+
+    def __init__(self, status_code: int, detail):
+        super().__init__(status_code, detail)
+        self.status_code = status_code
+        self.detail = detail
+
+
+def owns_game(code: str) -> bool:
+    return LOCAL_WORKERS or game_shard_index(code) in _owned_shards
+
+
+def game_owner(code: str) -> "GameOwner":
+    shard = game_shard_index(code)
+    owner = _game_owners.get(shard)
+    if owner is None:
+        owner = _game_owners[shard] = GameOwner(shard=shard)
+    return owner
+
+
+async def apply_owned(code: str, mutator):
+    """Apply a mutator through the game's actor, here or on the owning container."""
+    if owns_game(code):
+        _, result = await get_game_actor(code).apply(mutator)
+        return result
+    try:
+        return await game_owner(code).apply.remote.aio(code, mutator)
+    except OwnerHTTPError as e:
+        raise HTTPException(status_code=e.status_code, detail=e.detail)
+    finally:
+        _game_cache.pop(code, None)
+
+
+def replace_owned_game(game: GameState) -> tuple[str, float]:
+    """Write a whole document on its owner and make it the actor's copy. Returns (revision, updated_at)."""
+    write_game(game)
+    actor = _game_actors.get(game.code)
+    if actor is not None:
+        # Copy: the caller may keep changing its object without saving it
+        actor.game = game.model_copy(deep=True)
+    return game.revision, game.updated_at
+
+
+class GameActor:
+    """Serializes every mutation of one game through a mailbox on its owner.
+
+    The revision stamp is checked before each batch, which picks up games created or
+    evicted (the only writes that don't go through the owner) since the last one.
+    """
+
+    def __init__(self, code: str):
+        self.code = code
+        self.mailbox: asyncio.Queue = asyncio.Queue()
+        self.game: Optional[GameState] = None
+        self._task = asyncio.create_task(self._run())
+
+    async def apply(self, mutator):
+        """Queue a mutator and wait for its (should_save, result) once the batch is persisted."""
+        future = asyncio.get_running_loop().create_future()
+        self.mailbox.put_nowait((mutator, future))
+        return await future
+
+    def _refresh(self):
+        if self.game is None or game_revisions.get(self.code) != self.game.revision:
+            self.game = get_game(self.code)
+
+    async def _run(self):
+        idle_timeout = CONFIG.get("state", {}).get("actor_idle_seconds", 300)
+        while True:
+            try:
+                batch = [await asyncio.wait_for(self.mailbox.get(), timeout=idle_timeout)]
+            except asyncio.TimeoutError:
+                # No await between the check and the removal, so nothing can slip in
+                if self.mailbox.empty():
+                    _game_actors.pop(self.code, None)
+                    return
+                continue
+            while not self.mailbox.empty():
+                batch.append(self.mailbox.get_nowait())
+
+            try:
+                self._refresh()
+            except Exception as e:
+                for _, future in batch:
+                    if not future.cancelled():
+                        future.set_exception(e)
+                continue
+
+            applied = []
+            dirty = False
+            for mutator, future in batch:
+                if future.cancelled():
+                    continue  # The caller was cancelled (stale round work) - don't apply its write
+                if self.game is None:
+                    future.set_exception(HTTPException(status_code=404, detail="Game not found"))
+                    continue
+                # Mutators may raise after touching state; roll back to keep the batch clean
+                snapshot = self.game.model_copy(deep=True)
+                try:
+                    should_save, result = mutator(self.game)
+                except Exception as e:
+                    self.game = snapshot
+                    future.set_exception(e)
+                    continue
+                dirty = dirty or should_save
+                applied.append((future, (should_save, result)))
+
+            if dirty:
+                try:
+                    write_game(self.game)
+                except Exception as e:
+                    print(f"GAME ACTOR: Save failed for {self.code}: {e}", flush=True)
+                    self.game = None  # Reload from storage on the next batch
+                    for future, _ in applied:
+                        future.set_exception(HTTPException(status_code=500, detail="Failed to save game"))
+                    continue
+                if len(batch) > 1:
+                    print(f"GAME ACTOR: {self.code} applied {len(batch)} mutations in one write", flush=True)
+
+            for future, result in applied:
+                future.set_result(result)
+
+
+def get_game_actor(code: str) -> GameActor:
+    actor = _game_actors.get(code)
+    if actor is None:
+        actor = _game_actors[code] = GameActor(code)
+    return actor
 
 
 # --- Video Pre-generation Helper ---
@@ -1349,18 +2075,44 @@ def is_video_generation_stuck(game: GameState) -> bool:
 
 from fastapi import FastAPI, HTTPException, Request
 from fastapi.staticfiles import StaticFiles
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, Response
 
 web_app = FastAPI()
 
+
+@web_app.on_event("shutdown")
+async def close_pooled_http_client():
+    await close_http_client()
+    await asyncio.to_thread(flush_all_spend)
+
+
+@web_app.middleware("http")
+async def telemetry_middleware(request: Request, call_next):
+    """Time every API request; spans recorded while handling it carry the game code and route."""
+    if not request.url.path.startswith("/api/"):
+        return await call_next(request)
+    with telemetry.tags(game=request.query_params.get("code"), route=request.url.path):
+        with telemetry.span("http", method=request.method) as span:
+            response = await call_next(request)
+            span["status"] = response.status_code
+            return response
+
+
 # Helper for wrapping logic in routes
 @web_app.post("/api/create_game")
 async def api_create_game(request: Request):
     data = await request.json()
     import shortuuid
-    code = shortuuid.ShortUUID().random(length=4).upper()
-    game = GameState(id=str(uuid.uuid4()), code=code)
-    save_game(game)
+    # Reserve a code that is not in use by any live game
+    game = GameState(id=str(uuid.uuid4()), code="")
+    for attempt in range(10):
+        game.code = shortuuid.ShortUUID().random(length=4).upper()
+        if create_game_record(game):
+            break
+        print(f"API: Game code {game.code} already in use, retry {attempt + 1}/10", flush=True)
+    else:
+        raise HTTPException(status_code=503, detail="Could not allocate a game code, please try again")
+    code = game.code
 
     # Spawn background task to pre-warm ALL scenarios in parallel
     print(f"API: Spawning scenario pre-warming for game {code}", flush=True)
@@ -1374,7 +2126,7 @@ async def api_join_game(request: Request):
 
     When multiple players join simultaneously, they may all read the same initial
     game state, modify it locally, and save - causing last-write-wins data loss.
-    This retry-and-verify pattern ensures all joins are preserved.
+    update_game_with_retry ensures all joins are preserved.
     """
 
     code = request.query_params.get("code")
@@ -1391,80 +2143,40 @@ async def api_join_game(request: Request):
 
     # Generate player ID upfront (consistent across retries)
     player_id = str(uuid.uuid4())
-    is_first = None  # Will be determined by first successful read
-
-    max_retries = 10
-    for attempt in range(max_retries):
-        game = get_game(code)
 
-        if not game:
-            raise HTTPException(status_code=404, detail="Game not found")
+    def mutator(game: GameState):
         if game.status != "lobby":
             raise HTTPException(status_code=400, detail="Game started")
 
         # Check if our player already exists (from a previous retry that succeeded)
         if player_id in game.players:
             print(f"JOIN: Player {player_name} ({player_id[:8]}...) already in game (retry verified)", flush=True)
-            is_first = game.players[player_id].is_admin
-            break
-
-        # Determine admin status only on first attempt
-        if is_first is None:
-            is_first = len(game.players) == 0
+            return (False, game.players[player_id].is_admin)
 
-        player = Player(
+        game.players[player_id] = Player(
             id=player_id,
             name=player_name,
-            is_admin=is_first,
+            is_admin=len(game.players) == 0,
+            # No character description means they skip preview, so auto-enter lobby
+            in_lobby=not character_description,
             character_description=character_description,
             character_image_url=character_image_url
         )
-        game.players[player_id] = player
-        save_game(game)
+        return (True, game.players[player_id].is_admin)
 
-        # Wait before verification to allow write to propagate
-        # Add jitter (random delay) to reduce collision probability in concurrent requests
-        jitter = random.uniform(0.05, 0.15)
-        await asyncio.sleep(0.1 + jitter)
+    def verify(game: GameState) -> bool:
+        return player_id in game.players
 
-        # Verify the player was saved (re-read to check for race condition)
-        verification_game = get_game(code)
-        if verification_game and player_id in verification_game.players:
-            print(f"JOIN: Player {player_name} ({player_id[:8]}...) joined successfully (attempt {attempt+1})", flush=True)
-            game = verification_game  # Use verified state for subsequent operations
-            break
-        else:
-            print(f"JOIN: Race condition detected for {player_name} ({player_id[:8]}...), retry {attempt+1}/{max_retries}", flush=True)
-            # Exponential backoff with jitter before retry
-            backoff = (0.15 * (2 ** attempt)) + random.uniform(0, 0.1)
-            await asyncio.sleep(min(backoff, 2.0))  # Cap at 2 seconds
-    else:
-        # All retries exhausted
-        raise HTTPException(status_code=500, detail="Failed to join game due to concurrent modifications, please try again")
+    is_first = await update_game_with_retry(
+        code, mutator, verify,
+        error_message="Failed to join game due to concurrent modifications, please try again"
+    )
+    print(f"JOIN: Player {player_name} ({player_id[:8]}...) joined successfully", flush=True)
 
     # Only spawn async character image generation if description provided AND no pre-generated image
     if character_description and not character_image_url:
         print(f"API: Spawning character image generation for {player_name}", flush=True)
         generate_character_image.spawn(code, player_id, character_description)
-    elif not character_description:
-        # No character description means they skip preview, so auto-enter lobby
-        # Use robust retry pattern for this modification
-        for attempt in range(10):
-            game = get_game(code)
-            if game and player_id in game.players:
-                if game.players[player_id].in_lobby:
-                    break  # Already set (maybe by concurrent retry)
-                game.players[player_id].in_lobby = True
-                save_game(game)
-                jitter = random.uniform(0.05, 0.15)
-                await asyncio.sleep(0.1 + jitter)
-                # Verify
-                verification = get_game(code)
-                if verification and player_id in verification.players and verification.players[player_id].in_lobby:
-                    break
-                print(f"JOIN: in_lobby race condition for {player_name}, retry {attempt+1}/10", flush=True)
-                backoff = (0.15 * (2 ** attempt)) + random.uniform(0, 0.1)
-                await asyncio.sleep(min(backoff, 2.0))
     # If character_image_url is provided, the image is already ready (random selection flow)
 
     return {"player_id": player_id, "is_admin": is_first}
@@ -1486,55 +2198,50 @@ async def api_enter_lobby(request: Request):
     Uses retry logic to handle concurrent modifications from other players
     joining or entering the lobby at the same time.
     """
-    import asyncio
 
     code = request.query_params.get("code")
     data = await request.json()
     player_id = data.get("player_id")
 
-    max_retries = 10
-    for attempt in range(max_retries):
-        game = get_game(code)
-        if not game:
-            raise HTTPException(status_code=404, detail="Game not found")
+    def mutator(game: GameState):
         if player_id not in game.players:
             raise HTTPException(status_code=404, detail="Player not found")
 
         # Check if already in lobby
         if game.players[player_id].in_lobby:
-            return {"status": "entered"}
+            return (False, {"status": "entered"})
 
         game.players[player_id].in_lobby = True
-        save_game(game)
+        return (True, {"status": "entered"})
 
-        # Wait with jitter before verification
-        jitter = random.uniform(0.05, 0.15)
-        await asyncio.sleep(0.1 + jitter)
-
-        # Verify the change was saved
-        verification = get_game(code)
-        if verification and player_id in verification.players and verification.players[player_id].in_lobby:
-            return {"status": "entered"}
-        else:
-            print(f"ENTER_LOBBY: Race condition for {player_id[:8]}..., retry {attempt+1}/{max_retries}", flush=True)
-            backoff = (0.15 * (2 ** attempt)) + random.uniform(0, 0.1)
-            await asyncio.sleep(min(backoff, 2.0))
+    def verify(game: GameState) -> bool:
+        return player_id in game.players and game.players[player_id].in_lobby
 
-    raise HTTPException(status_code=500, detail="Failed to enter lobby due to concurrent modifications")
+    return await update_game_with_retry(
+        code, mutator, verify,
+        error_message="Failed to enter lobby due to concurrent modifications"
+    )
 
 @web_app.get("/api/get_game_state")
 async def api_get_game_state(request: Request):
     code = request.query_params.get("code")
-    game = get_game(code)
+    # Polls are served from the container cache; only re-read fresh state when a
+    # timer or fallback transition could fire (those may write)
+    game = get_game_cached(code)
     if not game: raise HTTPException(status_code=404, detail="Game not found")
+    may_transition = round_timer_may_fire(game)
+    if may_transition:
+        game = get_game(code)
+        if not game: raise HTTPException(status_code=404, detail="Game not found")
 
-    # Check for player_id in query
+    # Heartbeat goes to the presence store, never into a GameState write
     player_id = request.query_params.get("player_id")
     if player_id and player_id in game.players:
-        game.players[player_id].last_active = time.time()
+        record_heartbeat(code, player_id)
 
     # Check for submission timeout
     needs_save = False
+    prerender_martyr_id = None  # Spawned after the save: the worker checks for sacrifice_submission
     if game.status == "playing" and game.current_round_idx >= 0:
         current_round = game.rounds[game.current_round_idx]
 
@@ -1592,7 +2299,7 @@ async def api_get_game_state(request: Request):
                                 current_round.status = "results"
                                 print(f"TIMEOUT: All players dead in coop, skipping to results", flush=True)
                                 # Still generate timeout images for display on results
-                                generate_coop_strategy_images.spawn(game.code, game.current_round_idx)
+                                generate_coop_strategy_images.spawn(game.code, game.current_round_idx, True)
                             else:
                                 # Some players submitted - check if voting is needed
                                 alive_players = [p for p in lobby_players if p.is_alive]
@@ -1605,20 +2312,24 @@ async def api_get_game_state(request: Request):
                                         winner.score += 200
                                     current_round.status = "coop_judgement"
                                     print(f"TIMEOUT: Only {len(alive_players)} alive in coop, skipping voting", flush=True)
-                                    generate_coop_strategy_images.spawn(game.code, game.current_round_idx)
+                                    generate_coop_strategy_images.spawn(game.code, game.current_round_idx, True)
                                     run_coop_judgement.spawn(game.code, game.current_round_idx)
                                 else:
                                     # Multiple players - go to voting phase
                                     current_round.status = "coop_voting"
                                     current_round.vote_start_time = time.time()
                                     print(f"TIMEOUT: Advancing coop to voting", flush=True)
-                                    generate_coop_strategy_images.spawn(game.code, game.current_round_idx)
+                                    generate_coop_strategy_images.spawn(game.code, game.current_round_idx, True)
                         elif current_round.type == "ranked":
                             current_round.status = "ranked_judgement"
                             print(f"TIMEOUT: All players handled, advancing to ranked_judgement (all_dead={all_dead})", flush=True)
                             run_ranked_judgement.spawn(game.code, game.current_round_idx)
+                        elif current_round.type == "last_stand":
+                            current_round.status = "judgement"
+                            print(f"TIMEOUT: All players handled, advancing to last stand judgement (all_dead={all_dead})", flush=True)
+                            run_last_stand_judgement.spawn(game.code, game.current_round_idx)
                         else:
-                            # Standard survival/blind_architect/last_stand
+                            # Standard survival/blind_architect
                             current_round.status = "judgement"
                             print(f"TIMEOUT: All players handled, advancing to judgement (all_dead={all_dead})", flush=True)
                             run_round_judgement.spawn(game.code, game.current_round_idx)
@@ -1668,6 +2379,7 @@ async def api_get_game_state(request: Request):
                             current_round.martyr_id = volunteer_ids[0]
                             current_round.status = "sacrifice_submission"
                             current_round.submission_start_time = time.time()
+                            prerender_martyr_id = current_round.martyr_id
                             print(f"TIMEOUT: 1 volunteer, advancing to sacrifice_submission", flush=True)
                         else:
                             # Multiple volunteers - advance to voting
@@ -1678,11 +2390,11 @@ async def api_get_game_state(request: Request):
                         # No volunteers - randomly pick a martyr (cowards get drafted)
                         lobby_players = [p for p in game.players.values() if p.in_lobby and p.is_alive]
                         if lobby_players:
-                            import random
                             martyr = random.choice(lobby_players)
                             current_round.martyr_id = martyr.id
                             current_round.status = "sacrifice_submission"
                             current_round.submission_start_time = time.time()
+                            prerender_martyr_id = martyr.id
                             print(f"TIMEOUT: No volunteers, drafted {martyr.name} as martyr", flush=True)
                         else:
                             # Everyone already dead somehow - skip to results
@@ -1793,6 +2505,7 @@ async def api_get_game_state(request: Request):
                     current_round.martyr_id = martyr_id
                     current_round.status = "sacrifice_submission"
                     current_round.submission_start_time = time.time()
+                    prerender_martyr_id = martyr_id
                     print(f"TIMEOUT: sacrifice_voting resolved, martyr: {martyr_id}", flush=True)
 
         elif current_round.status == "last_stand_revival":
@@ -1804,8 +2517,13 @@ async def api_get_game_state(request: Request):
 
         # FALLBACK: Detect stuck judgement phase from early judgement race condition
         # This handles the case where all judge_single_player tasks completed but
-        # none of them saw the full picture due to Modal Dict eventual consistency
-        elif current_round.status == "judgement" and current_round.type in ["survival", "blind_architect"]:
+        # none of them saw the full picture due to Modal Dict eventual consistency,
+        # and judges that died holding a claim (their players get the fallback verdict)
+        elif current_round.status == "judgement" and current_round.type in EARLY_JUDGEMENT_ROUND_TYPES:
+            expired = expire_stale_judgement_claims(game, current_round)
+            if expired:
+                print(f"FALLBACK: Judgement claims for {len(expired)} players timed out, using fallback verdicts", flush=True)
+                needs_save = True
             in_lobby_players = [p for p in game.players.values() if p.in_lobby]
             # Check if all players who submitted have been judged (have death/survival reason)
             all_judged = all(
@@ -1816,8 +2534,11 @@ async def api_get_game_state(request: Request):
             no_pending = not any(p.judgement_pending for p in game.players.values())
 
             if all_judged and no_pending and in_lobby_players:
-                print(f"FALLBACK: Detected stuck judgement phase - all players judged but status not updated. Transitioning to results.", flush=True)
-                current_round.status = "results"
+                print(f"FALLBACK: Detected stuck judgement phase - all players judged but status not updated. Settling the round.", flush=True)
+                if current_round.type == "last_stand":
+                    finish_last_stand_judgement(game, current_round)
+                else:
+                    finish_standard_judgement(game, current_round)
                 needs_save = True
 
                 # Trigger video pre-generation on round 1 results (if not already started)
@@ -1829,16 +2550,80 @@ async def api_get_game_state(request: Request):
 
     if needs_save:
         save_game(game)
+    if prerender_martyr_id:
+        spawn_sacrifice_prerender(game.code, game.current_round_idx, prerender_martyr_id)
+
+    # Unchanged state: let the client revalidate and answer 304 without a body
+    etag = f'"{game.revision}"' if game.revision else None
+    headers = {"Cache-Control": "no-cache"}
+    if etag:
+        headers["ETag"] = etag
+        if request.headers.get("if-none-match") == etag:
+            return Response(status_code=304, headers=headers)
+
+    return Response(content=encode_game_state_response(game), media_type="application/json", headers=headers)
+
+
+# Encoded get_game_state bodies per game, reused while the revision is unchanged
+_response_cache: Dict[str, tuple[str, bytes]] = {}
+_response_config_json: bytes | None = None
+
+
+def encode_game_state_response(game: GameState) -> bytes:
+    """Full game state plus frontend config as JSON bytes, cached per (code, revision)."""
+    global _response_config_json
+
+    cached = _response_cache.get(game.code)
+    if cached and game.revision and cached[0] == game.revision:
+        return cached[1]
 
     # Include config values in response for frontend
-    response = game.model_dump()
-    response["config"] = {
-        "submission_timeout_seconds": CONFIG["game"]["submission_timeout_seconds"],
-        "volunteer_timeout_seconds": CONFIG["game"]["volunteer_timeout_seconds"],
-        "sacrifice_submission_timeout_seconds": CONFIG["game"]["sacrifice_submission_timeout_seconds"],
-        "vote_timeout_seconds": CONFIG["game"]["vote_timeout_seconds"]
-    }
-    return response
+    if _response_config_json is None:
+        _response_config_json = json.dumps({
+            "submission_timeout_seconds": CONFIG["game"]["submission_timeout_seconds"],
+            "volunteer_timeout_seconds": CONFIG["game"]["volunteer_timeout_seconds"],
+            "sacrifice_submission_timeout_seconds": CONFIG["game"]["sacrifice_submission_timeout_seconds"],
+            "vote_timeout_seconds": CONFIG["game"]["vote_timeout_seconds"]
+        }).encode()
+    # Splice "config" into the serialized object instead of round-tripping through a dict
+    body = game.model_dump_json().encode()[:-1] + b',"config":' + _response_config_json + b'}'
+
+    if game.revision:
+        _response_cache.pop(game.code, None)
+        _response_cache[game.code] = (game.revision, body)
+        while len(_response_cache) > GAME_CACHE_MAX_ENTRIES:
+            _response_cache.pop(next(iter(_response_cache)))
+    return body
+
+@web_app.get("/api/presence")
+async def api_presence(request: Request):
+    """Which players are actually connected (polled recently)."""
+    code = request.query_params.get("code")
+    game = get_game_cached(code)
+    if not game:
+        raise HTTPException(status_code=404, detail="Game not found")
+    connected = get_connected_players(code)
+    return {"connected": sorted(pid for pid in connected if pid in game.players)}
+
+
+@web_app.get("/api/spend")
+async def api_spend(request: Request):
+    """Tokens, images, video seconds and USD a game has consumed, per round type and in total."""
+    code = request.query_params.get("code")
+    game = get_game_cached(code)
+    if not game:
+        raise HTTPException(status_code=404, detail="Game not found")
+    return load_spend(code)
+
+
+@web_app.get("/api/round_history")
+async def api_round_history(request: Request):
+    """Full per-round history (archived rounds included) for the results and video screens."""
+    code = request.query_params.get("code")
+    game = get_game(code)
+    if not game:
+        raise HTTPException(status_code=404, detail="Game not found")
+    return {"code": game.code, "rounds": load_round_history(game)}
 
 def get_system_message(round_num: int, max_rounds: int, round_type: str) -> str:
     """Generate the system message for a given round based on narrative progression."""
@@ -1879,8 +2664,8 @@ async def api_start_game(request: Request):
         print(f"API: Using pre-warmed scenario: {scenario_text[:50]}...")
     else:
         print("API: No pre-warmed scenario, generating on-demand...")
-        # Use asyncio.to_thread to avoid blocking the event loop
-        scenario_text = await asyncio.to_thread(generate_scenario_llm, 1, game.max_rounds)
+        # Async pooled client - never blocks the event loop or a threadpool worker
+        scenario_text = await generate_scenario_llm_async(1, game.max_rounds)
         print(f"API: Scenario Generated: {scenario_text}")
         # Re-fetch after slow operation
         game = get_game(code)
@@ -1919,12 +2704,12 @@ async def api_start_game(request: Request):
 
     save_game(game)
     print(f"API: Game Saved (first round type: {first_round_type})")
+    await sync_warm_pool_async(code, game)
     return {"status": "started", "scenario": first_round.scenario_text, "type": first_round_type}
 
 # Async Judgement Worker
 @app.function(image=image, secrets=secrets)
 def process_judgement(game_id: str, round_idx: int, player_id: str):
-    import json
     
     # Need to reload game from DB to get latest state/lock? 
     # For MVP we can just get, modify, save. Race conditions possible but rare in this turn-based flow.
@@ -1938,11 +2723,10 @@ def process_judgement(game_id: str, round_idx: int, player_id: str):
 
 # Helper to process single player judgement
 @app.function(image=image, secrets=secrets)
-def run_player_judgement(scenario: str, player: Player) -> Player:
-    import json
+async def run_player_judgement(scenario: str, player: Player) -> Player:
     # 1. Judge
     try:
-        result_json = judge_strategy_llm(scenario, player.strategy)
+        result_json = await judge_strategy_llm_async(scenario, player.strategy)
         res = json.loads(result_json)
         survived = res.get("survived", False)
         reason = res.get("reason", "Unknown")
@@ -1960,9 +2744,9 @@ def run_player_judgement(scenario: str, player: Player) -> Player:
         return player, None
 
 @app.function(image=image, secrets=secrets)
-def generate_result_image_sync(game_code: str, player_id: str, prompt: str):
-    """Sync wrapper for spawning - updates game state with generated image."""
-    url = generate_image_fal(prompt)
+async def generate_result_image_sync(game_code: str, player_id: str, prompt: str):
+    """Spawnable wrapper - updates game state with generated image."""
+    url = await generate_image_fal_async(prompt)
     if url:
         game = get_game(game_code)
         if game and player_id in game.players:
@@ -1970,13 +2754,11 @@ def generate_result_image_sync(game_code: str, player_id: str, prompt: str):
             save_game(game)
 
 
-@app.function(image=image, secrets=secrets)
-def generate_timeout_image(game_code: str, player_id: str, style_theme: str | None):
+async def generate_timeout_image_task(game_code: str, player_id: str, style_theme: str | None):
     """Generate a timeout/failure image when player does not submit a strategy.
 
     Shows the character standing around doing nothing while danger approaches.
     """
-    import asyncio
 
     async def do_generation():
         print(f"TIMEOUT IMG: Generating timeout image for player {player_id}...", flush=True)
@@ -2002,19 +2784,14 @@ def generate_timeout_image(game_code: str, player_id: str, style_theme: str | No
         else:
             print(f"TIMEOUT IMG: Failed to generate for {player_id}", flush=True)
 
-    asyncio.run(do_generation())
+    await do_generation()
 
 
-@app.function(image=image, secrets=secrets)
-def generate_sacrifice_timeout_deaths(game_code: str, martyr_id: str, style_theme: str | None):
+async def generate_sacrifice_timeout_deaths_task(game_code: str, martyr_id: str, style_theme: str | None):
     """Generate personalized deaths for all players when martyr times out.
 
     Uses LLM to create funny deaths based on character traits, then generates images.
     """
-    import asyncio
-    import httpx
-    import re
-    import json
 
     async def do_generation():
         game = get_game(game_code)
@@ -2041,30 +2818,15 @@ def generate_sacrifice_timeout_deaths(game_code: str, martyr_id: str, style_them
         try:
             prompt = prompts.format_prompt(prompts.SACRIFICE_TIMEOUT_DEATHS, player_list=player_list)
 
-            async with httpx.AsyncClient() as client:
-                response = await client.post(
-                    f"{CONFIG['llm']['base_url']}/chat/completions",
-                    headers={
-                        "Authorization": f"Bearer {os.environ['MOONSHOT_API_KEY']}",
-                        "Content-Type": "application/json",
-                    },
-                    json={
-                        "model": CONFIG["models"]["sacrifice_judgement"],
-                        "messages": [{"role": "user", "content": prompt}],
-                        "temperature": 0.9,
-                    },
-                    timeout=CONFIG["llm"]["default_timeout_seconds"]
-                )
-                response.raise_for_status()
-                content = response.json()["choices"][0]["message"]["content"]
-
-                # Parse JSON from response
-                json_match = re.search(r'\{[\s\S]*\}', content)
-                if json_match:
-                    result = json.loads(json_match.group())
-                    deaths = result.get("deaths", [])
-                else:
-                    raise ValueError("No JSON found in response")
+            content = await chat_completion_async(
+                "sacrifice_judgement", prompt,
+                response_model=SacrificeTimeoutDeathsResponse,
+                temperature=0.9
+            )
+            result = await parse_json_with_repair(content, "sacrifice_timeout", SacrificeTimeoutDeathsResponse)
+            if result is None:
+                raise ValueError("No valid JSON found in response")
+            deaths = result["deaths"]
 
         except Exception as e:
             print(f"SACRIFICE TIMEOUT: LLM failed: {e}, using fallback deaths", flush=True)
@@ -2124,18 +2886,16 @@ def generate_sacrifice_timeout_deaths(game_code: str, martyr_id: str, style_them
         save_game(game)
         print(f"SACRIFICE TIMEOUT: Complete - all death images saved", flush=True)
 
-    asyncio.run(do_generation())
+    await do_generation()
 
 
-@app.function(image=image, secrets=secrets)
-def generate_character_image(game_code: str, player_id: str, character_prompt: str):
+async def generate_character_image_task(game_code: str, player_id: str, character_prompt: str):
     """Generate character avatar and update player state.
 
     Uses retry logic to safely update the player's image URL without
     accidentally overwriting other concurrent modifications (like other
     players joining or other images being saved).
     """
-    import asyncio
 
     async def do_generation():
         print(f"CHARACTER IMG: Generating for player {player_id}...", flush=True)
@@ -2144,46 +2904,31 @@ def generate_character_image(game_code: str, player_id: str, character_prompt: s
             print(f"CHARACTER IMG: Failed to generate for {player_id}", flush=True)
             return
 
-        # Use retry-and-verify pattern to safely update the player's image
-        max_retries = 10
-        for attempt in range(max_retries):
-            game = get_game(game_code)
-            if not game:
-                print(f"CHARACTER IMG: Game {game_code} not found!", flush=True)
-                return
+        def mutator(game: GameState):
             if player_id not in game.players:
                 print(f"CHARACTER IMG: Player {player_id} not found!", flush=True)
-                return
-
+                return (False, None)
             # Check if already set (maybe by concurrent retry)
             if game.players[player_id].character_image_url == url:
                 print(f"CHARACTER IMG: Image already saved for {player_id}", flush=True)
-                return
-
+                return (False, None)
             game.players[player_id].character_image_url = url
-            save_game(game)
-
-            # Wait with jitter before verification
-            jitter = random.uniform(0.05, 0.15)
-            await asyncio.sleep(0.1 + jitter)
+            return (True, None)
 
-            # Verify the change was saved
-            verification = get_game(game_code)
-            if verification and player_id in verification.players:
-                if verification.players[player_id].character_image_url == url:
-                    print(f"CHARACTER IMG: Saved image for {player_id} (attempt {attempt+1})", flush=True)
-                    return
-            print(f"CHARACTER IMG: Race condition for {player_id}, retry {attempt+1}/{max_retries}", flush=True)
-            backoff = (0.15 * (2 ** attempt)) + random.uniform(0, 0.1)
-            await asyncio.sleep(min(backoff, 2.0))
+        def verify(game: GameState) -> bool:
+            return player_id in game.players and game.players[player_id].character_image_url == url
 
-        print(f"CHARACTER IMG: Failed to save after {max_retries} retries for {player_id}", flush=True)
+        # Use retry-and-verify pattern to safely update the player's image
+        try:
+            await update_game_with_retry(game_code, mutator, verify)
+            print(f"CHARACTER IMG: Saved image for {player_id}", flush=True)
+        except HTTPException as e:
+            print(f"CHARACTER IMG: Failed to save image for {player_id}: {e.detail}", flush=True)
 
-    asyncio.run(do_generation())
+    await do_generation()
 
 
-@app.function(image=image, secrets=secrets)
-def prewarm_all_scenarios(game_code: str):
+async def prewarm_all_scenarios_task(game_code: str):
     """Pre-generate scenarios for ALL rounds in parallel when game is created."""
 
     async def do_prewarm():
@@ -2252,29 +2997,225 @@ def prewarm_all_scenarios(game_code: str):
         save_game(game)
         print(f"PREWARM: Complete! {len([s for s in scenarios if s])} scenarios saved", flush=True)
 
-    asyncio.run(do_prewarm())
+    await do_prewarm()
 
 
 async def generate_timeout_image_async(player_id: str, style_theme: str | None):
     """Generate timeout image inline (async version for use within judgement).
 
-    Returns (player_id, url) tuple for easy result processing.
-    """
-    base_prompt = random.choice(prompts.TIMEOUT_IMAGE_OPTIONS) + prompts.TIMEOUT_IMAGE_SUFFIX
-    themed_prompt = apply_style_theme(base_prompt, style_theme)
-    url = await generate_image_fal_async(themed_prompt)
-    print(f"TIMEOUT IMG: Generated for {player_id}: {url is not None}", flush=True)
-    return (player_id, url)
+    Returns (player_id, url) tuple for easy result processing.
+    """
+    base_prompt = random.choice(prompts.TIMEOUT_IMAGE_OPTIONS) + prompts.TIMEOUT_IMAGE_SUFFIX
+    themed_prompt = apply_style_theme(base_prompt, style_theme)
+    url = await generate_image_fal_async(themed_prompt)
+    print(f"TIMEOUT IMG: Generated for {player_id}: {url is not None}", flush=True)
+    return (player_id, url)
+
+
+# --- Per-Player Judgement Persistence ---
+# Judgement workers write each player's verdict the moment the LLM answers, instead of
+# gathering the whole table first. judgement_pending marks players whose verdict is
+# still in flight; the write that clears the last one moves the round on. Result images
+# follow in a second write (result_image_pending marks them) so they never delay a verdict.
+
+# Round types whose strategies are judged one by one as they are submitted
+EARLY_JUDGEMENT_ROUND_TYPES = ["survival", "blind_architect", "last_stand"]
+
+def claim_player(player: Player):
+    player.judgement_pending = True
+    player.judgement_claimed_at = time.time()
+
+
+async def claim_for_judgement(game_code: str, round_idx: int, player_ids: list[str]) -> list[str]:
+    """Mark players judgement_pending so no other writer finishes the round under us.
+
+    Players already pending (an early judge has them) are left out. Returns the claimed IDs.
+    """
+    def mutator(game: GameState):
+        if game.current_round_idx != round_idx:
+            return (False, [])
+        claimed = [pid for pid in player_ids if pid in game.players and not game.players[pid].judgement_pending]
+        for pid in claimed:
+            claim_player(game.players[pid])
+        return (bool(claimed), claimed)
+
+    def verify(game: GameState) -> bool:
+        return game.current_round_idx != round_idx or all(
+            game.players[pid].judgement_pending for pid in player_ids if pid in game.players
+        )
+
+    return await update_game_with_retry(game_code, mutator, verify)
+
+
+async def persist_player_judgement(game_code: str, round_idx: int, player_id: str, apply, finish) -> bool:
+    """Atomically apply one player's verdict; finish the round if it was the last one.
+
+    apply(game, player) writes the verdict. It only runs while the player is still
+    judgement_pending, so a replayed write never awards points twice. finish(game, round)
+    runs once no player is pending and returns True if it moved the round on.
+    Returns True when this write finished the round.
+    """
+    def mutator(game: GameState):
+        if game.current_round_idx != round_idx or player_id not in game.players:
+            return (False, False)
+        player = game.players[player_id]
+        if not player.judgement_pending:
+            return (False, False)
+        apply(game, player)
+        player.judgement_pending = False
+        player.judgement_claimed_at = None
+        finished = False
+        if not any(p.judgement_pending for p in game.players.values()):
+            finished = finish(game, game.rounds[round_idx])
+        return (True, finished)
+
+    def verify(game: GameState) -> bool:
+        return (game.current_round_idx != round_idx or player_id not in game.players
+                or not game.players[player_id].judgement_pending)
+
+    try:
+        finished = await update_game_with_retry(game_code, mutator, verify)
+    except HTTPException as e:
+        print(f"JUDGEMENT: Failed to save result for {player_id[:8]}...: {e.detail}", flush=True)
+        return False
+
+    if finished and round_idx == 0:
+        # Trigger video pre-generation on round 1 results (only once)
+        game = get_game(game_code)
+        if game:
+            maybe_spawn_video_prewarm(game)
+    return finished
+
+
+async def persist_result_image(game_code: str, round_idx: int, player_id: str, image_url: str | None):
+    """Attach a player's result image (or give up on it) after the verdict is out."""
+    def mutator(game: GameState):
+        if game.current_round_idx != round_idx or player_id not in game.players:
+            return (False, None)
+        player = game.players[player_id]
+        if not image_url and not player.result_image_pending:
+            return (False, None)
+        if image_url:
+            player.result_image_url = image_url
+        player.result_image_pending = False
+        return (True, None)
+
+    def verify(game: GameState) -> bool:
+        if game.current_round_idx != round_idx or player_id not in game.players:
+            return True
+        player = game.players[player_id]
+        return not player.result_image_pending and (not image_url or player.result_image_url == image_url)
+
+    try:
+        await update_game_with_retry(game_code, mutator, verify)
+    except HTTPException as e:
+        print(f"JUDGEMENT: Failed to save result image for {player_id[:8]}...: {e.detail}", flush=True)
+
+
+async def render_result_image(game_code: str, round_idx: int, player_id: str, visual_prompt: str, style_theme: str | None):
+    """Second phase of a verdict: draw the result image and attach it."""
+    telemetry.set_tags(player=player_id)
+    themed_prompt = apply_style_theme(visual_prompt, style_theme)
+    image_url = await generate_image_fal_async(themed_prompt)
+    await persist_result_image(game_code, round_idx, player_id, image_url)
+
+
+def verdict_applier(survived: bool, reason: str, image_pending: bool, points: int = 100):
+    """apply() for a survived/died verdict worth `points` on survival."""
+    def apply(game: GameState, player: Player):
+        player.is_alive = survived
+        if not survived:
+            player.death_reason = reason
+            player.survival_reason = None
+        else:
+            player.score += points
+            player.survival_reason = reason
+            player.death_reason = None
+        player.result_image_pending = image_pending
+    return apply
+
+
+def finish_standard_judgement(game: GameState, current_round: Round) -> bool:
+    """Survival/blind-architect rounds: results once every submitted strategy is judged."""
+    if current_round.status == "judgement":
+        current_round.status = "results"
+        return True
+    in_lobby_players = [p for p in game.players.values() if p.in_lobby]
+    if current_round.status == "strategy" and all(p.strategy for p in in_lobby_players):
+        current_round.status = "results"
+        return True
+    return False
+
+
+def finish_last_stand_judgement(game: GameState, current_round: Round) -> bool:
+    """Last Stand: revival vote if there are both survivors and dead, else results."""
+    in_lobby_players = [p for p in game.players.values() if p.in_lobby]
+    if current_round.status == "strategy":
+        if not all(p.strategy for p in in_lobby_players):
+            return False
+    elif current_round.status != "judgement":
+        return False
+    survivors = [p for p in game.players.values() if p.is_alive]
+    dead_players = [p for p in game.players.values() if not p.is_alive]
+    if survivors and dead_players:
+        current_round.status = "last_stand_revival"
+        current_round.vote_start_time = time.time()
+        print(f"LAST STAND: {len(survivors)} survivors, {len(dead_players)} dead - entering revival phase", flush=True)
+    else:
+        # Skip revival - either everyone survived or everyone died
+        current_round.status = "results"
+        print(f"LAST STAND: Skipping revival (survivors={len(survivors)}, dead={len(dead_players)})", flush=True)
+    return True
+
+
+def expire_stale_judgement_claims(game: GameState, current_round: Round) -> list[str]:
+    """Give the fallback verdict to players whose judge never reported back.
+
+    A claim older than game.judgement_timeout_seconds belongs to a worker that died or
+    failed to spawn; without this the round would wait for it forever. A late verdict
+    from that worker is ignored by persist_player_judgement. Returns the expired IDs.
+    """
+    cutoff = time.time() - CONFIG["game"].get("judgement_timeout_seconds", 180)
+    fallback = json.loads(prompts.FALLBACK_LAST_STAND_JUDGEMENT if current_round.type == "last_stand"
+                          else prompts.FALLBACK_STRATEGY_JUDGEMENT)
+    expired = []
+    for pid, player in game.players.items():
+        if player.judgement_pending and (player.judgement_claimed_at or 0) < cutoff:
+            verdict_applier(fallback["survived"], fallback["reason"], image_pending=False)(game, player)
+            player.judgement_pending = False
+            player.judgement_claimed_at = None
+            expired.append(pid)
+    return expired
+
+
+async def finish_judgement_if_settled(game_code: str, round_idx: int, finish) -> bool:
+    """Run finish() if nothing is pending (e.g. every verdict landed before this worker started)."""
+    def mutator(game: GameState):
+        if game.current_round_idx != round_idx:
+            return (False, False)
+        if any(p.judgement_pending for p in game.players.values()):
+            return (False, False)
+        finished = finish(game, game.rounds[round_idx])
+        return (finished, finished)
+
+    def verify(game: GameState) -> bool:
+        return (game.current_round_idx != round_idx
+                or game.rounds[round_idx].status in ("results", "last_stand_revival"))
+
+    finished = await update_game_with_retry(game_code, mutator, verify)
+    if finished and round_idx == 0:
+        game = get_game(game_code)
+        if game:
+            maybe_spawn_video_prewarm(game)
+    return finished
 
 
-@app.function(image=image, secrets=secrets)
-def run_round_judgement(game_code: str, expected_round_idx: int = -1):
-    """Run judgement for all players in parallel using asyncio."""
-    import json
-    import asyncio
+async def run_round_judgement_task(game_code: str, expected_round_idx: int = -1):
+    """Run judgement for all players in parallel, saving each verdict as it lands."""
 
-    async def judge_and_generate(pid: str, player_name: str, strategy: str, scenario: str, style_theme: str | None):
-        """Judge a single player and generate their result image."""
+    async def judge_and_persist(round_idx: int, pid: str, player_name: str, strategy: str, scenario: str, style_theme: str | None):
+        """Judge a single player, save the verdict, then generate and attach their result image."""
+        telemetry.set_tags(player=pid)
         try:
             # Judge the strategy
             result_json = await judge_strategy_llm_async(scenario, strategy)
@@ -2283,25 +3224,26 @@ def run_round_judgement(game_code: str, expected_round_idx: int = -1):
             survived = res.get("survived", False)
             reason = res.get("reason", "Unknown")
             vis_prompt = res.get("visual_prompt", "A generic scene.")
-
-            # Generate image with round's style theme
-            themed_prompt = apply_style_theme(vis_prompt, style_theme)
-            image_url = await generate_image_fal_async(themed_prompt)
-
-            return {
-                "pid": pid,
-                "survived": survived,
-                "reason": reason,
-                "image_url": image_url
-            }
         except Exception as e:
             print(f"JUDGEMENT: Error for {pid}: {e}", flush=True)
-            return {
-                "pid": pid,
-                "survived": False,
-                "reason": "The AI judge malfunctioned...",
-                "image_url": None
-            }
+            survived, reason, vis_prompt = False, "The AI judge malfunctioned...", None
+
+        finished = await persist_player_judgement(
+            game_code, round_idx, pid,
+            verdict_applier(survived, reason, image_pending=vis_prompt is not None),
+            finish_standard_judgement,
+        )
+        print(f"JUDGEMENT: {player_name} survived={survived}", flush=True)
+        if finished:
+            print(f"JUDGEMENT: Last verdict saved, status is now results", flush=True)
+
+        # Generate image with round's style theme
+        if vis_prompt is not None:
+            await render_result_image(game_code, round_idx, pid, vis_prompt, style_theme)
+
+    async def timeout_image_and_persist(round_idx: int, pid: str, style_theme: str | None):
+        _, url = await generate_timeout_image_async(pid, style_theme)
+        await persist_result_image(game_code, round_idx, pid, url)
 
     async def run_all_judgements():
         print(f"JUDGEMENT: Starting for game {game_code}", flush=True)
@@ -2316,12 +3258,12 @@ def run_round_judgement(game_code: str, expected_round_idx: int = -1):
             print(f"JUDGEMENT: Round mismatch! Expected {expected_round_idx}, got {game.current_round_idx}. Aborting.", flush=True)
             return
 
-        current_round = game.rounds[game.current_round_idx]
+        round_idx = game.current_round_idx
+        current_round = game.rounds[round_idx]
         print(f"JUDGEMENT: Round {current_round.number}, scenario: {current_round.scenario_text[:50]}...", flush=True)
 
         # Collect all players that need judging
-        tasks = []
-        player_info = []
+        candidates = []
         for pid, p in game.players.items():
             print(f"JUDGEMENT: Player {p.name} (alive={p.is_alive}, strategy={bool(p.strategy)}, pending={p.judgement_pending}, has_reason={bool(p.death_reason or p.survival_reason)})", flush=True)
 
@@ -2336,105 +3278,90 @@ def run_round_judgement(game_code: str, expected_round_idx: int = -1):
                 continue
 
             if p.strategy and p.is_alive:
-                tasks.append(judge_and_generate(pid, p.name, p.strategy, current_round.scenario_text, current_round.style_theme))
-                player_info.append((pid, p.name))
+                candidates.append(pid)
+
+        # Claim before judging so an early judge finishing meanwhile can't flip to results
+        claimed = await claim_for_judgement(game_code, round_idx, candidates) if candidates else []
+        tasks = [
+            judge_and_persist(round_idx, pid, game.players[pid].name, game.players[pid].strategy,
+                              current_round.scenario_text, current_round.style_theme)
+            for pid in claimed
+        ]
 
-        # Collect timeout image tasks for timed-out players
-        timeout_pids = list(current_round.timed_out_players.keys())
+        # Timeout images are saved as they arrive and don't hold up results
         timeout_tasks = [
-            generate_timeout_image_async(pid, current_round.style_theme)
-            for pid in timeout_pids if pid in game.players
+            timeout_image_and_persist(round_idx, pid, current_round.style_theme)
+            for pid in current_round.timed_out_players if pid in game.players
         ]
         if timeout_tasks:
             print(f"JUDGEMENT: Also generating {len(timeout_tasks)} timeout images", flush=True)
 
-        # Run ALL tasks in parallel (judgements + timeout images)
-        num_judgement_tasks = len(tasks)
-        all_tasks = tasks + timeout_tasks
-        results = []
-        timeout_results = []
+        if not tasks:
+            # Everything was judged early (or nobody submitted) - just settle the round
+            if await finish_judgement_if_settled(game_code, round_idx, finish_standard_judgement):
+                print(f"JUDGEMENT: Nothing left to judge, status is now results", flush=True)
 
+        all_tasks = tasks + timeout_tasks
         if all_tasks:
             print(f"JUDGEMENT: Running {len(all_tasks)} tasks in parallel...", flush=True)
-            all_results = await asyncio.gather(*all_tasks)
-            results = all_results[:num_judgement_tasks]
-            timeout_results = all_results[num_judgement_tasks:]
+            await asyncio.gather(*all_tasks)
 
-            # Apply judgement results to game state
-            for result in results:
-                pid = result["pid"]
-                p = game.players[pid]
-                p.is_alive = result["survived"]
-                if not result["survived"]:
-                    p.death_reason = result["reason"]
-                    p.survival_reason = None
-                else:
-                    p.score += 100
-                    p.survival_reason = result["reason"]
-                    p.death_reason = None
-                if result["image_url"]:
-                    p.result_image_url = result["image_url"]
-                print(f"JUDGEMENT: {p.name} survived={result['survived']}", flush=True)
-
-            # Apply timeout images
-            for pid, url in timeout_results:
-                if url and pid in game.players:
-                    game.players[pid].result_image_url = url
-                    print(f"JUDGEMENT: Saved timeout image for {game.players[pid].name}", flush=True)
-
-        # Re-fetch game state to merge with any concurrent early judgement results
-        # This prevents overwriting scores/reasons set by judge_single_player
-        fresh_game = get_game(game_code)
-        if fresh_game:
-            fresh_round = fresh_game.rounds[fresh_game.current_round_idx]
-
-            # Apply our results to fresh state
-            for result in results:
-                pid = result["pid"]
-                if pid in fresh_game.players:
-                    p = fresh_game.players[pid]
-                    p.is_alive = result["survived"]
-                    if not result["survived"]:
-                        p.death_reason = result["reason"]
-                        p.survival_reason = None
-                    else:
-                        p.score += 100
-                        p.survival_reason = result["reason"]
-                        p.death_reason = None
-                    if result["image_url"]:
-                        p.result_image_url = result["image_url"]
-
-            # Apply timeout images to fresh state
-            for pid, url in timeout_results:
-                if url and pid in fresh_game.players:
-                    fresh_game.players[pid].result_image_url = url
-
-            fresh_round.status = "results"
-            save_game(fresh_game)
-            game = fresh_game  # Update reference for video pre-generation check
-        else:
-            # Fallback if re-fetch fails
-            print(f"JUDGEMENT: Warning - could not re-fetch game, saving original state", flush=True)
-            current_round.status = "results"
-            save_game(game)
+        print(f"JUDGEMENT: Complete!", flush=True)
 
-        print(f"JUDGEMENT: Setting status to results", flush=True)
+    # Run the async function
+    await run_all_judgements()
 
-        # Trigger video pre-generation on round 1 results (only once)
-        if game.current_round_idx == 0:
-            maybe_spawn_video_prewarm(game)
 
-        print(f"JUDGEMENT: Complete!", flush=True)
+async def run_ranked_judgement_task(game_code: str, expected_round_idx: int = -1):
+    """Run ranked judgement - compare all strategies and assign rankings.
 
-    # Run the async function
-    asyncio.run(run_all_judgements())
+    Rankings and points go out in one write as soon as the LLM answers, moving the
+    round to results; each player's image is attached as it lands.
+    """
 
+    async def save_rankings(round_idx: int, entries: list[tuple], num_players: int, images_pending: bool) -> bool:
+        """Atomically store (pid, rank, reason, commentary) entries, award points and show results.
 
-@app.function(image=image, secrets=secrets)
-def run_ranked_judgement(game_code: str, expected_round_idx: int = -1):
-    """Run ranked judgement - compare all strategies and assign rankings."""
-    import json
-    import asyncio
+        Returns False if another writer already ranked this round.
+        """
+        def mutator(game: GameState):
+            if game.current_round_idx != round_idx:
+                return (False, False)
+            current_round = game.rounds[round_idx]
+            if current_round.status != "ranked_judgement" or current_round.ranked_results:
+                return (False, False)
+            for pid, rank, reason, commentary in entries:
+                if pid not in game.players:
+                    continue
+                player = game.players[pid]
+                current_round.ranked_results[pid] = rank
+                if commentary is not None:
+                    current_round.ranked_commentary[pid] = commentary
+                points = calculate_ranked_points(num_players, rank)
+                current_round.ranked_points[pid] = points
+                player.score += points
+                # Only rank 1 survives - everyone else dies
+                if rank == 1:
+                    player.is_alive = True
+                    player.survival_reason = reason
+                    player.death_reason = None
+                else:
+                    player.is_alive = False
+                    player.death_reason = reason
+                    player.survival_reason = None
+                player.result_image_pending = images_pending
+                print(f"RANKED_JUDGE: {player.name} - Rank {rank}, +{points} pts", flush=True)
+            current_round.status = "results"
+            return (True, True)
+
+        def verify(game: GameState) -> bool:
+            return game.current_round_idx != round_idx or bool(game.rounds[round_idx].ranked_results)
+
+        return await update_game_with_retry(game_code, mutator, verify)
+
+    async def timeout_image_and_persist(round_idx: int, pid: str, style_theme: str | None):
+        _, url = await generate_timeout_image_async(pid, style_theme)
+        await persist_result_image(game_code, round_idx, pid, url)
 
     async def do_ranked_judgement():
         print(f"RANKED_JUDGE: Starting for game {game_code}", flush=True)
@@ -2449,7 +3376,8 @@ def run_ranked_judgement(game_code: str, expected_round_idx: int = -1):
             print(f"RANKED_JUDGE: Round mismatch! Expected {expected_round_idx}, got {game.current_round_idx}. Aborting.", flush=True)
             return
 
-        current_round = game.rounds[game.current_round_idx]
+        round_idx = game.current_round_idx
+        current_round = game.rounds[round_idx]
 
         # Collect all alive players with strategies
         strategies = []
@@ -2461,14 +3389,23 @@ def run_ranked_judgement(game_code: str, expected_round_idx: int = -1):
                     "strategy": p.strategy
                 })
 
+        # Timeout images are saved as they arrive and don't hold up results
+        timeout_tasks = [
+            timeout_image_and_persist(round_idx, pid, current_round.style_theme)
+            for pid in current_round.timed_out_players if pid in game.players
+        ]
+        if timeout_tasks:
+            print(f"RANKED_JUDGE: Also generating {len(timeout_tasks)} timeout images", flush=True)
+
         if not strategies:
             print("RANKED_JUDGE: No strategies to judge!", flush=True)
-            current_round.status = "results"
-            save_game(game)
+            await save_rankings(round_idx, [], 0, images_pending=False)
+            await asyncio.gather(*timeout_tasks)
             return
 
         print(f"RANKED_JUDGE: Judging {len(strategies)} strategies...", flush=True)
 
+        image_tasks = []
         try:
             # Get comparative ranking from LLM
             result_json = await rank_all_strategies_llm_async(
@@ -2478,230 +3415,123 @@ def run_ranked_judgement(game_code: str, expected_round_idx: int = -1):
             result = json.loads(result_json)
             rankings = result.get("rankings", [])
 
-            # Store rankings and calculate points
-            num_players = len(strategies)
-            visual_prompts = {}
+            unknown = [r["player_id"] for r in rankings if r["player_id"] not in game.players]
+            if unknown:
+                raise ValueError(f"Rankings name unknown players: {unknown}")
 
+            entries = []
+            visual_prompts = {}
             for r in rankings:
-                pid = r["player_id"]
-                rank = r["rank"]
                 commentary = r.get("commentary", "No comment")
-                vis_prompt = r.get("visual_prompt", "A survival scene")
-
-                # Store in round data
-                current_round.ranked_results[pid] = rank
-                current_round.ranked_commentary[pid] = commentary
-
-                # Calculate and award points
-                points = calculate_ranked_points(num_players, rank)
-                current_round.ranked_points[pid] = points
-                game.players[pid].score += points
-
-                # Only rank 1 survives - everyone else dies
-                if rank == 1:
-                    game.players[pid].is_alive = True
-                    game.players[pid].survival_reason = commentary
-                    game.players[pid].death_reason = None
-                else:
-                    game.players[pid].is_alive = False
-                    game.players[pid].death_reason = commentary
-                    game.players[pid].survival_reason = None
-
-                visual_prompts[pid] = vis_prompt
-
-                print(f"RANKED_JUDGE: {game.players[pid].name} - Rank {rank}, +{points} pts", flush=True)
-
-            # Generate images in parallel
-            async def generate_player_image(pid: str, prompt: str):
-                themed_prompt = apply_style_theme(prompt, current_round.style_theme)
-                url = await generate_image_fal_async(themed_prompt)
-                return pid, url
-
-            image_tasks = [
-                generate_player_image(pid, prompt)
-                for pid, prompt in visual_prompts.items()
-            ]
+                entries.append((r["player_id"], r["rank"], commentary, commentary))
+                visual_prompts[r["player_id"]] = r.get("visual_prompt", "A survival scene")
 
-            # Also generate timeout images for timed-out players
-            timeout_pids = list(current_round.timed_out_players.keys())
-            timeout_tasks = [
-                generate_timeout_image_async(pid, current_round.style_theme)
-                for pid in timeout_pids if pid in game.players
-            ]
-            if timeout_tasks:
-                print(f"RANKED_JUDGE: Also generating {len(timeout_tasks)} timeout images", flush=True)
-
-            # Run all image tasks in parallel
-            all_image_tasks = image_tasks + timeout_tasks
-            all_image_results = await asyncio.gather(*all_image_tasks)
-            image_results = all_image_results[:len(image_tasks)]
-            timeout_results = all_image_results[len(image_tasks):]
-
-            # Apply images to players
-            for pid, url in image_results:
-                if url:
-                    game.players[pid].result_image_url = url
-
-            # Apply timeout images
-            for pid, url in timeout_results:
-                if url and pid in game.players:
-                    game.players[pid].result_image_url = url
-                    print(f"RANKED_JUDGE: Saved timeout image for {game.players[pid].name}", flush=True)
+            if await save_rankings(round_idx, entries, len(strategies), images_pending=bool(visual_prompts)):
+                image_tasks = [
+                    render_result_image(game_code, round_idx, pid, prompt, current_round.style_theme)
+                    for pid, prompt in visual_prompts.items()
+                ]
 
         except Exception as e:
             print(f"RANKED_JUDGE: Error - {e}", flush=True)
             import traceback
             traceback.print_exc()
             # Fallback: pick random winner, everyone else dies
-            import random
             winner_idx = random.randint(0, len(strategies) - 1)
+            entries = []
             for i, s in enumerate(strategies):
-                pid = s["player_id"]
-                rank = 1 if i == winner_idx else i + 2
-                current_round.ranked_results[pid] = rank
-                points = calculate_ranked_points(len(strategies), rank)
-                current_round.ranked_points[pid] = points
-                game.players[pid].score += points
                 if i == winner_idx:
-                    game.players[pid].is_alive = True
-                    game.players[pid].survival_reason = "Randomly selected as winner due to judgement error"
+                    entries.append((s["player_id"], 1, "Randomly selected as winner due to judgement error", None))
                 else:
-                    game.players[pid].is_alive = False
-                    game.players[pid].death_reason = "Failed to rank higher (judgement error fallback)"
-
-        # Transition to results
-        current_round.status = "results"
-        save_game(game)
+                    entries.append((s["player_id"], i + 2, "Failed to rank higher (judgement error fallback)", None))
+            await save_rankings(round_idx, entries, len(strategies), images_pending=False)
 
         # Trigger video pre-generation on round 1 results (only once)
-        if game.current_round_idx == 0:
-            maybe_spawn_video_prewarm(game)
+        if round_idx == 0:
+            game = get_game(game_code)
+            if game and game.rounds[round_idx].status == "results":
+                maybe_spawn_video_prewarm(game)
+
+        await asyncio.gather(*image_tasks, *timeout_tasks)
 
         print("RANKED_JUDGE: Complete!", flush=True)
 
-    asyncio.run(do_ranked_judgement())
+    await do_ranked_judgement()
 
 
-@app.function(image=image, secrets=secrets)
-def judge_single_player(game_code: str, player_id: str):
+async def judge_single_player_task(game_code: str, player_id: str, expected_round_idx: int = -1):
     """Judge a single player immediately when they submit strategy (early judgement for latency reduction)."""
-    import json
-    import asyncio
 
     async def do_judge():
         print(f"EARLY_JUDGE: Starting for player {player_id} in game {game_code}", flush=True)
+        telemetry.set_tags(player=player_id)
 
         game = get_game(game_code)
         if not game:
             print(f"EARLY_JUDGE: Game {game_code} not found!", flush=True)
             return
 
+        if expected_round_idx >= 0 and game.current_round_idx != expected_round_idx:
+            print(f"EARLY_JUDGE: Round mismatch! Expected {expected_round_idx}, got {game.current_round_idx}. Aborting.", flush=True)
+            return
+
         if player_id not in game.players:
             print(f"EARLY_JUDGE: Player {player_id} not found!", flush=True)
             return
 
         player = game.players[player_id]
-        current_round = game.rounds[game.current_round_idx]
+        round_idx = game.current_round_idx
+        current_round = game.rounds[round_idx]
+
+        # Last Stand strategies get the harsh judge and may lead into the revival vote
+        if current_round.type == "last_stand":
+            judge, finish, error_reason = judge_strategy_harsh_async, finish_last_stand_judgement, "The final boss showed no mercy..."
+        else:
+            judge, finish, error_reason = judge_strategy_llm_async, finish_standard_judgement, "The AI judge malfunctioned..."
 
-        # Only judge if player has strategy, is alive, and we're in strategy phase
+        # Only judge if player has strategy and is alive
         if not player.strategy or not player.is_alive:
             print(f"EARLY_JUDGE: Player {player.name} not eligible (strategy={bool(player.strategy)}, alive={player.is_alive})", flush=True)
-            player.judgement_pending = False
-            save_game(game)
+            await persist_player_judgement(game_code, round_idx, player_id, lambda game, player: None, finish)
             return
 
         try:
             # Judge the strategy
-            result_json = await judge_strategy_llm_async(current_round.scenario_text, player.strategy)
+            result_json = await judge(current_round.scenario_text, player.strategy)
             print(f"EARLY_JUDGE: Got result for {player.name}: {result_json[:100]}...", flush=True)
             res = json.loads(result_json)
             survived = res.get("survived", False)
             reason = res.get("reason", "Unknown")
             vis_prompt = res.get("visual_prompt", "A generic scene.")
-
-            # Generate image with round's style theme
-            themed_prompt = apply_style_theme(vis_prompt, current_round.style_theme)
-            image_url = await generate_image_fal_async(themed_prompt)
-
-            # Re-fetch game state to get latest (in case other players submitted)
-            game = get_game(game_code)
-            if not game:
-                print(f"EARLY_JUDGE: Game disappeared!", flush=True)
-                return
-
-            current_round = game.rounds[game.current_round_idx]
-            player = game.players[player_id]
-
-            # Apply results to player
-            player.is_alive = survived
-            if not survived:
-                player.death_reason = reason
-                player.survival_reason = None
-            else:
-                player.score += 100
-                player.survival_reason = reason
-                player.death_reason = None
-            if image_url:
-                player.result_image_url = image_url
-            player.judgement_pending = False
-
             print(f"EARLY_JUDGE: {player.name} survived={survived}", flush=True)
-
         except Exception as e:
             print(f"EARLY_JUDGE: Error for {player.name}: {e}", flush=True)
-            # Re-fetch and set defaults
-            game = get_game(game_code)
-            if game and player_id in game.players:
-                player = game.players[player_id]
-                player.is_alive = False
-                player.death_reason = "The AI judge malfunctioned..."
-                player.survival_reason = None
-                player.judgement_pending = False
-
-        # Check if all players are done - if so, transition to results
+            survived, reason, vis_prompt = False, error_reason, None
+
+        # Saving clears judgement_pending; the last pending player's save moves to results
         # NOTE: Don't filter by last_active - the round timeout handles inactive players.
         # Filtering by heartbeat causes premature advancement when players background their tab.
-        in_lobby_players = [p for p in game.players.values() if p.in_lobby]
-
-        # Check if any judgements are still pending (across ALL players, not just filtered)
-        any_pending = any(p.judgement_pending for p in game.players.values())
-        # Check if all in-lobby players have submitted strategies
-        all_submitted = all(p.strategy for p in in_lobby_players) if in_lobby_players else True
-
-        print(f"EARLY_JUDGE: Check - pending={any_pending}, submitted={all_submitted}, players={len(in_lobby_players)}, status={current_round.status}", flush=True)
-
-        # Transition to results when all judgements complete
-        # Status could be "strategy" (still waiting for others) or "judgement" (all submitted, waiting for judges)
-        if current_round.status in ["strategy", "judgement"] and all_submitted and not any_pending:
-            print("EARLY_JUDGE: All judgements complete! Transitioning to results.", flush=True)
-            current_round.status = "results"
-
-            # Trigger video pre-generation on round 1 results (this is the key fix for early judgement path)
-            if game.current_round_idx == 0 and game.videos_status == "pending":
-                print("EARLY_JUDGE: Round 1 complete, triggering video pre-generation", flush=True)
-                # Set status before save to prevent race with other early judges
-                game.videos_status = "generating"
-                game.videos_started_at = time.time()
-                save_game(game)
-                prewarm_player_videos.spawn(game.code)
-                print(f"EARLY_JUDGE: Complete for {player.name}!", flush=True)
-                return  # Already saved, exit early
-
-        save_game(game)
+        if await persist_player_judgement(
+            game_code, round_idx, player_id,
+            verdict_applier(survived, reason, image_pending=vis_prompt is not None),
+            finish,
+        ):
+            print("EARLY_JUDGE: All judgements complete! Moving the round on.", flush=True)
+
+        # Generate image with round's style theme once the verdict is out
+        if vis_prompt is not None:
+            await render_result_image(game_code, round_idx, player_id, vis_prompt, current_round.style_theme)
         print(f"EARLY_JUDGE: Complete for {player.name}!", flush=True)
 
-    asyncio.run(do_judge())
+    await do_judge()
 
 
 # Keep old function name as alias for backwards compatibility
 generate_result_image_async = generate_result_image_sync
 
 
-@app.function(image=image, secrets=secrets, timeout=900)  # 15 min timeout for multiple videos
-def generate_all_player_videos(game_code: str):
+async def generate_all_player_videos_task(game_code: str):
     """Generate personalized 10-second videos for ALL players using parallel phases."""
-    import asyncio
-    import httpx
 
     async def do_all_video_generation():
         game = get_game(game_code)
@@ -2794,67 +3624,67 @@ def generate_all_player_videos(game_code: str):
         # ============================================================
         print(f"VIDEO GEN PHASE 3: Submitting {len(player_images)} video requests in parallel...", flush=True)
 
-        async with httpx.AsyncClient(timeout=60.0) as client:
-            submit_tasks = []
-            players_to_submit = []
+        client = get_http_client()
+        submit_tasks = []
+        players_to_submit = []
 
-            for player in sorted_players:
-                if player.id not in player_images:
-                    continue
-                script_data = player_prompts[player.id]
-                image_url = player_images[player.id]
+        for player in sorted_players:
+            if player.id not in player_images:
+                continue
+            script_data = player_prompts[player.id]
+            image_url = player_images[player.id]
 
-                submit_tasks.append(submit_video_request_async(
-                    player.name, image_url, script_data, video_theme, client
-                ))
-                players_to_submit.append(player)
+            submit_tasks.append(submit_video_request_async(
+                player.name, image_url, script_data, video_theme, client
+            ))
+            players_to_submit.append(player)
 
-            submit_results = await asyncio.gather(*submit_tasks, return_exceptions=True)
+        submit_results = await asyncio.gather(*submit_tasks, return_exceptions=True)
 
-            # Collect request IDs
-            player_request_ids = {}  # player_id -> request_id
-            for player, result in zip(players_to_submit, submit_results):
-                if isinstance(result, Exception) or result is None:
-                    print(f"VIDEO GEN PHASE 3: Submit failed for {player.name}", flush=True)
-                else:
-                    player_request_ids[player.id] = result
+        # Collect request IDs
+        player_request_ids = {}  # player_id -> request_id
+        for player, result in zip(players_to_submit, submit_results):
+            if isinstance(result, Exception) or result is None:
+                print(f"VIDEO GEN PHASE 3: Submit failed for {player.name}", flush=True)
+            else:
+                player_request_ids[player.id] = result
 
-            print(f"VIDEO GEN PHASE 3: Complete - {len(player_request_ids)}/{len(players_to_submit)} requests submitted", flush=True)
+        print(f"VIDEO GEN PHASE 3: Complete - {len(player_request_ids)}/{len(players_to_submit)} requests submitted", flush=True)
 
-            if not player_request_ids:
-                print("VIDEO GEN: All video submissions failed, aborting", flush=True)
-                game = get_game(game_code)
-                if game:
-                    game.videos_status = "failed"
-                    save_game(game)
-                return
+        if not player_request_ids:
+            print("VIDEO GEN: All video submissions failed, aborting", flush=True)
+            game = get_game(game_code)
+            if game:
+                game.videos_status = "failed"
+                save_game(game)
+            return
 
-            # ============================================================
-            # PHASE 4: Poll ALL video statuses in parallel
-            # ============================================================
-            print(f"VIDEO GEN PHASE 4: Polling {len(player_request_ids)} videos in parallel...", flush=True)
+        # ============================================================
+        # PHASE 4: Poll ALL video statuses in parallel
+        # ============================================================
+        print(f"VIDEO GEN PHASE 4: Polling {len(player_request_ids)} videos in parallel...", flush=True)
 
-            poll_tasks = []
-            players_to_poll = []
+        poll_tasks = []
+        players_to_poll = []
 
-            for player in sorted_players:
-                if player.id not in player_request_ids:
-                    continue
-                request_id = player_request_ids[player.id]
-                poll_tasks.append(poll_video_status_async(player.name, request_id, client))
-                players_to_poll.append(player)
+        for player in sorted_players:
+            if player.id not in player_request_ids:
+                continue
+            request_id = player_request_ids[player.id]
+            poll_tasks.append(poll_video_status_async(player.name, request_id, client))
+            players_to_poll.append(player)
 
-            poll_results = await asyncio.gather(*poll_tasks, return_exceptions=True)
+        poll_results = await asyncio.gather(*poll_tasks, return_exceptions=True)
 
-            # Collect video URLs
-            player_videos = {}  # player_id -> video_url
-            for player, result in zip(players_to_poll, poll_results):
-                if isinstance(result, Exception) or result is None:
-                    print(f"VIDEO GEN PHASE 4: Video failed for {player.name}", flush=True)
-                else:
-                    player_videos[player.id] = result
+        # Collect video URLs
+        player_videos = {}  # player_id -> video_url
+        for player, result in zip(players_to_poll, poll_results):
+            if isinstance(result, Exception) or result is None:
+                print(f"VIDEO GEN PHASE 4: Video failed for {player.name}", flush=True)
+            else:
+                player_videos[player.id] = result
 
-            print(f"VIDEO GEN PHASE 4: Complete - {len(player_videos)}/{len(players_to_poll)} videos ready", flush=True)
+        print(f"VIDEO GEN PHASE 4: Complete - {len(player_videos)}/{len(players_to_poll)} videos ready", flush=True)
 
         # ============================================================
         # Save results to game state
@@ -2873,23 +3703,16 @@ def generate_all_player_videos(game_code: str):
 
             save_game(game)
 
-    asyncio.run(do_all_video_generation())
-
-
-# Keep old function name as alias for backwards compatibility
-generate_winner_video = generate_all_player_videos
+    await do_all_video_generation()
 
 
-@app.function(image=image, secrets=secrets, timeout=900)  # 15 min timeout for multiple videos
-def prewarm_player_videos(game_code: str):
+async def prewarm_player_videos_task(game_code: str):
     """Pre-generate winner AND loser videos for ALL players using their avatars.
 
     Called when round 1 results are shown.
     Generates 2 videos per player (winner + loser) so the correct one can be
     selected instantly at game end.
     """
-    import asyncio
-    import httpx
 
     async def do_prewarm_videos():
         game = get_game(game_code)
@@ -2914,25 +3737,35 @@ def prewarm_player_videos(game_code: str):
         print(f"PREWARM VIDEO: Starting for {total_players} players, theme: {video_theme}", flush=True)
 
         # ============================================================
-        # PHASE 1: Generate ALL LLM prompts in parallel (2 per player)
+        # PHASE 1: Generate ALL LLM prompts (one batched call, per-player fallback)
         # ============================================================
-        print(f"PREWARM VIDEO PHASE 1: Generating {total_players * 2} LLM prompts...", flush=True)
+        player_prompts = {p.id: {} for p in players}
+
+        if CONFIG["video_generation"].get("batch_scripts", True):
+            print(f"PREWARM VIDEO PHASE 1: Generating {total_players * 2} scripts in one batched LLM call...", flush=True)
+            batch_scripts = await generate_video_scripts_batch_async(
+                [(p.id, p.name) for p in players], video_theme
+            )
+            for player_id, scripts in batch_scripts.items():
+                player_prompts[player_id].update(scripts)
 
         llm_tasks = []
         task_metadata = []  # Track (video_type, player_id) for each task
 
         for player in players:
-            # Winner prompt
-            llm_tasks.append(generate_video_prompt_winner_async(player.name, video_theme))
-            task_metadata.append(("winner", player.id))
-            # Loser prompt
-            llm_tasks.append(generate_video_prompt_loser_async(player.name, video_theme))
-            task_metadata.append(("loser", player.id))
-
+            # Only call the per-player prompts for scripts the batch didn't cover
+            if "winner" not in player_prompts[player.id]:
+                llm_tasks.append(generate_video_prompt_winner_async(player.name, video_theme))
+                task_metadata.append(("winner", player.id))
+            if "loser" not in player_prompts[player.id]:
+                llm_tasks.append(generate_video_prompt_loser_async(player.name, video_theme))
+                task_metadata.append(("loser", player.id))
+
+        if llm_tasks:
+            print(f"PREWARM VIDEO PHASE 1: Generating {len(llm_tasks)} per-player LLM prompts...", flush=True)
         llm_results_raw = await asyncio.gather(*llm_tasks, return_exceptions=True)
 
         # Organize results: {player_id: {"winner": {...}, "loser": {...}}}
-        player_prompts = {p.id: {} for p in players}
         for idx, (video_type, player_id) in enumerate(task_metadata):
             result = llm_results_raw[idx]
             if isinstance(result, Exception):
@@ -3003,80 +3836,80 @@ def prewarm_player_videos(game_code: str):
         # ============================================================
         print(f"PREWARM VIDEO PHASE 3: Submitting video requests...", flush=True)
 
-        async with httpx.AsyncClient(timeout=60.0) as client:
-            submit_tasks = []
-            submit_metadata = []  # (player_id, video_type)
+        client = get_http_client()
+        submit_tasks = []
+        submit_metadata = []  # (player_id, video_type)
 
-            for player in players:
-                if player.id not in player_base_images:
-                    continue
+        for player in players:
+            if player.id not in player_base_images:
+                continue
 
-                base_image = player_base_images[player.id]
+            base_image = player_base_images[player.id]
 
-                for video_type in ["winner", "loser"]:
-                    script_data = player_prompts[player.id][video_type]
+            for video_type in ["winner", "loser"]:
+                script_data = player_prompts[player.id][video_type]
 
-                    task = submit_video_request_async(
-                        player.name, base_image, script_data, video_theme, client
-                    )
-                    submit_tasks.append(task)
-                    submit_metadata.append((player.id, video_type))
+                task = submit_video_request_async(
+                    player.name, base_image, script_data, video_theme, client
+                )
+                submit_tasks.append(task)
+                submit_metadata.append((player.id, video_type))
 
-            submit_results = await asyncio.gather(*submit_tasks, return_exceptions=True)
+        submit_results = await asyncio.gather(*submit_tasks, return_exceptions=True)
 
-            # Collect request IDs: {player_id: {"winner": request_id, "loser": request_id}}
-            player_request_ids = {p.id: {} for p in players}
-            for idx, (player_id, video_type) in enumerate(submit_metadata):
-                result = submit_results[idx]
-                if isinstance(result, Exception) or result is None:
-                    print(f"PREWARM VIDEO PHASE 3: Submit failed for {player_id} ({video_type})", flush=True)
-                else:
-                    player_request_ids[player_id][video_type] = result
+        # Collect request IDs: {player_id: {"winner": request_id, "loser": request_id}}
+        player_request_ids = {p.id: {} for p in players}
+        for idx, (player_id, video_type) in enumerate(submit_metadata):
+            result = submit_results[idx]
+            if isinstance(result, Exception) or result is None:
+                print(f"PREWARM VIDEO PHASE 3: Submit failed for {player_id} ({video_type})", flush=True)
+            else:
+                player_request_ids[player_id][video_type] = result
 
-            total_submitted = sum(len(v) for v in player_request_ids.values())
-            print(f"PREWARM VIDEO PHASE 3: {total_submitted} video requests submitted", flush=True)
+        total_submitted = sum(len(v) for v in player_request_ids.values())
+        print(f"PREWARM VIDEO PHASE 3: {total_submitted} video requests submitted", flush=True)
 
-            if total_submitted == 0:
-                print("PREWARM VIDEO: All submissions failed, aborting", flush=True)
-                game = get_game(game_code)
-                if game:
-                    game.videos_status = "failed"
-                    save_game(game)
-                return
+        if total_submitted == 0:
+            print("PREWARM VIDEO: All submissions failed, aborting", flush=True)
+            game = get_game(game_code)
+            if game:
+                game.videos_status = "failed"
+                save_game(game)
+            return
 
-            # ============================================================
-            # PHASE 4: Poll ALL video statuses in parallel
-            # ============================================================
-            print(f"PREWARM VIDEO PHASE 4: Polling video statuses...", flush=True)
+        # ============================================================
+        # PHASE 4: Poll ALL video statuses in parallel
+        # ============================================================
+        print(f"PREWARM VIDEO PHASE 4: Polling video statuses...", flush=True)
 
-            poll_tasks = []
-            poll_metadata = []  # (player_id, video_type)
+        poll_tasks = []
+        poll_metadata = []  # (player_id, video_type)
 
-            for player_id, request_ids in player_request_ids.items():
-                for video_type, request_id in request_ids.items():
-                    if request_id:
-                        player_name = game.players[player_id].name
-                        task = poll_video_status_async(f"{player_name}_{video_type}", request_id, client)
-                        poll_tasks.append(task)
-                        poll_metadata.append((player_id, video_type))
+        for player_id, request_ids in player_request_ids.items():
+            for video_type, request_id in request_ids.items():
+                if request_id:
+                    player_name = game.players[player_id].name
+                    task = poll_video_status_async(f"{player_name}_{video_type}", request_id, client)
+                    poll_tasks.append(task)
+                    poll_metadata.append((player_id, video_type))
 
-            poll_results = await asyncio.gather(*poll_tasks, return_exceptions=True)
+        poll_results = await asyncio.gather(*poll_tasks, return_exceptions=True)
 
-            # Collect final video URLs
-            winner_videos = {}  # player_id -> video_url
-            loser_videos = {}   # player_id -> video_url
+        # Collect final video URLs
+        winner_videos = {}  # player_id -> video_url
+        loser_videos = {}   # player_id -> video_url
 
-            for idx, (player_id, video_type) in enumerate(poll_metadata):
-                result = poll_results[idx]
-                if isinstance(result, Exception) or result is None:
-                    print(f"PREWARM VIDEO PHASE 4: Video failed for {player_id} ({video_type})", flush=True)
+        for idx, (player_id, video_type) in enumerate(poll_metadata):
+            result = poll_results[idx]
+            if isinstance(result, Exception) or result is None:
+                print(f"PREWARM VIDEO PHASE 4: Video failed for {player_id} ({video_type})", flush=True)
+            else:
+                if video_type == "winner":
+                    winner_videos[player_id] = result
                 else:
-                    if video_type == "winner":
-                        winner_videos[player_id] = result
-                    else:
-                        loser_videos[player_id] = result
+                    loser_videos[player_id] = result
 
-            print(f"PREWARM VIDEO PHASE 4: {len(winner_videos)} winner, {len(loser_videos)} loser videos ready", flush=True)
+        print(f"PREWARM VIDEO PHASE 4: {len(winner_videos)} winner, {len(loser_videos)} loser videos ready", flush=True)
 
         # ============================================================
         # Save results to game state
@@ -3103,7 +3936,7 @@ def prewarm_player_videos(game_code: str):
 
     # Wrap in try/except to ensure we mark as failed if any unexpected error occurs
     try:
-        asyncio.run(do_prewarm_videos())
+        await do_prewarm_videos()
     except Exception as e:
         print(f"PREWARM VIDEO: FATAL ERROR - {e}", flush=True)
         # Try to mark as failed so retry is possible
@@ -3119,76 +3952,166 @@ def prewarm_player_videos(game_code: str):
 
 # --- Cooperative Round Functions ---
 
-@app.function(image=image, secrets=secrets)
-def generate_coop_strategy_images(game_code: str, expected_round_idx: int = -1):
-    """Generate strategy visualization images for all players in cooperative round."""
-    import asyncio
+async def generate_trap_image_task(game_code: str, round_idx: int, player_id: str, trap_text: str):
+    """Render one blind-architect trap and attach it to the proposal.
 
-    async def generate_all_images():
-        game = get_game(game_code)
-        if not game:
-            print(f"COOP IMAGES: Game {game_code} not found!", flush=True)
-            return
+    Spawned per submission, so traps render in parallel while other architects are
+    still typing. The image is dropped if the round moved on or the text changed.
+    """
+    game = get_game(game_code)
+    if not game or game.current_round_idx != round_idx:
+        print(f"TRAP IMAGE: Round {round_idx} of {game_code} is no longer current, skipping", flush=True)
+        return
+    style_theme = game.rounds[round_idx].style_theme
 
-        # Verify we're still on the expected round
-        if expected_round_idx >= 0 and game.current_round_idx != expected_round_idx:
-            print(f"COOP IMAGES: Round mismatch! Expected {expected_round_idx}, got {game.current_round_idx}. Aborting.", flush=True)
-            return
+    img_url = await generate_image_fal_async(apply_style_theme(trap_text, style_theme), use_case="trap_image")
+    if not img_url:
+        print(f"TRAP IMAGE: Generation failed for {player_id[:8]}...", flush=True)
+        return
 
-        current_round = game.rounds[game.current_round_idx]
-        print(f"COOP IMAGES: Generating images for {len(game.players)} players", flush=True)
+    def mutator(game: GameState):
+        if game.current_round_idx != round_idx:
+            return (False, None)
+        current_round = game.rounds[round_idx]
+        if current_round.trap_proposals.get(player_id) != trap_text:
+            return (False, None)
+        current_round.trap_images[player_id] = img_url
+        # Voting can finish before the image lands; the winning trap still gets it
+        if current_round.architect_id == player_id and not current_round.scenario_image_url:
+            current_round.scenario_image_url = img_url
+        return (True, None)
 
-        # Generate images for all alive players with strategies
-        tasks = []
-        player_ids = []
-        for pid, player in game.players.items():
-            if player.is_alive and player.strategy:
-                base_prompt = f"Survival strategy illustration: {player.strategy[:200]}. Dramatic scene, cinematic lighting, vivid colors."
-                themed_prompt = apply_style_theme(base_prompt, current_round.style_theme)
-                tasks.append(generate_image_fal_async(themed_prompt))
-                player_ids.append(pid)
-
-        # Also generate timeout images for timed-out players
-        timeout_pids = list(current_round.timed_out_players.keys())
-        timeout_tasks = []
-        for pid in timeout_pids:
-            if pid in game.players:
-                timeout_tasks.append(generate_timeout_image_async(pid, current_round.style_theme))
-        if timeout_tasks:
-            print(f"COOP IMAGES: Also generating {len(timeout_tasks)} timeout images", flush=True)
+    def verify(game: GameState) -> bool:
+        return game.rounds[round_idx].trap_images.get(player_id) == img_url
 
-        # Run all image generation in parallel
-        num_strategy_tasks = len(tasks)
-        all_tasks = tasks + timeout_tasks
+    try:
+        await update_game_with_retry(game_code, mutator, verify)
+        print(f"TRAP IMAGE: Saved image for {player_id[:8]}...", flush=True)
+    except HTTPException as e:
+        print(f"TRAP IMAGE: Failed to save image for {player_id[:8]}...: {e.detail}", flush=True)
 
-        if all_tasks:
-            print(f"COOP IMAGES: Generating {len(all_tasks)} images in parallel...", flush=True)
-            all_results = await asyncio.gather(*all_tasks)
-            results = all_results[:num_strategy_tasks]
-            timeout_results = all_results[num_strategy_tasks:]
 
-            # Reload game to get fresh state before updating
-            game = get_game(game_code)
-            if not game:
-                return
-            current_round = game.rounds[game.current_round_idx]
+def coop_strategy_image_prompt(strategy: str, style_theme: str | None) -> str:
+    base_prompt = f"Survival strategy illustration: {strategy[:200]}. Dramatic scene, cinematic lighting, vivid colors."
+    return apply_style_theme(base_prompt, style_theme)
 
-            # Apply strategy images
-            for pid, image_url in zip(player_ids, results):
-                if image_url:
-                    current_round.strategy_images[pid] = image_url
-                    print(f"COOP IMAGES: Generated image for {pid}", flush=True)
 
-            # Apply timeout images to strategy_images (for voting display)
-            for pid, image_url in timeout_results:
-                if image_url and pid in game.players:
-                    current_round.strategy_images[pid] = image_url
-                    print(f"COOP IMAGES: Generated timeout image for {game.players[pid].name}", flush=True)
+async def save_coop_strategy_images(game_code: str, round_idx: int, images: dict[str, str], strategies: dict[str, str]):
+    """Merge strategy/timeout images into the round without clobbering concurrent votes.
 
-            save_game(game)
-            print(f"COOP IMAGES: Complete! {len(current_round.strategy_images)} images saved", flush=True)
+    strategies maps player_id -> the strategy an image was drawn for; images for players
+    who changed their strategy since are dropped (a newer worker is drawing theirs).
+    """
+    def mutator(game: GameState):
+        if game.current_round_idx != round_idx:
+            return (False, 0)
+        current_round = game.rounds[round_idx]
+        added = 0
+        for pid, image_url in images.items():
+            if pid not in game.players:
+                continue
+            if pid in strategies and game.players[pid].strategy != strategies[pid]:
+                continue
+            current_round.strategy_images[pid] = image_url
+            added += 1
+        return (added > 0, added)
+
+    def verify(game: GameState) -> bool:
+        current_round = game.rounds[round_idx]
+        return any(current_round.strategy_images.get(pid) == url for pid, url in images.items())
+
+    try:
+        return await update_game_with_retry(game_code, mutator, verify)
+    except HTTPException as e:
+        print(f"COOP IMAGES: Failed to save images for {game_code}: {e.detail}", flush=True)
+        return 0
+
+
+async def generate_coop_strategy_image_task(game_code: str, round_idx: int, player_id: str, strategy: str):
+    """Speculatively draw one player's coop strategy image as soon as they submit.
+
+    By the time the last strategy lands most of the voting images already exist;
+    generate_coop_strategy_images only fills in whatever is still missing.
+    """
+    game = get_game(game_code)
+    if not game or game.current_round_idx != round_idx:
+        print(f"COOP IMAGE: Round {round_idx} of {game_code} is no longer current, skipping", flush=True)
+        return
+    style_theme = game.rounds[round_idx].style_theme
+
+    image_url = await generate_image_fal_async(coop_strategy_image_prompt(strategy, style_theme))
+    if not image_url:
+        print(f"COOP IMAGE: Generation failed for {player_id[:8]}...", flush=True)
+        return
+    if await save_coop_strategy_images(game_code, round_idx, {player_id: image_url}, {player_id: strategy}):
+        print(f"COOP IMAGE: Saved speculative image for {player_id[:8]}...", flush=True)
+
+
+# How long the fill-in pass waits for in-flight speculative coop images before redrawing
+COOP_IMAGE_GRACE_SECONDS = 30
+
+
+async def generate_coop_strategy_images_task(game_code: str, expected_round_idx: int = -1, wait_for_speculative: bool = False):
+    """Fill in coop strategy images still missing once submissions close, plus timeout images.
+
+    Players normally get their image from generate_coop_strategy_image at submit time;
+    this covers failures and the timed-out players. When submissions close (everyone
+    submitted or the timer ran out), the last speculative images are still in flight, so
+    wait_for_speculative gives them COOP_IMAGE_GRACE_SECONDS to land and only redraws
+    the ones that never do.
+    """
+    deadline = time.time() + COOP_IMAGE_GRACE_SECONDS
+    while wait_for_speculative and time.time() < deadline:
+        game = get_game(game_code)
+        if not game or (expected_round_idx >= 0 and game.current_round_idx != expected_round_idx):
+            break  # Handled below
+        current_round = game.rounds[game.current_round_idx]
+        if all(pid in current_round.strategy_images
+               for pid, p in game.players.items() if p.is_alive and p.strategy):
+            break
+        await asyncio.sleep(2)
+
+    game = get_game(game_code)
+    if not game:
+        print(f"COOP IMAGES: Game {game_code} not found!", flush=True)
+        return
+
+    # Verify we're still on the expected round
+    if expected_round_idx >= 0 and game.current_round_idx != expected_round_idx:
+        print(f"COOP IMAGES: Round mismatch! Expected {expected_round_idx}, got {game.current_round_idx}. Aborting.", flush=True)
+        return
+
+    round_idx = game.current_round_idx
+    current_round = game.rounds[round_idx]
+
+    # Strategy images for alive players whose speculative image hasn't landed
+    tasks = []
+    strategies = {}
+    for pid, player in game.players.items():
+        if player.is_alive and player.strategy and pid not in current_round.strategy_images:
+            tasks.append(generate_image_fal_async(coop_strategy_image_prompt(player.strategy, current_round.style_theme)))
+            strategies[pid] = player.strategy
+
+    # Also generate timeout images for timed-out players
+    timeout_tasks = [
+        generate_timeout_image_async(pid, current_round.style_theme)
+        for pid in current_round.timed_out_players
+        if pid in game.players and pid not in current_round.strategy_images
+    ]
+    if timeout_tasks:
+        print(f"COOP IMAGES: Also generating {len(timeout_tasks)} timeout images", flush=True)
+
+    if not tasks and not timeout_tasks:
+        print(f"COOP IMAGES: All {len(current_round.strategy_images)} images already generated", flush=True)
+        return
+
+    print(f"COOP IMAGES: Generating {len(tasks) + len(timeout_tasks)} missing images in parallel...", flush=True)
+    all_results = await asyncio.gather(*tasks, *timeout_tasks)
+    images = {pid: url for pid, url in zip(strategies, all_results[:len(tasks)]) if url}
+    images.update({pid: url for pid, url in all_results[len(tasks):] if url})
 
-    asyncio.run(generate_all_images())
+    added = await save_coop_strategy_images(game_code, round_idx, images, strategies)
+    print(f"COOP IMAGES: Complete! {added} images saved", flush=True)
 
 
 def tally_coop_votes_and_transition(game: GameState, current_round: Round):
@@ -3249,11 +4172,27 @@ def tally_coop_votes_and_transition(game: GameState, current_round: Round):
     current_round.status = "coop_judgement"
 
 
-@app.function(image=image, secrets=secrets)
-def run_coop_judgement(game_code: str, expected_round_idx: int = -1):
+async def prejudge_coop_strategy_task(game_code: str, round_idx: int, player_id: str, strategy: str):
+    """Speculatively judge one coop strategy while the team is still writing and voting.
+
+    Whichever strategy wins the vote, run_coop_judgement finds its verdict waiting in
+    coop_prejudgements instead of calling the LLM after the tally.
+    """
+    game = get_game(game_code)
+    if not game or game.current_round_idx != round_idx:
+        print(f"COOP PREJUDGE: Round {round_idx} of {game_code} is no longer current, skipping", flush=True)
+        return
+    result_json = await judge_strategy_llm_async(game.rounds[round_idx].scenario_text, strategy)
+    if result_json == prompts.FALLBACK_STRATEGY_JUDGEMENT:
+        # The judge failed; leave the slot empty so run_coop_judgement asks again
+        print(f"COOP PREJUDGE: Judgement failed for {player_id[:8]}..., not saving the fallback", flush=True)
+        return
+    coop_prejudgements[f"{game_code}:{round_idx}:{player_id}"] = {"strategy": strategy, "result": result_json}
+    print(f"COOP PREJUDGE: Saved verdict for {player_id[:8]}...", flush=True)
+
+
+async def run_coop_judgement_task(game_code: str, expected_round_idx: int = -1):
     """Run team judgement based on the highest-voted strategy."""
-    import json
-    import asyncio
 
     async def do_judgement():
         game = get_game(game_code)
@@ -3266,66 +4205,93 @@ def run_coop_judgement(game_code: str, expected_round_idx: int = -1):
             print(f"COOP JUDGE: Round mismatch! Expected {expected_round_idx}, got {game.current_round_idx}. Aborting.", flush=True)
             return
 
-        current_round = game.rounds[game.current_round_idx]
+        round_idx = game.current_round_idx
+        current_round = game.rounds[round_idx]
         winning_pid = current_round.coop_winning_strategy_id
+        verdict = None  # (team_survived, reason); stays None if judging failed
         if not winning_pid:
             print("COOP JUDGE: No winning strategy ID!", flush=True)
+        else:
+            winning_strategy = game.players[winning_pid].strategy
+            print(f"COOP JUDGE: Judging strategy: {winning_strategy[:100]}...", flush=True)
+
+            # Verdicts were judged speculatively on submission; only keep one for the same text
+            prejudged = coop_prejudgements.get(f"{game_code}:{round_idx}:{winning_pid}")
+            for pid in game.players:
+                _discard(coop_prejudgements, f"{game_code}:{round_idx}:{pid}")
+
+            try:
+                # Judge the winning strategy
+                if prejudged and prejudged["strategy"] == winning_strategy:
+                    print(f"COOP JUDGE: Using speculative verdict", flush=True)
+                    result_json = prejudged["result"]
+                else:
+                    result_json = await judge_strategy_llm_async(current_round.scenario_text, winning_strategy)
+                print(f"COOP JUDGE: Result: {result_json[:200]}...", flush=True)
+                res = json.loads(result_json)
+                verdict = (res.get("survived", False), res.get("reason", "The team's fate was decided."))
+            except Exception as e:
+                print(f"COOP JUDGE: Error: {e}", flush=True)
+
+        # Apply the verdict to the current document: images drawn while the LLM was
+        # judging must not be overwritten
+        def mutator(game: GameState):
+            if game.current_round_idx != round_idx:
+                return (False, False)
+            current_round = game.rounds[round_idx]
+            if current_round.status != "coop_judgement":
+                return (False, False)  # Already judged
+            if winning_pid:
+                # Get list of alive players
+                alive_players = [p for p in game.players.values() if p.is_alive]
+                team_survived = verdict is not None and verdict[0]
+                current_round.coop_team_survived = team_survived
+                if verdict is not None:
+                    current_round.coop_team_reason = verdict[1]
+
+                if team_survived and alive_players:
+                    # Random player gets +200 bonus
+                    lucky_player = random.choice(alive_players)
+                    lucky_player.score += 200
+                    current_round.coop_team_winner_id = lucky_player.id
+                    print(f"COOP JUDGE: SURVIVED! {lucky_player.name} gets +200 bonus", flush=True)
+                elif not team_survived:
+                    # ALL players lose 100 points when team fails (or judging failed)
+                    for p in alive_players:
+                        p.score -= 100
+                    print(f"COOP JUDGE: FAILED! All {len(alive_players)} players lose -100 each", flush=True)
+
+                # Use the winning strategy's existing image (already generated during voting phase)
+                winning_image = current_round.strategy_images.get(winning_pid)
+                if winning_image:
+                    current_round.scenario_image_url = winning_image
+                    print(f"COOP JUDGE: Using winning strategy's existing image", flush=True)
+
+            # Always set status to results
             current_round.status = "results"
-            save_game(game)
-            return
+            return (True, True)
 
-        winning_strategy = game.players[winning_pid].strategy
-        print(f"COOP JUDGE: Judging strategy: {winning_strategy[:100]}...", flush=True)
+        def verify(game: GameState) -> bool:
+            return game.current_round_idx != round_idx or game.rounds[round_idx].status != "coop_judgement"
 
         try:
-            # Judge the winning strategy
-            result_json = await judge_strategy_llm_async(current_round.scenario_text, winning_strategy)
-            print(f"COOP JUDGE: Result: {result_json[:200]}...", flush=True)
-            res = json.loads(result_json)
-            team_survived = res.get("survived", False)
-            current_round.coop_team_survived = team_survived
-            current_round.coop_team_reason = res.get("reason", "The team's fate was decided.")
-
-            # Get list of alive players
-            alive_players = [p for p in game.players.values() if p.is_alive]
-
-            if team_survived:
-                # Random player gets +200 bonus
-                lucky_player = random.choice(alive_players)
-                lucky_player.score += 200
-                current_round.coop_team_winner_id = lucky_player.id
-                print(f"COOP JUDGE: SURVIVED! {lucky_player.name} gets +200 bonus", flush=True)
-            else:
-                # ALL players lose 100 points when team fails
-                for p in alive_players:
-                    p.score -= 100
-                print(f"COOP JUDGE: FAILED! All {len(alive_players)} players lose -100 each", flush=True)
-
-            # Use the winning strategy's existing image (already generated during voting phase)
-            winning_image = current_round.strategy_images.get(winning_pid)
-            if winning_image:
-                current_round.scenario_image_url = winning_image
-                print(f"COOP JUDGE: Using winning strategy's existing image", flush=True)
-
-        except Exception as e:
-            print(f"COOP JUDGE: Error: {e}", flush=True)
-            current_round.coop_team_survived = False
-            # All players lose 100 points on error/failure
-            alive_players = [p for p in game.players.values() if p.is_alive]
-            for p in alive_players:
-                p.score -= 100
-
-        # Always set status to results
-        current_round.status = "results"
-        save_game(game)
+            applied = await update_game_with_retry(game_code, mutator, verify)
+        except HTTPException as e:
+            print(f"COOP JUDGE: Failed to save verdict: {e.detail}", flush=True)
+            return
+        if not applied:
+            print(f"COOP JUDGE: Round {round_idx} already judged or over, verdict dropped", flush=True)
+            return
 
         # Trigger video pre-generation on round 1 results (only once)
-        if game.current_round_idx == 0:
-            maybe_spawn_video_prewarm(game)
+        if round_idx == 0:
+            game = get_game(game_code)
+            if game:
+                maybe_spawn_video_prewarm(game)
 
         print("COOP JUDGE: Complete!", flush=True)
 
-    asyncio.run(do_judgement())
+    await do_judgement()
 
 
 @web_app.post("/api/submit_strategy")
@@ -3344,10 +4310,9 @@ async def api_submit_strategy(request: Request):
         if len(strategy) > MAX_STRATEGY_LENGTH:
             raise HTTPException(status_code=400, detail=f"Strategy too long (max {MAX_STRATEGY_LENGTH} characters)")
         
-        # Track what side effects to trigger after successful save
-        side_effects = {"spawn_judgement": False, "round_type": None, "all_submitted": False, "alive_count": 0}
-        
         def mutator(game: GameState):
+            # Returned with the response: what to spawn after the save (the mutator may run on the game's owner)
+            side_effects = {"spawn_judgement": False, "spawn_coop_image": False, "round_idx": None, "round_type": None, "all_submitted": False, "alive_count": 0}
             current_round = game.rounds[game.current_round_idx]
             if current_round.status != "strategy": 
                 print(f"API: Submit Strategy WRONG PHASE. Current: {current_round.status}", flush=True)
@@ -3360,7 +4325,7 @@ async def api_submit_strategy(request: Request):
             # Check if already submitted (idempotent)
             if game.players[player_id].strategy == strategy:
                 print(f"API: Strategy already set for {player_id}")
-                return (False, {"status": "submitted"})
+                return (False, ({"status": "submitted"}, None))
             
             print(f"API: Submit Strategy for {player_id} in {code}")
             game.players[player_id].strategy = strategy
@@ -3376,18 +4341,24 @@ async def api_submit_strategy(request: Request):
             print(f"API: Strategies Submitted: {strategies_submitted} / {len(alive_players)}")
             
             side_effects["round_type"] = current_round.type
+            side_effects["round_idx"] = game.current_round_idx
             side_effects["alive_count"] = len(alive_players)
             side_effects["all_submitted"] = strategies_submitted >= len(alive_players)
             
-            # For survival/blind_architect rounds, spawn early judgement immediately
-            if current_round.type in ["survival", "blind_architect"]:
-                game.players[player_id].judgement_pending = True
+            # For survival/blind_architect/last_stand rounds, spawn early judgement immediately
+            if current_round.type in EARLY_JUDGEMENT_ROUND_TYPES:
+                claim_player(game.players[player_id])
                 side_effects["spawn_judgement"] = True
                 
                 if side_effects["all_submitted"]:
                     print("API: All strategies received. Showing JUDGEMENT phase.")
                     current_round.status = "judgement"
-            elif side_effects["all_submitted"]:
+            elif current_round.type == "cooperative":
+                # Start this player's voting image (and verdict) now rather than after the last submission
+                current_round.strategy_images.pop(player_id, None)  # Drawn for an older strategy
+                side_effects["spawn_coop_image"] = True
+
+            if side_effects["all_submitted"] and current_round.type not in EARLY_JUDGEMENT_ROUND_TYPES:
                 # Handle phase transitions for other round types
                 if current_round.type == "cooperative":
                     if len(alive_players) <= 1:
@@ -3402,9 +4373,6 @@ async def api_submit_strategy(request: Request):
                         print("API: All strategies received. Advancing to COOP VOTING.")
                         current_round.status = "coop_voting"
                         current_round.vote_start_time = time.time()
-                elif current_round.type == "last_stand":
-                    print("API: All strategies received. Advancing to LAST STAND Judgement.")
-                    current_round.status = "judgement"
                 elif current_round.type == "sacrifice":
                     print("API: All strategies received. Advancing to SACRIFICE VOLUNTEER.")
                     current_round.status = "sacrifice_volunteer"
@@ -3414,32 +4382,41 @@ async def api_submit_strategy(request: Request):
                 else:
                     print("API: All strategies received. Advancing to Judgement.")
                     current_round.status = "judgement"
-            else:
+            elif not side_effects["all_submitted"]:
                 print("API: Waiting for others... Saving strategy.")
             
-            return (True, {"status": "submitted"})
+            return (True, ({"status": "submitted"}, side_effects))
         
         def verify(game: GameState) -> bool:
             return (player_id in game.players and 
                     game.players[player_id].strategy == strategy)
         
-        result = await update_game_with_retry(
+        result, side_effects = await update_game_with_retry(
             code, mutator, verify,
             error_message="Failed to submit strategy due to concurrent modifications"
         )
+        if side_effects is None:
+            return result
         
         # Spawn side effects after successful save
+        if side_effects["spawn_coop_image"]:
+            print(f"API: Spawning SPECULATIVE COOP IMAGE for {player_id}")
+            generate_coop_strategy_image.spawn(code, side_effects["round_idx"], player_id, strategy)
+            if CONFIG["game"].get("speculative_coop_judgement", True):
+                prejudge_coop_strategy.spawn(code, side_effects["round_idx"], player_id, strategy)
+
         if side_effects["spawn_judgement"]:
             print(f"API: Spawning EARLY JUDGEMENT for {player_id}")
-            judge_single_player.spawn(code, player_id)
+            judge_single_player.spawn(code, player_id, side_effects["round_idx"])
         elif side_effects["all_submitted"]:
             round_type = side_effects["round_type"]
             if round_type == "cooperative":
-                generate_coop_strategy_images.spawn(code, get_game(code).current_round_idx)
                 if side_effects["alive_count"] <= 1:
                     run_coop_judgement.spawn(code, get_game(code).current_round_idx)
-            elif round_type == "last_stand":
-                run_last_stand_judgement.spawn(code, get_game(code).current_round_idx)
+                else:
+                    # Every player's image is already in flight from their own submission;
+                    # redraw any that fail before voting ends
+                    generate_coop_strategy_images.spawn(code, side_effects["round_idx"], True)
             elif round_type == "ranked":
                 run_ranked_judgement.spawn(code, get_game(code).current_round_idx)
             elif round_type not in ["sacrifice"]:  # sacrifice doesn't spawn judgement here
@@ -3466,44 +4443,38 @@ async def api_submit_trap(request: Request):
     if len(trap_text) > MAX_TRAP_TEXT_LENGTH:
         raise HTTPException(status_code=400, detail=f"Trap text too long (max {MAX_TRAP_TEXT_LENGTH} characters)")
     
-    # Generate trap image first (before retry loop, as it's expensive)
-    # We need to get the style theme from the game
-    game = get_game(code)
-    if not game:
-        raise HTTPException(status_code=404, detail="Game not found")
-    
-    current_round = game.rounds[game.current_round_idx]
-    themed_prompt = apply_style_theme(trap_text, current_round.style_theme)
-    img_url = await generate_image_fal_async(themed_prompt, use_case="trap_image")
-    
+    # Record the text right away; the image is rendered by a MediaWorker and shows up
+    # in the voting view when ready. The mutator returns the round to draw it for.
     def mutator(game: GameState):
         current_round = game.rounds[game.current_round_idx]
         
         # Check if already submitted (idempotent)
         if player_id in current_round.trap_proposals and current_round.trap_proposals[player_id] == trap_text:
             print(f"SUBMIT_TRAP: Trap already submitted for {player_id[:8]}...", flush=True)
-            return (False, {"status": "trap_submitted"})
+            return (False, ({"status": "trap_submitted"}, None))
         
         current_round.trap_proposals[player_id] = trap_text
-        if img_url:
-            current_round.trap_images[player_id] = img_url
+        current_round.trap_images.pop(player_id, None)  # Stale image from an earlier text
         
         alive_players = [p for p in game.players.values() if p.is_alive and p.in_lobby]
         if len(current_round.trap_proposals) >= len(alive_players):
             current_round.status = "trap_voting"
             current_round.vote_start_time = time.time()
         
-        return (True, {"status": "trap_submitted"})
+        return (True, ({"status": "trap_submitted"}, game.current_round_idx))
     
     def verify(game: GameState) -> bool:
         current_round = game.rounds[game.current_round_idx]
         return (player_id in current_round.trap_proposals and 
                 current_round.trap_proposals[player_id] == trap_text)
     
-    return await update_game_with_retry(
+    result, round_idx = await update_game_with_retry(
         code, mutator, verify,
         error_message="Failed to submit trap due to concurrent modifications"
     )
+    if round_idx is not None:
+        generate_trap_image.spawn(code, round_idx, player_id, trap_text)
+    return result
 
 @web_app.post("/api/vote_trap")
 async def api_vote_trap(request: Request):
@@ -3512,18 +4483,13 @@ async def api_vote_trap(request: Request):
     voter_id = data.get("voter_id")
     target_id = data.get("target_id")
 
-    max_retries = 10
-    for attempt in range(max_retries):
-        game = get_game(code)
-        if not game:
-            raise HTTPException(status_code=404, detail="Game not found")
-
+    def mutator(game: GameState):
         current_round = game.rounds[game.current_round_idx]
 
         # Check if already voted (idempotent - from previous retry)
         if voter_id in current_round.votes and current_round.votes[voter_id] == target_id:
             print(f"VOTE_TRAP: Vote already recorded for {voter_id[:8]}...", flush=True)
-            return {"status": "voted"}
+            return (False, {"status": "voted"})
 
         current_round.votes[voter_id] = target_id
 
@@ -3544,24 +4510,16 @@ async def api_vote_trap(request: Request):
             if winner_id in game.players:
                 game.players[winner_id].score += 500
 
-        save_game(game)
-
-        # Wait with jitter before verification
-        jitter = random.uniform(0.05, 0.15)
-        await asyncio.sleep(0.1 + jitter)
+        return (True, {"status": "voted"})
 
-        # Verify the vote was saved
-        verification = get_game(code)
-        if verification:
-            v_round = verification.rounds[verification.current_round_idx]
-            if voter_id in v_round.votes and v_round.votes[voter_id] == target_id:
-                return {"status": "voted"}
-
-        print(f"VOTE_TRAP: Race condition for {voter_id[:8]}..., retry {attempt+1}/{max_retries}", flush=True)
-        backoff = (0.15 * (2 ** attempt)) + random.uniform(0, 0.1)
-        await asyncio.sleep(min(backoff, 2.0))
+    def verify(game: GameState) -> bool:
+        v_round = game.rounds[game.current_round_idx]
+        return voter_id in v_round.votes and v_round.votes[voter_id] == target_id
 
-    raise HTTPException(status_code=500, detail="Failed to record vote due to concurrent modifications")
+    return await update_game_with_retry(
+        code, mutator, verify,
+        error_message="Failed to record vote due to concurrent modifications"
+    )
 
 
 @web_app.post("/api/vote_coop")
@@ -3576,12 +4534,7 @@ async def api_vote_coop(request: Request):
     if voter_id == target_id:
         raise HTTPException(status_code=400, detail="Cannot vote for yourself")
 
-    max_retries = 10
-    for attempt in range(max_retries):
-        game = get_game(code)
-        if not game:
-            raise HTTPException(status_code=404, detail="Game not found")
-
+    def mutator(game: GameState):
         current_round = game.rounds[game.current_round_idx]
 
         # Validate we're in coop_voting phase
@@ -3591,7 +4544,7 @@ async def api_vote_coop(request: Request):
         # Check if already voted (idempotent - from previous retry)
         if voter_id in current_round.coop_votes and current_round.coop_votes[voter_id] == target_id:
             print(f"COOP VOTE: Vote already recorded for {voter_id[:8]}...", flush=True)
-            return {"status": "voted"}
+            return (False, None)
 
         current_round.coop_votes[voter_id] = target_id
         print(f"COOP VOTE: {voter_id[:8]}... voted for {target_id[:8]}...", flush=True)
@@ -3601,27 +4554,22 @@ async def api_vote_coop(request: Request):
         if len(current_round.coop_votes) >= len(alive_players):
             print("COOP VOTE: All votes in, tallying...", flush=True)
             tally_coop_votes_and_transition(game, current_round)
-            save_game(game)
-            run_coop_judgement.spawn(code, game.current_round_idx)
-        else:
-            save_game(game)
+            return (True, game.current_round_idx)
+        return (True, None)
 
-        # Wait with jitter before verification
-        jitter = random.uniform(0.05, 0.15)
-        await asyncio.sleep(0.1 + jitter)
-
-        # Verify the vote was saved
-        verification = get_game(code)
-        if verification:
-            v_round = verification.rounds[verification.current_round_idx]
-            if voter_id in v_round.coop_votes and v_round.coop_votes[voter_id] == target_id:
-                return {"status": "voted"}
+    def verify(game: GameState) -> bool:
+        v_round = game.rounds[game.current_round_idx]
+        return voter_id in v_round.coop_votes and v_round.coop_votes[voter_id] == target_id
 
-        print(f"COOP VOTE: Race condition for {voter_id[:8]}..., retry {attempt+1}/{max_retries}", flush=True)
-        backoff = (0.15 * (2 ** attempt)) + random.uniform(0, 0.1)
-        await asyncio.sleep(min(backoff, 2.0))
+    tallied_round_idx = await update_game_with_retry(
+        code, mutator, verify,
+        error_message="Failed to record vote due to concurrent modifications"
+    )
+    # Judgement is spawned once, after the tally is persisted
+    if tallied_round_idx is not None:
+        run_coop_judgement.spawn(code, tallied_round_idx)
 
-    raise HTTPException(status_code=500, detail="Failed to record vote due to concurrent modifications")
+    return {"status": "voted"}
 
 
 @web_app.post("/api/next_round")
@@ -3641,6 +4589,7 @@ async def api_next_round(request: Request):
         if current_round.status != "results":
             raise HTTPException(status_code=400, detail=f"Cannot advance round: current round is in '{current_round.status}' state, not 'results'")
 
+    previous_idx = game.current_round_idx
     next_idx = game.current_round_idx + 1
     if next_idx >= game.max_rounds:
         game.status = "finished"
@@ -3661,8 +4610,14 @@ async def api_next_round(request: Request):
             print(f"API: Game finished, videos already {game.videos_status} for {code}", flush=True)
             save_game(game)
 
+        await cancel_round_calls_async(code, previous_idx)
+        await sync_warm_pool_async(code, None)
         return {"status": "finished"}
 
+    # Keep the hot document flat: the finished round moves to cold storage
+    if game.current_round_idx >= 0:
+        archive_round(game, game.current_round_idx)
+
     game.current_round_idx = next_idx
 
     # Use round_config to determine round type (flexible positioning)
@@ -3688,7 +4643,9 @@ async def api_next_round(request: Request):
         p.survival_reason = None
         p.strategy = None  # Clear previous strategy
         p.result_image_url = None
+        p.result_image_pending = False
         p.judgement_pending = False  # Clear any pending judgement flags
+        p.judgement_claimed_at = None
 
     if round_type == "blind_architect":
         new_round.status = "trap_creation"
@@ -3708,10 +4665,13 @@ async def api_next_round(request: Request):
             print(f"API: Using pre-warmed scenario for round {next_idx + 1}", flush=True)
         else:
             print(f"API: No pre-warmed scenario for round {next_idx + 1}, generating on-demand...", flush=True)
-            # Use asyncio.to_thread to avoid blocking the event loop
-            new_round.scenario_text = await asyncio.to_thread(generate_scenario_llm, next_idx + 1, game.max_rounds)
+            # Async pooled client - never blocks the event loop or a threadpool worker
+            new_round.scenario_text = await generate_scenario_llm_async(next_idx + 1, game.max_rounds)
 
     save_game(game)
+    if previous_idx >= 0:
+        await cancel_round_calls_async(code, previous_idx)
+    await sync_warm_pool_async(code, game)
     return {"status": "started_round", "round": next_idx + 1, "type": round_type}
 
 @web_app.post("/api/retry_player_videos")
@@ -3742,6 +4702,11 @@ async def api_retry_player_videos(request: Request):
     game.player_loser_videos = {}
     save_game(game)
     print(f"API: Retrying player video generation for {code}", flush=True)
+    # Stop the stuck run first: its poll loops cancel their FAL queue jobs on the way out
+    previous = spawned_calls.get(prewarm_player_videos.spawn_key(code))
+    if previous and previous["call_id"]:
+        cancel_call(previous["call_id"])
+    prewarm_player_videos.release(code)
     prewarm_player_videos.spawn(code)
     return {"status": "retry_started"}
 
@@ -3780,8 +4745,6 @@ async def api_regenerate_character_image(request: Request):
 @web_app.post("/api/generate_random_characters")
 async def api_generate_random_characters(request: Request):
     """Generate 8 random diverse character images for the player to choose from."""
-    import asyncio
-    import httpx
 
     # Generate 8 unique random trait sets with different seeds
     base_seed = int(time.time() * 1000)
@@ -3797,7 +4760,7 @@ async def api_generate_random_characters(request: Request):
 
     async def generate_single_image(char_data: dict, idx: int) -> dict:
         """Generate a single character image."""
-        url = "https://fal.run/fal-ai/flux/krea"
+        url = get_image_url("character_image")
         headers = {
             "Authorization": f"Key {os.environ['FAL_KEY']}",
             "Content-Type": "application/json"
@@ -3808,15 +4771,14 @@ async def api_generate_random_characters(request: Request):
             "num_inference_steps": 28
         }
         try:
-            async with httpx.AsyncClient(timeout=120.0) as client:
-                response = await client.post(url, json=payload, headers=headers)
-                response.raise_for_status()
-                image_url = response.json()["images"][0]["url"]
-                return {
-                    "traits": char_data["traits"],
-                    "prompt": char_data["prompt"],
-                    "url": image_url
-                }
+            response = await get_http_client().post(url, json=payload, headers=headers, timeout=120.0)
+            response.raise_for_status()
+            image_url = response.json()["images"][0]["url"]
+            return {
+                "traits": char_data["traits"],
+                "prompt": char_data["prompt"],
+                "url": image_url
+            }
         except Exception as e:
             print(f"Random char generation error: {e}", flush=True)
             return {
@@ -3982,6 +4944,8 @@ async def api_debug_skip_to_state(request: Request):
         raise HTTPException(status_code=404, detail="Player not found")
 
     print(f"DEBUG: Skipping to state - game_status={game_status}, round_type={round_type}, round_status={round_status}, round={round_number}", flush=True)
+    # Rounds get rebuilt below, so earlier spawns must not block the new ones
+    forget_spawns(code, max(len(game.rounds), game.max_rounds))
 
     # Add dummy players if requested
     dummy_names = ["DebugBot1", "DebugBot2", "DebugBot3", "DebugBot4", "DebugBot5",
@@ -4272,6 +5236,7 @@ async def api_advance_sacrifice_volunteer(request: Request):
         current_round.status = "sacrifice_submission"
         current_round.submission_start_time = time.time()  # Start timer for speech
         save_game(game)
+        spawn_sacrifice_prerender(code, game.current_round_idx, martyr_id)
         print(f"SACRIFICE: Only 1 volunteer ({game.players[martyr_id].name}), skipping voting", flush=True)
         return {"status": "skipped_to_submission", "martyr_id": martyr_id, "volunteer_count": 1}
 
@@ -4296,12 +5261,7 @@ async def api_vote_sacrifice(request: Request):
     if voter_id == target_id:
         raise HTTPException(status_code=400, detail="Cannot vote for yourself")
 
-    max_retries = 10
-    for attempt in range(max_retries):
-        game = get_game(code)
-        if not game:
-            raise HTTPException(status_code=404, detail="Game not found")
-
+    def mutator(game: GameState):
         current_round = game.rounds[game.current_round_idx]
         if current_round.type != "sacrifice" or current_round.status != "sacrifice_voting":
             raise HTTPException(status_code=400, detail="Not in sacrifice voting phase")
@@ -4319,7 +5279,7 @@ async def api_vote_sacrifice(request: Request):
         # Check if already voted (idempotent - from previous retry)
         if voter_id in current_round.sacrifice_votes and current_round.sacrifice_votes[voter_id] == target_id:
             print(f"SACRIFICE VOTE: Vote already recorded for {voter_id[:8]}...", flush=True)
-            return {"status": "vote_recorded", "votes_cast": len(current_round.sacrifice_votes)}
+            return (False, ({"status": "vote_recorded", "votes_cast": len(current_round.sacrifice_votes)}, None))
 
         current_round.sacrifice_votes[voter_id] = target_id
 
@@ -4337,11 +5297,7 @@ async def api_vote_sacrifice(request: Request):
             if can_vote:
                 voters_who_can_vote.append(p)
 
-        all_voted = len(current_round.sacrifice_votes) >= len(voters_who_can_vote)
-        martyr_chosen = False
-        martyr_id = None
-
-        if all_voted:
+        if len(current_round.sacrifice_votes) >= len(voters_who_can_vote):
             vote_counts = {}
             for target in current_round.sacrifice_votes.values():
                 vote_counts[target] = vote_counts.get(target, 0) + 1
@@ -4350,29 +5306,23 @@ async def api_vote_sacrifice(request: Request):
             current_round.martyr_id = martyr_id
             current_round.status = "sacrifice_submission"
             current_round.submission_start_time = time.time()
-            martyr_chosen = True
             print(f"SACRIFICE: {game.players[martyr_id].name} chosen as martyr", flush=True)
+            # The round index rides along for the prerender spawn, not the response
+            return (True, ({"status": "martyr_chosen", "martyr_id": martyr_id}, game.current_round_idx))
 
-        save_game(game)
-
-        # Wait with jitter before verification
-        jitter = random.uniform(0.05, 0.15)
-        await asyncio.sleep(0.1 + jitter)
+        return (True, ({"status": "vote_recorded", "votes_cast": len(current_round.sacrifice_votes)}, None))
 
-        # Verify the vote was saved
-        verification = get_game(code)
-        if verification:
-            v_round = verification.rounds[verification.current_round_idx]
-            if voter_id in v_round.sacrifice_votes and v_round.sacrifice_votes[voter_id] == target_id:
-                if martyr_chosen:
-                    return {"status": "martyr_chosen", "martyr_id": martyr_id}
-                return {"status": "vote_recorded", "votes_cast": len(v_round.sacrifice_votes)}
-
-        print(f"SACRIFICE VOTE: Race condition for {voter_id[:8]}..., retry {attempt+1}/{max_retries}", flush=True)
-        backoff = (0.15 * (2 ** attempt)) + random.uniform(0, 0.1)
-        await asyncio.sleep(min(backoff, 2.0))
+    def verify(game: GameState) -> bool:
+        v_round = game.rounds[game.current_round_idx]
+        return voter_id in v_round.sacrifice_votes and v_round.sacrifice_votes[voter_id] == target_id
 
-    raise HTTPException(status_code=500, detail="Failed to record vote due to concurrent modifications")
+    result, chosen_round_idx = await update_game_with_retry(
+        code, mutator, verify,
+        error_message="Failed to record vote due to concurrent modifications"
+    )
+    if chosen_round_idx is not None:
+        spawn_sacrifice_prerender(code, chosen_round_idx, result["martyr_id"])
+    return result
 
 
 @web_app.post("/api/submit_sacrifice_speech")
@@ -4424,12 +5374,7 @@ async def api_vote_revival(request: Request):
     voter_id = data.get("voter_id")
     target_id = data.get("target_id")
 
-    max_retries = 10
-    for attempt in range(max_retries):
-        game = get_game(code)
-        if not game:
-            raise HTTPException(status_code=404, detail="Game not found")
-
+    def mutator(game: GameState):
         current_round = game.rounds[game.current_round_idx]
         if current_round.type != "last_stand" or current_round.status != "last_stand_revival":
             raise HTTPException(status_code=400, detail="Not in revival voting phase")
@@ -4448,18 +5393,17 @@ async def api_vote_revival(request: Request):
         if target.is_alive:
             raise HTTPException(status_code=400, detail="Can only vote for dead players")
 
+        survivors = [p for p in game.players.values() if p.is_alive]
+
         # Check if already voted (idempotent - from previous retry)
         if voter_id in current_round.revival_votes and current_round.revival_votes[voter_id] == target_id:
             print(f"REVIVAL VOTE: Vote already recorded for {voter_id[:8]}...", flush=True)
-            survivors = [p for p in game.players.values() if p.is_alive]
-            return {"status": "vote_recorded", "votes_cast": len(current_round.revival_votes), "survivors": len(survivors)}
+            return (False, ({"status": "vote_recorded", "votes_cast": len(current_round.revival_votes), "survivors": len(survivors)}, None))
 
         current_round.revival_votes[voter_id] = target_id
 
         # Check if all survivors have voted
-        survivors = [p for p in game.players.values() if p.is_alive]
         all_voted = len(current_round.revival_votes) >= len(survivors)
-        result = None
 
         print(f"REVIVAL: {voter.name} voted for {target.name}. {len(current_round.revival_votes)}/{len(survivors)} voted", flush=True)
 
@@ -4474,35 +5418,28 @@ async def api_vote_revival(request: Request):
                 revived_name = game.players[revived_id].name
                 print(f"REVIVAL: Unanimous vote for {revived_name}! Auto-advancing to judgement", flush=True)
                 result = {"status": "unanimous", "revived": True, "revived_player_id": revived_id, "auto_advanced": True}
-            else:
-                current_round.status = "results"
-                print(f"REVIVAL: Not unanimous ({len(unique_targets)} different targets), auto-advancing to results", flush=True)
-                result = {"status": "not_unanimous", "revived": False, "auto_advanced": True}
+                return (True, (result, game.current_round_idx))
 
-        save_game(game)
+            current_round.status = "results"
+            print(f"REVIVAL: Not unanimous ({len(unique_targets)} different targets), auto-advancing to results", flush=True)
+            return (True, ({"status": "not_unanimous", "revived": False, "auto_advanced": True}, None))
 
-        # Spawn revival judgement if unanimous (after save)
-        if result and result.get("status") == "unanimous":
-            run_revival_judgement.spawn(code, game.current_round_idx)
+        return (True, ({"status": "vote_recorded", "votes_cast": len(current_round.revival_votes), "survivors": len(survivors)}, None))
 
-        # Wait with jitter before verification
-        jitter = random.uniform(0.05, 0.15)
-        await asyncio.sleep(0.1 + jitter)
+    def verify(game: GameState) -> bool:
+        v_round = game.rounds[game.current_round_idx]
+        return voter_id in v_round.revival_votes and v_round.revival_votes[voter_id] == target_id
 
-        # Verify the vote was saved
-        verification = get_game(code)
-        if verification:
-            v_round = verification.rounds[verification.current_round_idx]
-            if voter_id in v_round.revival_votes and v_round.revival_votes[voter_id] == target_id:
-                if result:
-                    return result
-                return {"status": "vote_recorded", "votes_cast": len(v_round.revival_votes), "survivors": len(survivors)}
+    result, judgement_round_idx = await update_game_with_retry(
+        code, mutator, verify,
+        error_message="Failed to record vote due to concurrent modifications"
+    )
 
-        print(f"REVIVAL VOTE: Race condition for {voter_id[:8]}..., retry {attempt+1}/{max_retries}", flush=True)
-        backoff = (0.15 * (2 ** attempt)) + random.uniform(0, 0.1)
-        await asyncio.sleep(min(backoff, 2.0))
+    # Spawn revival judgement if unanimous (after save)
+    if judgement_round_idx is not None:
+        run_revival_judgement.spawn(code, judgement_round_idx)
 
-    raise HTTPException(status_code=500, detail="Failed to record vote due to concurrent modifications")
+    return result
 
 
 @web_app.post("/api/advance_revival")
@@ -4562,11 +5499,74 @@ async def api_advance_revival(request: Request):
 
 # --- SACRIFICE JUDGEMENT ASYNC FUNCTION ---
 
-@app.function(image=image, secrets=secrets)
-def run_sacrifice_judgement(game_code: str, expected_round_idx: int = -1):
+def sacrifice_outcome_prompts(game: GameState, current_round: Round, martyr_id: str, epic: bool) -> list[tuple[str, str, str]]:
+    """(role, player_id, image prompt) for everyone but the martyr, for one verdict.
+
+    Only player names and the scenario go into these, so both verdicts can be rendered
+    before the martyr has said a word.
+    """
+    scenario_hint = current_round.scenario_text[:150] if current_round.scenario_text else "a dangerous situation"
+    outcome_prompts = []
+    for pid, p in game.players.items():
+        if pid == martyr_id:
+            continue
+        if epic and p.is_alive:
+            # Epic death: survivor images for all alive players
+            prompt = prompts.format_prompt(prompts.SACRIFICE_SURVIVOR_IMAGE, player_name=p.name, scenario_hint=scenario_hint)
+            outcome_prompts.append(("survivor", pid, apply_style_theme(prompt, current_round.style_theme)))
+        elif not epic:
+            # Lame death: death images for all other players
+            prompt = prompts.format_prompt(prompts.SACRIFICE_FAILED_DEATH_IMAGE, player_name=p.name, scenario_hint=scenario_hint)
+            outcome_prompts.append(("failed", pid, apply_style_theme(prompt, current_round.style_theme)))
+    return outcome_prompts
+
+
+def spawn_sacrifice_prerender(code: str, round_idx: int, martyr_id: str):
+    """Start rendering both sacrifice outcomes as soon as the martyr is known."""
+    if CONFIG["game"].get("speculative_sacrifice_images", True):
+        prerender_sacrifice_outcomes.spawn(code, round_idx, martyr_id)
+
+
+async def prerender_sacrifice_outcomes_task(game_code: str, round_idx: int, martyr_id: str):
+    """Render the survivor AND the failed-death image sets while the martyr is typing.
+
+    Images land in sacrifice_prerenders as they finish; run_sacrifice_judgement keeps
+    the set matching the verdict and drops the entry, which also stops late arrivals.
+    """
+    game = get_game(game_code)
+    if not game or game.current_round_idx != round_idx:
+        print(f"SACRIFICE PRERENDER: Round {round_idx} of {game_code} is no longer current, skipping", flush=True)
+        return
+    current_round = game.rounds[round_idx]
+    if current_round.status != "sacrifice_submission" or current_round.martyr_id != martyr_id:
+        # Judgement already consumed (or never needed) the prerenders - don't recreate the entry
+        print(f"SACRIFICE PRERENDER: {game_code} round {round_idx} is past the speech phase, skipping", flush=True)
+        return
+    key = f"{game_code}:{round_idx}"
+    if not sacrifice_prerenders.put(key, {"martyr_id": martyr_id, "survivor": {}, "failed": {}}, skip_if_exists=True):
+        print(f"SACRIFICE PRERENDER: Already rendering for {game_code} round {round_idx}, skipping", flush=True)
+        return
+
+    async def render(role: str, pid: str, prompt: str):
+        image_url = await generate_image_fal_async(prompt)
+        if not image_url:
+            return
+        entry = sacrifice_prerenders.get(key)
+        if entry is None or entry["martyr_id"] != martyr_id:
+            return  # Judgement already ran (or a new martyr was chosen)
+        entry[role][pid] = image_url
+        sacrifice_prerenders[key] = entry
+
+    outcome_prompts = (
+        sacrifice_outcome_prompts(game, current_round, martyr_id, epic=True)
+        + sacrifice_outcome_prompts(game, current_round, martyr_id, epic=False)
+    )
+    print(f"SACRIFICE PRERENDER: Rendering {len(outcome_prompts)} images for both verdicts", flush=True)
+    await asyncio.gather(*[render(role, pid, prompt) for role, pid, prompt in outcome_prompts])
+
+
+async def run_sacrifice_judgement_task(game_code: str, expected_round_idx: int = -1):
     """Judge the martyr's death - was it epic or lame?"""
-    import json
-    import asyncio
 
     async def judge_sacrifice():
         game = get_game(game_code)
@@ -4608,87 +5608,104 @@ def run_sacrifice_judgement(game_code: str, expected_round_idx: int = -1):
         image_tasks.append(generate_image_fal_async(martyr_prompt))
         player_ids.append(("martyr", martyr_id))
 
-        # Get scenario hint for survivor/death images
-        scenario_hint = current_round.scenario_text[:150] if current_round.scenario_text else "a dangerous situation"
-
-        if epic:
-            # Epic death: generate survivor images for all alive players
-            for pid, p in game.players.items():
-                if pid != martyr_id and p.is_alive:
-                    survivor_prompt = prompts.format_prompt(
-                        prompts.SACRIFICE_SURVIVOR_IMAGE,
-                        player_name=p.name,
-                        scenario_hint=scenario_hint
-                    )
-                    themed = apply_style_theme(survivor_prompt, current_round.style_theme)
-                    image_tasks.append(generate_image_fal_async(themed))
-                    player_ids.append(("survivor", pid))
-        else:
-            # Lame death: generate death images for all other players
-            for pid, p in game.players.items():
-                if pid != martyr_id:
-                    death_prompt = prompts.format_prompt(
-                        prompts.SACRIFICE_FAILED_DEATH_IMAGE,
-                        player_name=p.name,
-                        scenario_hint=scenario_hint
-                    )
-                    themed = apply_style_theme(death_prompt, current_round.style_theme)
-                    image_tasks.append(generate_image_fal_async(themed))
-                    player_ids.append(("failed", pid))
+        # Keep the pre-rendered set for this verdict; dropping the entry discards the other
+        prerender_key = f"{game_code}:{game.current_round_idx}"
+        prerendered = sacrifice_prerenders.get(prerender_key)
+        _discard(sacrifice_prerenders, prerender_key)
+        if not prerendered or prerendered.get("martyr_id") != martyr_id:
+            prerendered = {"survivor": {}, "failed": {}}
+
+        reused = {}
+        for role, pid, prompt in sacrifice_outcome_prompts(game, current_round, martyr_id, epic):
+            if pid in prerendered[role]:
+                reused[pid] = prerendered[role][pid]
+            else:
+                image_tasks.append(generate_image_fal_async(prompt))
+                player_ids.append((role, pid))
 
         # Run all image generation in parallel
-        print(f"SACRIFICE JUDGEMENT: Generating {len(image_tasks)} images in parallel", flush=True)
+        print(f"SACRIFICE JUDGEMENT: Generating {len(image_tasks)} images in parallel ({len(reused)} pre-rendered)", flush=True)
         image_results = await asyncio.gather(*image_tasks)
 
-        # Assign images to players
+        images = dict(reused)
+        martyr_image_url = None
         for (role, pid), image_url in zip(player_ids, image_results):
             if image_url:
-                game.players[pid].result_image_url = image_url
+                images[pid] = image_url
                 if role == "martyr":
-                    current_round.martyr_image_url = image_url
-
-        # Store results
-        current_round.martyr_epic = epic
-        current_round.martyr_reason = reason
-
-        # Apply consequences
-        martyr.is_alive = False
-        martyr.death_reason = reason
-
-        if epic:
-            # Epic death: Martyr +500, all others survive and get +100
-            martyr.score += 500
-            for pid, p in game.players.items():
-                if pid != martyr_id and p.is_alive:
-                    p.score += 100
-                    p.survival_reason = f"Saved by {martyr.name}'s heroic sacrifice"
-            print(f"SACRIFICE JUDGEMENT: EPIC! {martyr.name} +500, others +100", flush=True)
-        else:
-            # Lame death: Everyone dies, no points
-            for pid, p in game.players.items():
-                p.is_alive = False
-                if pid == martyr_id:
-                    p.death_reason = reason
-                else:
-                    p.death_reason = f"{martyr.name}'s pathetic sacrifice failed to save anyone"
-            print(f"SACRIFICE JUDGEMENT: LAME! Everyone dies", flush=True)
+                    martyr_image_url = image_url
 
-        current_round.status = "results"
-        save_game(game)
+        round_idx = game.current_round_idx
+
+        # Apply the verdict to the current document; the LLM and image calls took a while
+        def mutator(game: GameState):
+            if game.current_round_idx != round_idx:
+                return (False, False)
+            current_round = game.rounds[round_idx]
+            if current_round.status != "sacrifice_judgement" or current_round.martyr_id != martyr_id:
+                return (False, False)  # Already judged, or the round moved on
+            martyr = game.players[martyr_id]
+
+            for pid, image_url in images.items():
+                if pid in game.players:
+                    game.players[pid].result_image_url = image_url
+            if martyr_image_url:
+                current_round.martyr_image_url = martyr_image_url
+
+            # Store results
+            current_round.martyr_epic = epic
+            current_round.martyr_reason = reason
+
+            # Apply consequences
+            martyr.is_alive = False
+            martyr.death_reason = reason
+
+            if epic:
+                # Epic death: Martyr +500, all others survive and get +100
+                martyr.score += 500
+                for pid, p in game.players.items():
+                    if pid != martyr_id and p.is_alive:
+                        p.score += 100
+                        p.survival_reason = f"Saved by {martyr.name}'s heroic sacrifice"
+                print(f"SACRIFICE JUDGEMENT: EPIC! {martyr.name} +500, others +100", flush=True)
+            else:
+                # Lame death: Everyone dies, no points
+                for pid, p in game.players.items():
+                    p.is_alive = False
+                    if pid == martyr_id:
+                        p.death_reason = reason
+                    else:
+                        p.death_reason = f"{martyr.name}'s pathetic sacrifice failed to save anyone"
+                print(f"SACRIFICE JUDGEMENT: LAME! Everyone dies", flush=True)
+
+            current_round.status = "results"
+            return (True, True)
+
+        def verify(game: GameState) -> bool:
+            return game.current_round_idx != round_idx or game.rounds[round_idx].status != "sacrifice_judgement"
+
+        try:
+            applied = await update_game_with_retry(game_code, mutator, verify)
+        except HTTPException as e:
+            print(f"SACRIFICE JUDGEMENT: Failed to save verdict: {e.detail}", flush=True)
+            return
+        if not applied:
+            print(f"SACRIFICE JUDGEMENT: Round {round_idx} already judged or over, verdict dropped", flush=True)
+            return
 
         # Trigger video pre-generation on round 1 results (only once)
-        if game.current_round_idx == 0:
-            maybe_spawn_video_prewarm(game)
+        if round_idx == 0:
+            game = get_game(game_code)
+            if game:
+                maybe_spawn_video_prewarm(game)
 
         print(f"SACRIFICE JUDGEMENT: Complete!", flush=True)
 
-    asyncio.run(judge_sacrifice())
+    await judge_sacrifice()
 
 
 async def judge_sacrifice_llm_async(speech: str, martyr_name: str):
     """Judge how epic the martyr's death was."""
-    import re
-    import httpx
 
     prompt = prompts.format_prompt(
         prompts.SACRIFICE_JUDGEMENT,
@@ -4697,71 +5714,52 @@ async def judge_sacrifice_llm_async(speech: str, martyr_name: str):
     )
 
     try:
-        timeout = CONFIG["llm"]["default_timeout_seconds"]
-        async with httpx.AsyncClient(timeout=float(timeout)) as client:
-            response = await client.post(
-                f"{CONFIG['llm']['base_url']}/chat/completions",
-                headers={
-                    "Authorization": f"Bearer {os.environ['MOONSHOT_API_KEY']}",
-                    "Content-Type": "application/json"
-                },
-                json={
-                    "model": get_model("sacrifice_judgement"),
-                    "messages": [{"role": "user", "content": prompt}]
-                }
-            )
-            response.raise_for_status()
-            data = response.json()
-            content = data["choices"][0]["message"]["content"]
-
-        # Extract JSON
-        json_match = re.search(r'```(?:json)?\s*([\s\S]*?)\s*```', content)
-        if json_match:
-            content = json_match.group(1)
-        json_obj_match = re.search(r'\{[\s\S]*\}', content)
-        if json_obj_match:
-            content = json_obj_match.group(0)
-
-        return content.strip()
+        content = await chat_completion_async(
+            "sacrifice_judgement", prompt, response_model=SacrificeResponse
+        )
+        result = await parse_json_with_repair(content, martyr_name, SacrificeResponse)
+        if result is not None:
+            return json.dumps(result)
+        print(f"SACRIFICE LLM: Unparseable judgement, using fallback", flush=True)
     except Exception as e:
         print(f"SACRIFICE LLM Error: {e}", flush=True)
-        return prompts.FALLBACK_SACRIFICE_JUDGEMENT
+    return prompts.FALLBACK_SACRIFICE_JUDGEMENT
 
 
 # --- LAST STAND HARSH JUDGEMENT ---
 
-@app.function(image=image, secrets=secrets)
-def run_last_stand_judgement(game_code: str, expected_round_idx: int = -1):
-    """Run HARSH judgement for Last Stand round - only ~20-30% should survive."""
-    import json
-    import asyncio
+async def run_last_stand_judgement_task(game_code: str, expected_round_idx: int = -1):
+    """Run HARSH judgement for Last Stand round - only ~20-30% should survive.
+
+    Each verdict is saved as it lands; the last one decides between revival and results.
+    """
 
-    async def judge_and_generate_harsh(pid: str, player_name: str, strategy: str, scenario: str, style_theme: str | None):
-        """Judge with extra harshness for Last Stand."""
+    async def judge_and_persist_harsh(round_idx: int, pid: str, player_name: str, strategy: str, scenario: str, style_theme: str | None):
+        """Judge with extra harshness for Last Stand, save the verdict, then attach the image."""
+        telemetry.set_tags(player=pid)
         try:
             result_json = await judge_strategy_harsh_async(scenario, strategy)
             res = json.loads(result_json)
             survived = res.get("survived", False)
             reason = res.get("reason", "Unknown")
             vis_prompt = res.get("visual_prompt", "A generic scene.")
-
-            themed_prompt = apply_style_theme(vis_prompt, style_theme)
-            image_url = await generate_image_fal_async(themed_prompt)
-
-            return {
-                "pid": pid,
-                "survived": survived,
-                "reason": reason,
-                "image_url": image_url
-            }
         except Exception as e:
             print(f"LAST STAND JUDGEMENT: Error for {pid}: {e}", flush=True)
-            return {
-                "pid": pid,
-                "survived": False,
-                "reason": "The final boss showed no mercy...",
-                "image_url": None
-            }
+            survived, reason, vis_prompt = False, "The final boss showed no mercy...", None
+
+        await persist_player_judgement(
+            game_code, round_idx, pid,
+            verdict_applier(survived, reason, image_pending=vis_prompt is not None),
+            finish_last_stand_judgement,
+        )
+        print(f"LAST STAND: {player_name} survived={survived}", flush=True)
+
+        if vis_prompt is not None:
+            await render_result_image(game_code, round_idx, pid, vis_prompt, style_theme)
+
+    async def timeout_image_and_persist(round_idx: int, pid: str, style_theme: str | None):
+        _, url = await generate_timeout_image_async(pid, style_theme)
+        await persist_result_image(game_code, round_idx, pid, url)
 
     async def run_all_judgements():
         print(f"LAST STAND JUDGEMENT: Starting for game {game_code}", flush=True)
@@ -4776,63 +5774,40 @@ def run_last_stand_judgement(game_code: str, expected_round_idx: int = -1):
             print(f"LAST STAND JUDGEMENT: Round mismatch! Expected {expected_round_idx}, got {game.current_round_idx}. Aborting.", flush=True)
             return
 
-        current_round = game.rounds[game.current_round_idx]
-
-        # Collect all players that need judging
-        tasks = []
-        for pid, p in game.players.items():
-            if p.strategy and p.is_alive:
-                tasks.append(judge_and_generate_harsh(pid, p.name, p.strategy, current_round.scenario_text, current_round.style_theme))
+        round_idx = game.current_round_idx
+        current_round = game.rounds[round_idx]
 
-        if tasks:
-            print(f"LAST STAND JUDGEMENT: Running {len(tasks)} harsh judgements in parallel...", flush=True)
-            results = await asyncio.gather(*tasks)
+        # Collect players that still need judging (most were judged early on submission)
+        candidates = [
+            pid for pid, p in game.players.items()
+            if p.strategy and p.is_alive and not p.judgement_pending and not (p.death_reason or p.survival_reason)
+        ]
+        claimed = await claim_for_judgement(game_code, round_idx, candidates) if candidates else []
+        tasks = [
+            judge_and_persist_harsh(round_idx, pid, game.players[pid].name, game.players[pid].strategy,
+                                    current_round.scenario_text, current_round.style_theme)
+            for pid in claimed
+        ]
 
-            for result in results:
-                pid = result["pid"]
-                p = game.players[pid]
-                p.is_alive = result["survived"]
-                if not result["survived"]:
-                    p.death_reason = result["reason"]
-                    p.survival_reason = None
-                else:
-                    p.score += 100
-                    p.survival_reason = result["reason"]
-                    p.death_reason = None
-                if result["image_url"]:
-                    p.result_image_url = result["image_url"]
-                print(f"LAST STAND: {p.name} survived={result['survived']}", flush=True)
-
-        # Check if we need revival phase
-        survivors = [p for p in game.players.values() if p.is_alive]
-        dead_players = [p for p in game.players.values() if not p.is_alive]
+        # Timeout images are saved as they arrive and don't hold up the round
+        timeout_tasks = [
+            timeout_image_and_persist(round_idx, pid, current_round.style_theme)
+            for pid in current_round.timed_out_players if pid in game.players
+        ]
 
-        if survivors and dead_players:
-            # Go to revival phase
-            current_round.status = "last_stand_revival"
-            current_round.vote_start_time = time.time()
-            print(f"LAST STAND: {len(survivors)} survivors, {len(dead_players)} dead - entering revival phase", flush=True)
+        if not tasks:
+            await finish_judgement_if_settled(game_code, round_idx, finish_last_stand_judgement)
         else:
-            # Skip revival - either everyone survived or everyone died
-            current_round.status = "results"
-            print(f"LAST STAND: Skipping revival (survivors={len(survivors)}, dead={len(dead_players)})", flush=True)
-
-        save_game(game)
-
-        # Trigger video pre-generation on round 1 results (only once)
-        # Note: This runs after save, for both revival and non-revival paths
-        if game.current_round_idx == 0:
-            maybe_spawn_video_prewarm(game)
+            print(f"LAST STAND JUDGEMENT: Running {len(tasks)} harsh judgements in parallel...", flush=True)
+        await asyncio.gather(*tasks, *timeout_tasks)
 
         print(f"LAST STAND JUDGEMENT: Complete!", flush=True)
 
-    asyncio.run(run_all_judgements())
+    await run_all_judgements()
 
 
 async def judge_strategy_harsh_async(scenario: str, strategy: str):
     """HARSH version of judgement for Last Stand - EVIL SANTA edition."""
-    import re
-    import httpx
 
     prompt = prompts.format_prompt(
         prompts.LAST_STAND_JUDGEMENT,
@@ -4841,43 +5816,25 @@ async def judge_strategy_harsh_async(scenario: str, strategy: str):
     )
 
     try:
-        timeout = CONFIG["llm"]["default_timeout_seconds"]
-        async with httpx.AsyncClient(timeout=float(timeout)) as client:
-            response = await client.post(
-                f"{CONFIG['llm']['base_url']}/chat/completions",
-                headers={
-                    "Authorization": f"Bearer {os.environ['MOONSHOT_API_KEY']}",
-                    "Content-Type": "application/json"
-                },
-                json={
-                    "model": get_model("last_stand_judgement"),
-                    "messages": [{"role": "user", "content": prompt}]
-                }
-            )
-            response.raise_for_status()
-            data = response.json()
-            content = data["choices"][0]["message"]["content"]
-
-        json_match = re.search(r'```(?:json)?\s*([\s\S]*?)\s*```', content)
-        if json_match:
-            content = json_match.group(1)
-        json_obj_match = re.search(r'\{[\s\S]*\}', content)
-        if json_obj_match:
-            content = json_obj_match.group(0)
-
-        return content.strip()
+        content = await chat_completion_async(
+            "last_stand_judgement", prompt, response_model=JudgementResponse
+        )
+        result = await parse_json_with_repair(content, "last_stand", JudgementResponse)
+        if result is not None:
+            return json.dumps(result)
+        print(f"HARSH JUDGEMENT LLM: Unparseable judgement, using fallback", flush=True)
     except Exception as e:
         print(f"HARSH JUDGEMENT LLM Error: {e}", flush=True)
-        return prompts.FALLBACK_LAST_STAND_JUDGEMENT
+    return prompts.FALLBACK_LAST_STAND_JUDGEMENT
 
 
 # --- REVIVAL JUDGEMENT ---
 
-@app.function(image=image, secrets=secrets)
-def run_revival_judgement(game_code: str, expected_round_idx: int = -1):
-    """Re-judge the revived player with a bonus for teamwork."""
-    import json
-    import asyncio
+async def run_revival_judgement_task(game_code: str, expected_round_idx: int = -1):
+    """Re-judge the revived player with a bonus for teamwork.
+
+    The verdict is published straight away; the new image is attached when it lands.
+    """
 
     async def do_revival_judgement():
         game = get_game(game_code)
@@ -4890,7 +5847,8 @@ def run_revival_judgement(game_code: str, expected_round_idx: int = -1):
             print(f"REVIVAL JUDGEMENT: Round mismatch! Expected {expected_round_idx}, got {game.current_round_idx}. Aborting.", flush=True)
             return
 
-        current_round = game.rounds[game.current_round_idx]
+        round_idx = game.current_round_idx
+        current_round = game.rounds[round_idx]
         revived_id = current_round.revived_player_id
         revived = game.players[revived_id]
 
@@ -4913,44 +5871,63 @@ def run_revival_judgement(game_code: str, expected_round_idx: int = -1):
             reason = "The revival failed..."
             vis_prompt = "A figure fading away again"
 
-        # Generate new image
-        themed_prompt = apply_style_theme(vis_prompt, current_round.style_theme)
-        image_url = await generate_image_fal_async(themed_prompt)
+        # Store revival results and update player state
+        def mutator(game: GameState):
+            if game.current_round_idx != round_idx:
+                return (False, False)
+            current_round = game.rounds[round_idx]
+            if current_round.status != "revival_judgement" or revived_id not in game.players:
+                return (False, False)
+            current_round.revival_survived = survived
+            current_round.revival_reason = reason
+            verdict_applier(survived, reason, image_pending=True)(game, game.players[revived_id])
+            current_round.status = "results"
+            return (True, True)
 
-        # Store revival results
-        current_round.revival_survived = survived
-        current_round.revival_reason = reason
-        current_round.revival_image_url = image_url
+        def verify(game: GameState) -> bool:
+            return game.current_round_idx != round_idx or game.rounds[round_idx].status != "revival_judgement"
 
-        # Update player state
-        revived.is_alive = survived
+        if not await update_game_with_retry(game_code, mutator, verify):
+            print(f"REVIVAL JUDGEMENT: Round already moved on, discarding verdict", flush=True)
+            return
         if survived:
-            revived.survival_reason = reason
-            revived.death_reason = None
-            revived.score += 100
             print(f"REVIVAL: {revived.name} SURVIVED their second chance!", flush=True)
         else:
-            revived.death_reason = reason
-            revived.survival_reason = None
             print(f"REVIVAL: {revived.name} failed their second chance", flush=True)
-        revived.result_image_url = image_url
-
-        current_round.status = "results"
-        save_game(game)
 
         # Trigger video pre-generation on round 1 results (only once)
-        if game.current_round_idx == 0:
-            maybe_spawn_video_prewarm(game)
+        if round_idx == 0:
+            game = get_game(game_code)
+            if game:
+                maybe_spawn_video_prewarm(game)
+
+        # Generate new image
+        themed_prompt = apply_style_theme(vis_prompt, current_round.style_theme)
+        image_url = await generate_image_fal_async(themed_prompt)
+
+        def attach_image(game: GameState):
+            if game.current_round_idx != round_idx or revived_id not in game.players:
+                return (False, None)
+            revived = game.players[revived_id]
+            if image_url:
+                game.rounds[round_idx].revival_image_url = image_url
+                revived.result_image_url = image_url
+            revived.result_image_pending = False
+            return (True, None)
+
+        def verify_image(game: GameState) -> bool:
+            return (game.current_round_idx != round_idx or revived_id not in game.players
+                    or not game.players[revived_id].result_image_pending)
+
+        await update_game_with_retry(game_code, attach_image, verify_image)
 
         print(f"REVIVAL JUDGEMENT: Complete!", flush=True)
 
-    asyncio.run(do_revival_judgement())
+    await do_revival_judgement()
 
 
 async def judge_strategy_revival_async(scenario: str, strategy: str, player_name: str):
     """Judge with slight leniency for revived player - EVIL SANTA edition."""
-    import re
-    import httpx
 
     prompt = prompts.format_prompt(
         prompts.REVIVAL_JUDGEMENT,
@@ -4960,43 +5937,495 @@ async def judge_strategy_revival_async(scenario: str, strategy: str, player_name
     )
 
     try:
-        timeout = CONFIG["llm"]["default_timeout_seconds"]
-        async with httpx.AsyncClient(timeout=float(timeout)) as client:
-            response = await client.post(
-                f"{CONFIG['llm']['base_url']}/chat/completions",
-                headers={
-                    "Authorization": f"Bearer {os.environ['MOONSHOT_API_KEY']}",
-                    "Content-Type": "application/json"
-                },
-                json={
-                    "model": get_model("revival_judgement"),
-                    "messages": [{"role": "user", "content": prompt}]
-                }
-            )
-            response.raise_for_status()
-            data = response.json()
-            content = data["choices"][0]["message"]["content"]
-
-        json_match = re.search(r'```(?:json)?\s*([\s\S]*?)\s*```', content)
-        if json_match:
-            content = json_match.group(1)
-        json_obj_match = re.search(r'\{[\s\S]*\}', content)
-        if json_obj_match:
-            content = json_obj_match.group(0)
-
-        return content.strip()
+        content = await chat_completion_async(
+            "revival_judgement", prompt, response_model=JudgementResponse
+        )
+        result = await parse_json_with_repair(content, player_name, JudgementResponse)
+        if result is not None:
+            return json.dumps(result)
+        print(f"REVIVAL LLM: Unparseable judgement, using fallback", flush=True)
     except Exception as e:
         print(f"REVIVAL LLM Error: {e}", flush=True)
-        return prompts.FALLBACK_REVIVAL_JUDGEMENT
+    return prompts.FALLBACK_REVIVAL_JUDGEMENT
 
 
 # Mount static files (Frontend)
 # We expect 'frontend/dist' to be available. We need to Mount it in the App definition.
 assets_path = os.path.join(os.path.dirname(__file__), "../frontend/dist")
 
+# --- Background Workers ---
+# Background work runs on Modal classes rather than one-off functions: @modal.enter opens
+# the pooled HTTP client once per container on the container's persistent event loop, so
+# every invocation reuses warm connections instead of building clients and a fresh loop
+# (asyncio.run) per call. CONFIG, prompts and json_repair's compiled regexes are loaded
+# at import, i.e. once per container.
+
+# An input that lands within this many seconds of container start paid for the cold start
+COLD_START_WINDOW_SECONDS = 2.0
+
+
+class _WarmWorker:
+    @modal.enter()
+    async def warm(self):
+        get_http_client()
+        self._ready_at = time.time()
+        self._stats = {"worker": type(self).__name__, "warm_hits": 0, "cold_starts": 0}
+        print(f"WORKER: {type(self).__name__} container warmed", flush=True)
+
+    @modal.exit()
+    async def shutdown(self):
+        await close_http_client()
+        await asyncio.to_thread(flush_all_spend)
+
+    def _record_invocation(self, method_name: str, game_code: str, spawned_at: float | None):
+        """Count this input as a warm hit or a cold start and publish the container's counters.
+
+        Also tags this input's telemetry spans and records its spawn-to-start delay.
+        """
+        telemetry.set_tags(game=game_code, worker=method_name)
+        if spawned_at is not None:
+            telemetry.record("spawn_delay", max(0.0, time.time() - spawned_at))
+        first_input = self._stats["warm_hits"] + self._stats["cold_starts"] == 0
+        if first_input and time.time() - self._ready_at < COLD_START_WINDOW_SECONDS:
+            self._stats["cold_starts"] += 1
+        else:
+            self._stats["warm_hits"] += 1
+        try:
+            worker_stats[os.environ.get("MODAL_TASK_ID", "local")] = {**self._stats, "updated_at": time.time()}
+        except Exception as e:
+            print(f"WORKER: Could not publish stats: {e}", flush=True)
+
+
+# Actor write mode: one container per registry shard owns its games' documents. Each
+# parametrization gets its own containers, so max_containers=1 makes it the only writer
+# for the shard, and it takes many inputs at once so writes to a game can be batched.
+# Unused (scaled to zero) in retry mode.
+@app.cls(image=image, secrets=secrets, max_containers=1,
+         scaledown_window=CONFIG.get("state", {}).get("actor_idle_seconds", 300))
+@modal.concurrent(max_inputs=CONFIG.get("state", {}).get("owner_max_inputs", 100))
+class GameOwner:
+    shard: int = modal.parameter()
+
+    @modal.enter()
+    def own(self):
+        _owned_shards.add(self.shard)
+        print(f"GAME OWNER: Owning shard {self.shard}", flush=True)
+
+    @modal.method()
+    async def apply(self, code: str, mutator):
+        """update_game_with_retry on the owner; returns the mutator's result."""
+        try:
+            _, result = await get_game_actor(code).apply(mutator)
+        except HTTPException as e:
+            raise OwnerHTTPError(e.status_code, e.detail)
+        return result
+
+    @modal.method()
+    async def replace(self, data: bytes) -> tuple[str, float]:
+        """save_game on the owner (async so it runs on the loop, between actor batches)."""
+        return replace_owned_game(decode_game(data))
+
+
+@app.cls(image=image, secrets=secrets)
+class JudgementWorker(_WarmWorker):
+    """LLM judgement for every round type."""
+
+    @modal.method()
+    async def run_round_judgement(self, game_code: str, expected_round_idx: int = -1, spawned_at: float | None = None):
+        self._record_invocation("run_round_judgement", game_code, spawned_at)
+        await run_round_judgement_task(game_code, expected_round_idx)
+
+    @modal.method()
+    async def run_ranked_judgement(self, game_code: str, expected_round_idx: int = -1, spawned_at: float | None = None):
+        self._record_invocation("run_ranked_judgement", game_code, spawned_at)
+        await run_ranked_judgement_task(game_code, expected_round_idx)
+
+    @modal.method()
+    async def judge_single_player(self, game_code: str, player_id: str, expected_round_idx: int = -1, spawned_at: float | None = None):
+        self._record_invocation("judge_single_player", game_code, spawned_at)
+        await judge_single_player_task(game_code, player_id, expected_round_idx)
+
+    @modal.method()
+    async def prejudge_coop_strategy(self, game_code: str, round_idx: int, player_id: str, strategy: str, spawned_at: float | None = None):
+        self._record_invocation("prejudge_coop_strategy", game_code, spawned_at)
+        await prejudge_coop_strategy_task(game_code, round_idx, player_id, strategy)
+
+    @modal.method()
+    async def run_coop_judgement(self, game_code: str, expected_round_idx: int = -1, spawned_at: float | None = None):
+        self._record_invocation("run_coop_judgement", game_code, spawned_at)
+        await run_coop_judgement_task(game_code, expected_round_idx)
+
+    @modal.method()
+    async def run_sacrifice_judgement(self, game_code: str, expected_round_idx: int = -1, spawned_at: float | None = None):
+        self._record_invocation("run_sacrifice_judgement", game_code, spawned_at)
+        await run_sacrifice_judgement_task(game_code, expected_round_idx)
+
+    @modal.method()
+    async def run_last_stand_judgement(self, game_code: str, expected_round_idx: int = -1, spawned_at: float | None = None):
+        self._record_invocation("run_last_stand_judgement", game_code, spawned_at)
+        await run_last_stand_judgement_task(game_code, expected_round_idx)
+
+    @modal.method()
+    async def run_revival_judgement(self, game_code: str, expected_round_idx: int = -1, spawned_at: float | None = None):
+        self._record_invocation("run_revival_judgement", game_code, spawned_at)
+        await run_revival_judgement_task(game_code, expected_round_idx)
+
+
+@app.cls(image=image, secrets=secrets, timeout=900)  # 15 min timeout for multiple videos
+class MediaWorker(_WarmWorker):
+    """Scenario, image and video generation."""
+
+    @modal.method()
+    async def prewarm_all_scenarios(self, game_code: str, spawned_at: float | None = None):
+        self._record_invocation("prewarm_all_scenarios", game_code, spawned_at)
+        await prewarm_all_scenarios_task(game_code)
+
+    @modal.method()
+    async def generate_character_image(self, game_code: str, player_id: str, character_prompt: str, spawned_at: float | None = None):
+        self._record_invocation("generate_character_image", game_code, spawned_at)
+        await generate_character_image_task(game_code, player_id, character_prompt)
+
+    @modal.method()
+    async def generate_timeout_image(self, game_code: str, player_id: str, style_theme: str | None, spawned_at: float | None = None):
+        self._record_invocation("generate_timeout_image", game_code, spawned_at)
+        await generate_timeout_image_task(game_code, player_id, style_theme)
+
+    @modal.method()
+    async def generate_sacrifice_timeout_deaths(self, game_code: str, martyr_id: str, style_theme: str | None, spawned_at: float | None = None):
+        self._record_invocation("generate_sacrifice_timeout_deaths", game_code, spawned_at)
+        await generate_sacrifice_timeout_deaths_task(game_code, martyr_id, style_theme)
+
+    @modal.method()
+    async def generate_trap_image(self, game_code: str, round_idx: int, player_id: str, trap_text: str, spawned_at: float | None = None):
+        self._record_invocation("generate_trap_image", game_code, spawned_at)
+        await generate_trap_image_task(game_code, round_idx, player_id, trap_text)
+
+    @modal.method()
+    async def prerender_sacrifice_outcomes(self, game_code: str, round_idx: int, martyr_id: str, spawned_at: float | None = None):
+        self._record_invocation("prerender_sacrifice_outcomes", game_code, spawned_at)
+        await prerender_sacrifice_outcomes_task(game_code, round_idx, martyr_id)
+
+    @modal.method()
+    async def generate_coop_strategy_image(self, game_code: str, round_idx: int, player_id: str, strategy: str, spawned_at: float | None = None):
+        self._record_invocation("generate_coop_strategy_image", game_code, spawned_at)
+        await generate_coop_strategy_image_task(game_code, round_idx, player_id, strategy)
+
+    @modal.method()
+    async def generate_coop_strategy_images(self, game_code: str, expected_round_idx: int = -1, wait_for_speculative: bool = False, spawned_at: float | None = None):
+        self._record_invocation("generate_coop_strategy_images", game_code, spawned_at)
+        await generate_coop_strategy_images_task(game_code, expected_round_idx, wait_for_speculative)
+
+    @modal.method()
+    async def prewarm_player_videos(self, game_code: str, spawned_at: float | None = None):
+        self._record_invocation("prewarm_player_videos", game_code, spawned_at)
+        await prewarm_player_videos_task(game_code)
+
+    @modal.method()
+    async def generate_all_player_videos(self, game_code: str, spawned_at: float | None = None):
+        self._record_invocation("generate_all_player_videos", game_code, spawned_at)
+        await generate_all_player_videos_task(game_code)
+
+
+# With a local state backend the Modal workers can't see the game state, so work runs
+# as tasks in this process instead
+LOCAL_WORKERS = STATE_BACKEND != "modal"
+
+_local_worker_tasks: set = set()
+# Local stand-ins for Modal FunctionCalls, by the call ID recorded in spawned_calls
+_local_calls: dict = {}
+
+
+class WorkerHandle:
+    """Spawn choke point for background work: a Modal method, or a local task.
+
+    With dedup_args=N the first N spawn arguments (game code, then round index) name
+    the piece of work. Only the first spawn for a name runs; its call ID is recorded in
+    spawned_calls and later spawns return None. Call release() to allow a deliberate
+    re-run (e.g. retrying stuck videos).
+
+    round_arg is the position of the round index in the spawn arguments. Those calls are
+    recorded in round_calls so cancel_round_calls() can stop them once the round is over.
+    """
+
+    deduped: list = []
+
+    def __init__(self, method_name: str, worker_cls, task, dedup_args: int = 0, round_arg: int | None = None):
+        self.method_name = method_name
+        self.worker_cls = worker_cls
+        self.task = task
+        self.dedup_args = dedup_args
+        self.round_arg = round_arg
+        if dedup_args:
+            WorkerHandle.deduped.append(self)
+
+    def spawn_key(self, *args) -> str | None:
+        if not self.dedup_args or len(args) < self.dedup_args:
+            return None
+        return ":".join(str(a) for a in args[:self.dedup_args]) + f":{self.method_name}"
+
+    def spawn(self, *args):
+        key = self.spawn_key(*args)
+        if key is not None:
+            # Atomic reservation: concurrent duplicate spawns can't both get in
+            if not spawned_calls.put(key, {"call_id": None, "spawned_at": time.time()}, skip_if_exists=True):
+                print(f"SPAWN: {key} already spawned, skipping duplicate", flush=True)
+                return None
+
+        try:
+            if LOCAL_WORKERS:
+                call = spawn_local_task(self.task(*args), self.method_name, spawned_at=time.time())
+                call_id = f"local-{uuid.uuid4().hex[:12]}"
+                _local_calls[call_id] = call
+                if isinstance(call, asyncio.Task):
+                    call.add_done_callback(lambda _: _local_calls.pop(call_id, None))
+            else:
+                call = getattr(self.worker_cls(), self.method_name).spawn(*args, spawned_at=time.time())
+                call_id = call.object_id
+        except Exception:
+            if key is not None:
+                _discard(spawned_calls, key)  # Let a later spawn try again
+            raise
+
+        if key is not None:
+            spawned_calls[key] = {"call_id": call_id, "spawned_at": time.time()}
+        if self.round_arg is not None and len(args) > self.round_arg and args[self.round_arg] >= 0:
+            track_round_call(args[0], args[self.round_arg], call_id, self.method_name)
+        return call
+
+    def release(self, *args):
+        """Forget a recorded spawn so the next spawn with these arguments runs again."""
+        key = self.spawn_key(*args)
+        if key is not None:
+            _discard(spawned_calls, key)
+
+
+def track_round_call(code: str, round_idx: int, call_id: str, method_name: str):
+    """Remember an in-flight round-scoped call.
+
+    Read-modify-write: two containers spawning for the same round at the same moment
+    can drop an entry, which only means that call runs to completion uncancelled.
+    """
+    key = f"{code}:{round_idx}"
+    calls = round_calls.get(key) or {}
+    calls[call_id] = method_name
+    round_calls[key] = calls
+
+
+def cancel_call(call_id: str) -> bool:
+    """Cancel a spawned call by ID. Finished calls are left alone."""
+    if call_id.startswith("local-"):
+        task = _local_calls.pop(call_id, None)
+        if not isinstance(task, asyncio.Task) or task.done():
+            return False
+        # May run on a worker thread (cancel_round_calls_async); Task.cancel belongs on its loop
+        task.get_loop().call_soon_threadsafe(task.cancel)
+        return True
+    try:
+        modal.FunctionCall.from_id(call_id).cancel()
+        return True
+    except Exception as e:
+        print(f"CANCEL: Could not cancel {call_id}: {e}", flush=True)
+        return False
+
+
+def cancel_round_calls(code: str, round_idx: int):
+    """Stop background work still running for a round that is over.
+
+    Every worker already re-checks the round before writing, so this only saves the
+    LLM/FAL spend and container time of calls whose results would be thrown away.
+    """
+    try:
+        calls = round_calls.pop(f"{code}:{round_idx}")
+    except KeyError:
+        return
+    cancelled = [method for call_id, method in calls.items() if cancel_call(call_id)]
+    if cancelled:
+        print(f"CANCEL: Round {round_idx + 1} of {code} over, cancelled {len(cancelled)} calls: {', '.join(sorted(set(cancelled)))}", flush=True)
+
+
+async def cancel_round_calls_async(code: str, round_idx: int):
+    """cancel_round_calls off the event loop (a Dict pop plus one Modal round trip per call)."""
+    await asyncio.to_thread(cancel_round_calls, code, round_idx)
+
+
+def forget_spawns(code: str, round_count: int):
+    """Drop every spawn record for a game (eviction, debug state rebuilds)."""
+    for handle in WorkerHandle.deduped:
+        if handle.dedup_args == 1:
+            _discard(spawned_calls, f"{code}:{handle.method_name}")
+        else:
+            for idx in range(round_count):
+                _discard(spawned_calls, f"{code}:{idx}:{handle.method_name}")
+
+
+def spawn_local_task(coro, label: str, spawned_at: float | None = None):
+    """Run a worker coroutine in the background of the current process."""
+    async def run():
+        telemetry.set_tags(worker=label)
+        if spawned_at is not None:
+            telemetry.record("spawn_delay", max(0.0, time.time() - spawned_at))
+        try:
+            await coro
+        except Exception as e:
+            import traceback
+            print(f"LOCAL WORKER: {label} failed: {type(e).__name__}: {e}", flush=True)
+            print(traceback.format_exc(), flush=True)
+
+    try:
+        loop = asyncio.get_running_loop()
+    except RuntimeError:
+        # Called outside an event loop: give the task its own thread and loop
+        thread = threading.Thread(target=asyncio.run, args=(run(),), daemon=True)
+        thread.start()
+        return thread
+
+    task = loop.create_task(run())
+    # Hold a reference until done so the task isn't garbage collected mid-flight
+    _local_worker_tasks.add(task)
+    task.add_done_callback(_local_worker_tasks.discard)
+    return task
+
+
+# Module-level handles so call sites keep using `<worker>.spawn(...)`
+run_round_judgement = WorkerHandle("run_round_judgement", JudgementWorker, run_round_judgement_task, dedup_args=2, round_arg=1)
+run_ranked_judgement = WorkerHandle("run_ranked_judgement", JudgementWorker, run_ranked_judgement_task, dedup_args=2, round_arg=1)
+judge_single_player = WorkerHandle("judge_single_player", JudgementWorker, judge_single_player_task, round_arg=2)
+prejudge_coop_strategy = WorkerHandle("prejudge_coop_strategy", JudgementWorker, prejudge_coop_strategy_task, round_arg=1)
+run_coop_judgement = WorkerHandle("run_coop_judgement", JudgementWorker, run_coop_judgement_task, dedup_args=2, round_arg=1)
+run_sacrifice_judgement = WorkerHandle("run_sacrifice_judgement", JudgementWorker, run_sacrifice_judgement_task, dedup_args=2, round_arg=1)
+run_last_stand_judgement = WorkerHandle("run_last_stand_judgement", JudgementWorker, run_last_stand_judgement_task, dedup_args=2, round_arg=1)
+run_revival_judgement = WorkerHandle("run_revival_judgement", JudgementWorker, run_revival_judgement_task, dedup_args=2, round_arg=1)
+
+prewarm_all_scenarios = WorkerHandle("prewarm_all_scenarios", MediaWorker, prewarm_all_scenarios_task)
+generate_character_image = WorkerHandle("generate_character_image", MediaWorker, generate_character_image_task)
+generate_timeout_image = WorkerHandle("generate_timeout_image", MediaWorker, generate_timeout_image_task)
+generate_sacrifice_timeout_deaths = WorkerHandle("generate_sacrifice_timeout_deaths", MediaWorker, generate_sacrifice_timeout_deaths_task)
+prerender_sacrifice_outcomes = WorkerHandle("prerender_sacrifice_outcomes", MediaWorker, prerender_sacrifice_outcomes_task, dedup_args=2, round_arg=1)
+generate_trap_image = WorkerHandle("generate_trap_image", MediaWorker, generate_trap_image_task, round_arg=1)
+generate_coop_strategy_image = WorkerHandle("generate_coop_strategy_image", MediaWorker, generate_coop_strategy_image_task, round_arg=1)
+generate_coop_strategy_images = WorkerHandle("generate_coop_strategy_images", MediaWorker, generate_coop_strategy_images_task, dedup_args=2, round_arg=1)
+prewarm_player_videos = WorkerHandle("prewarm_player_videos", MediaWorker, prewarm_player_videos_task, dedup_args=1)
+generate_all_player_videos = WorkerHandle("generate_all_player_videos", MediaWorker, generate_all_player_videos_task)
+
+# Keep old function name as alias for backwards compatibility
+generate_winner_video = generate_all_player_videos
+
+
+@app.function(image=image, secrets=secrets, schedule=modal.Period(hours=1))
+def compact_game_registry():
+    """Hourly eviction of finished and abandoned games from the registry."""
+    compact_game_store()
+    prune_worker_stats()
+
+
+# --- Warm Pool ---
+# Live games register how many players will submit; the judgement pool keeps that many
+# containers warm (one judge_single_player per player) and the media pool keeps one per
+# game for coop strategy images. Finished or abandoned games release their demand.
+
+def get_warm_pool_size(game: GameState) -> int:
+    """Number of judgement containers a live game wants warm (connected lobby players)."""
+    lobby_ids = {pid for pid, p in game.players.items() if p.in_lobby} or set(game.players)
+    connected = lobby_ids & get_connected_players(game.code)
+    return len(connected) or len(lobby_ids)
+
+
+def sync_warm_pool(code: str, players: int):
+    """Record a game's warm-pool demand (0 releases it) and resize the worker pools."""
+    pool_config = CONFIG.get("warm_pool", {})
+    if not pool_config.get("enabled", True) or LOCAL_WORKERS:
+        return
+
+    try:
+        if players > 0:
+            warm_pool_demand[code] = {"players": players, "updated_at": time.time()}
+        elif code in warm_pool_demand:
+            del warm_pool_demand[code]
+
+        # Drop demand from games that went quiet without finishing
+        ttl = pool_config.get("demand_ttl_seconds", 1800)
+        now = time.time()
+        active = {}
+        expired = []
+        for game_code, demand in warm_pool_demand.items():
+            if now - demand.get("updated_at", 0) > ttl:
+                expired.append(game_code)
+            else:
+                active[game_code] = demand["players"]
+        for game_code in expired:
+            _discard(warm_pool_demand, game_code)
+
+        judgement_containers = min(sum(active.values()), pool_config.get("max_judgement_containers", 20))
+        media_containers = min(len(active), pool_config.get("max_media_containers", 5))
+        JudgementWorker().update_autoscaler(min_containers=judgement_containers)
+        MediaWorker().update_autoscaler(min_containers=media_containers)
+        print(f"WARM POOL: {len(active)} active games -> judgement={judgement_containers}, media={media_containers}", flush=True)
+    except Exception as e:
+        # Warm pool is an optimisation - never fail the game flow over it
+        print(f"WARM POOL: Failed to resize for {code}: {e}", flush=True)
+
+
+async def sync_warm_pool_async(code: str, game: Optional[GameState]):
+    """sync_warm_pool for a game (None releases it), off the event loop.
+
+    The Dict scan and update_autoscaler calls are blocking Modal round trips.
+    """
+    def sync():
+        sync_warm_pool(code, get_warm_pool_size(game) if game else 0)
+    await asyncio.to_thread(sync)
+
+
+def prune_worker_stats():
+    """Forget counters from containers that have not taken an input for a while (they are gone)."""
+    ttl = CONFIG.get("warm_pool", {}).get("worker_stats_ttl_seconds", 6 * 3600)
+    now = time.time()
+    stale = [task_id for task_id, stats in worker_stats.items() if now - stats.get("updated_at", 0) > ttl]
+    for task_id in stale:
+        _discard(worker_stats, task_id)
+    print(f"WARM POOL: Pruned {len(stale)} stale worker stats entries", flush=True)
+
+
+def warm_pool_stats() -> dict:
+    totals = {}
+    for stats in worker_stats.values():
+        worker = totals.setdefault(stats["worker"], {"containers": 0, "warm_hits": 0, "cold_starts": 0})
+        worker["containers"] += 1
+        worker["warm_hits"] += stats.get("warm_hits", 0)
+        worker["cold_starts"] += stats.get("cold_starts", 0)
+    for worker in totals.values():
+        invocations = worker["warm_hits"] + worker["cold_starts"]
+        worker["warm_hit_rate"] = round(worker["warm_hits"] / invocations, 3) if invocations else None
+
+    demand = {code: d.get("players", 0) for code, d in warm_pool_demand.items()}
+    return {"workers": totals, "active_games": len(demand), "demand": demand}
+
+
+@web_app.get("/api/warm_pool_stats")
+async def api_warm_pool_stats():
+    """Warm-hit / cold-start counters per worker class plus current warm-pool demand."""
+    # Full scans of two Dicts - keep them off the event loop
+    return await asyncio.to_thread(warm_pool_stats)
+
+
+@web_app.get("/api/update_stats")
+async def api_update_stats():
+    """update_game_with_retry call/retry counters for this container (write contention)."""
+    return {"write_mode": WRITE_MODE, **update_stats}
+
+
+@web_app.get("/api/metrics")
+async def api_metrics():
+    """Latency histograms per span and round type for this container (see telemetry.py).
+
+    With local workers this covers every stage; on Modal, worker spans live in the
+    worker containers and are exported as JSON lines (telemetry.json_lines).
+    """
+    return {"write_mode": WRITE_MODE, "update_stats": update_stats, **telemetry.snapshot()}
+
+
 # We serve the React app. For SPA, we need to catch 404s and return index.html? 
 # Or just serve static assets and root.
-web_app.mount("/", StaticFiles(directory="/assets", html=True, check_dir=False), name="static")
+web_app.mount("/", StaticFiles(directory=os.environ.get("SURVAIVE_ASSETS_DIR", "/assets"), html=True, check_dir=False), name="static")
 
 @app.function(
     image=image, 
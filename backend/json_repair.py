@@ -0,0 +1,115 @@
+"""
+Local, tolerant JSON extraction and repair for LLM responses.
+
+LLMs regularly wrap JSON in markdown, put raw newlines inside strings, leave
+trailing commas or forget to escape quotes in dialogue. These helpers fix the
+common cases locally so an LLM repair round trip is only needed as a last resort.
+
+Stdlib only - this module is shipped next to prompts.py in the Modal image.
+"""
+
+import json
+import re
+
+_CODE_FENCE_RE = re.compile(r'```(?:json)?\s*([\s\S]*?)\s*```')
+_JSON_OBJECT_RE = re.compile(r'\{[\s\S]*\}')
+_LITERAL_RE = re.compile(r'(?:true|false|null)\s*[,}\]]')
+
+_CONTROL_ESCAPES = {"\n": "\\n", "\r": "\\r", "\t": "\\t", "\b": "\\b", "\f": "\\f"}
+
+
+def extract_json(text: str) -> str | None:
+    """Pull the JSON object out of an LLM response (code fences, surrounding prose)."""
+    if not text:
+        return None
+    fence_match = _CODE_FENCE_RE.search(text)
+    if fence_match:
+        text = fence_match.group(1)
+    obj_match = _JSON_OBJECT_RE.search(text)
+    if obj_match:
+        return obj_match.group(0).strip()
+    return None
+
+
+def _quote_closes_string(text: str, idx: int) -> bool:
+    """Decide whether the quote at text[idx] terminates the current string.
+
+    A closing quote is followed by ':' (key), '}' / ']' / end of input, or by a
+    ',' that leads into another JSON value. Anything else is treated as a quote
+    the model forgot to escape.
+    """
+    j = idx + 1
+    n = len(text)
+    while j < n and text[j] in " \t\r\n":
+        j += 1
+    if j >= n or text[j] in ":}]":
+        return True
+    if text[j] != ",":
+        return False
+    j += 1
+    while j < n and text[j] in " \t\r\n":
+        j += 1
+    if j >= n or text[j] in '"{[-0123456789}]':
+        return True
+    return _LITERAL_RE.match(text, j) is not None
+
+
+def repair_json(text: str) -> str:
+    """Fix control characters, unescaped quotes and trailing commas in a JSON string."""
+    out = []
+    in_string = False
+    i = 0
+    n = len(text)
+    while i < n:
+        ch = text[i]
+        if in_string:
+            if ch == "\\" and i + 1 < n:
+                out.append(text[i:i + 2])
+                i += 2
+                continue
+            if ch == '"':
+                if _quote_closes_string(text, i):
+                    in_string = False
+                    out.append(ch)
+                else:
+                    out.append('\\"')
+            elif ord(ch) < 0x20:
+                out.append(_CONTROL_ESCAPES.get(ch, f"\\u{ord(ch):04x}"))
+            else:
+                out.append(ch)
+        else:
+            if ch == '"':
+                in_string = True
+                out.append(ch)
+            elif ch == ",":
+                # Drop trailing commas before a closing brace/bracket
+                j = i + 1
+                while j < n and text[j] in " \t\r\n":
+                    j += 1
+                if j >= n or text[j] not in "}]":
+                    out.append(ch)
+            else:
+                out.append(ch)
+        i += 1
+    return "".join(out)
+
+
+def parse_json_tolerant(text: str):
+    """Parse JSON from an LLM response, repairing it locally if needed.
+
+    Returns the parsed value, or None if it could not be recovered locally.
+    """
+    candidate = extract_json(text)
+    if candidate is None:
+        return None
+
+    # strict=False already accepts raw control characters inside strings
+    try:
+        return json.loads(candidate, strict=False)
+    except json.JSONDecodeError:
+        pass
+
+    try:
+        return json.loads(repair_json(candidate), strict=False)
+    except json.JSONDecodeError:
+        return None
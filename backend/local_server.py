@@ -0,0 +1,56 @@
+"""
+Run the SurvAIve web app and its background workers in one local process.
+
+Game state goes to a local backend (memory or SQLite) instead of modal.Dict, and
+every `<worker>.spawn(...)` runs as an asyncio task in this process, so the full
+game loop can be exercised - and load-tested - without Modal's cloud. Point the
+LLM/FAL URLs at stub servers to avoid real API calls:
+
+    python -m fake_upstream --profile realistic --port 9000
+    python backend/local_server.py --backend sqlite \
+        --llm-url http://127.0.0.1:9000/llm \
+        --fal-url http://127.0.0.1:9000/fal --fal-queue-url http://127.0.0.1:9000/queue
+"""
+
+import argparse
+import os
+import sys
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run SurvAIve locally without Modal")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--backend", choices=["memory", "sqlite"], default="memory",
+                        help="Game state backend (default: memory)")
+    parser.add_argument("--sqlite-path", default="survaive_state.db",
+                        help="SQLite file for --backend sqlite")
+    parser.add_argument("--llm-url", help="Override llm.base_url (e.g. a stub server)")
+    parser.add_argument("--fal-url", help="Override image_generation.fal_base_url")
+    parser.add_argument("--fal-queue-url", help="Override image_generation.fal_queue_url")
+    args = parser.parse_args()
+
+    # app.py reads these at import time, so set them first
+    os.environ["SURVAIVE_STATE_BACKEND"] = args.backend
+    os.environ["SURVAIVE_SQLITE_PATH"] = args.sqlite_path
+    if args.llm_url:
+        os.environ["SURVAIVE_LLM_BASE_URL"] = args.llm_url
+    if args.fal_url:
+        os.environ["SURVAIVE_FAL_BASE_URL"] = args.fal_url
+    if args.fal_queue_url:
+        os.environ["SURVAIVE_FAL_QUEUE_URL"] = args.fal_queue_url
+    os.environ.setdefault("MOONSHOT_API_KEY", "local")
+    os.environ.setdefault("FAL_KEY", "local")
+    repo_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    os.environ.setdefault("SURVAIVE_ASSETS_DIR", os.path.join(repo_root, "frontend", "dist"))
+
+    sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+    import uvicorn
+    import app as survaive
+
+    print(f"LOCAL: Serving on http://{args.host}:{args.port} (state backend: {args.backend})", flush=True)
+    uvicorn.run(survaive.web_app, host=args.host, port=args.port, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
@@ -177,7 +177,7 @@ RANKING CRITERIA (in order of importance):
 ## Return Format
 
 - "rankings": a list of dictionaries, each containing the following fields:
-    - "player_id": the ID of the player
+    - "player_id": the ID of the player, exactly as given in "(ID: ...)" next to their strategy
     - "rank": the rank of the player
     - "commentary": a 1-2 sentences of commentary explaining the player's rank
     - "visual_prompt": an image generation prompt of a scene that describes the player's character's \
@@ -552,6 +552,46 @@ Respond with ONLY valid JSON, no markdown:
 {{"scene": "...", "audio_type": "...", "audio": "...", "voice": "...", "sfx": "..."}}"""
 
 
+VIDEO_SCRIPT_BATCH = """You are writing video scripts for a game show finale. EVERY player gets TWO scripts:
+a TRIUMPHANT "winner" script (in case they win) and a CONSOLING but HUMOROUS "loser" script (in case they don't).
+The setting/theme for all videos is: {{video_theme}}
+
+Players (player_id: name):
+{{player_list}}
+
+PRONUNCIATION: If a player's name is unusual, non-English, or might be mispronounced, write it PHONETICALLY in the audio field.
+Examples: "Xiaowei" → "Shao-way", "Nguyen" → "Win", "Siobhan" → "Shiv-awn", "Aoife" → "Ee-fa"
+If the name is simple/common (e.g., "Bob", "Alice", "Mike"), use it as-is.
+
+VIDEO DURATION: {{duration}} seconds
+CRITICAL: Keep ALL spoken/sung content to {{word_limit}} words MAX per script or it will be cut off!
+- For singing: 2-3 short lines only
+
+WINNER scripts - make them feel like an ABSOLUTE LEGEND:
+- Audio styles: booming announcer declaring victory, a short triumphant victory jingle, or movie-trailer narration
+- Scene: VICTORY moment (pyrotechnics, confetti, crowd, spotlights)
+- SFX: "pyrotechnics, crowd roaring, triumphant music"
+
+LOSER scripts - GENTLY ROASTING but still fun, they should LAUGH at their loss:
+- Audio styles: sarcastic announcer, melodramatic consolation ballad, or nature-documentary narration about a "failed specimen"
+- Scene: CONSOLATION moment (tiny trophy, sad balloon, awkward applause)
+- SFX: "sad trombone, single clap, balloon deflating, crickets"
+
+Vary the audio styles and voices across players so no two videos feel the same.
+
+Each script has these fields:
+1. "scene": Visual description
+2. "audio_type": "dialogue" or "singing" or "narration"
+3. "audio": The spoken/sung content ({{word_limit}} WORDS MAX, must include that player's name)
+4. "voice": Specific voice characteristics
+5. "sfx": Sound effects
+
+Return exactly one entry per player, using the player_id exactly as given.
+
+Respond with ONLY valid JSON, no markdown:
+{{"scripts": [{{"player_id": "...", "winner": {{"scene": "...", "audio_type": "...", "audio": "...", "voice": "...", "sfx": "..."}}, "loser": {{"scene": "...", "audio_type": "...", "audio": "...", "voice": "...", "sfx": "..."}}}}]}}"""
+
+
 # =============================================================================
 # IMAGE GENERATION PROMPTS
 # =============================================================================
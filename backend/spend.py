@@ -0,0 +1,71 @@
+"""
+Token, image and video spend meters for a game.
+
+A game's meters are nested dicts - round type -> kind -> use case -> counters:
+
+    {"survival": {"llm": {"strategy_judgement": {"llm_calls": 4, "prompt_tokens": 2310,
+                                                 "completion_tokens": 602, "usd": 0.0018}},
+                  "images": {"result_image": {"images": 4, "usd": 0.1}}},
+     "-": {"video": {"player_video": {"videos": 4, "video_seconds": 40, "usd": 5.6}}}}
+
+Round type "-" covers work for the whole game (avatars, end-game videos). Counter
+names are unique across kinds so they can be summed into one totals dict.
+
+app.py keeps one meter dict per game in each container and publishes it to the
+game's game_spend entries under that container's own slot; summarize() merges the copies.
+
+Stdlib only - this module is shipped next to prompts.py in the Modal image.
+"""
+
+
+def llm_usd(prices: dict, model: str, prompt_tokens: int, completion_tokens: int) -> float:
+    """Cost of one LLM call from a {model: {"prompt": usd, "completion": usd}} per-million table."""
+    rates = prices.get(model) or {}
+    return (prompt_tokens * rates.get("prompt", 0) + completion_tokens * rates.get("completion", 0)) / 1_000_000
+
+
+def add(meters: dict, round_type: str | None, kind: str, use_case: str, **counts):
+    """Add one call's counters to a game's meters in place."""
+    entry = meters.setdefault(round_type or "-", {}).setdefault(kind, {}).setdefault(use_case, {})
+    for name, value in counts.items():
+        entry[name] = entry.get(name, 0) + value
+
+
+def merge(target: dict, source: dict) -> dict:
+    """Add one meter dict into another in place (merge({}, meters) copies meters)."""
+    for key, value in source.items():
+        if isinstance(value, dict):
+            merge(target.setdefault(key, {}), value)
+        else:
+            target[key] = target.get(key, 0) + value
+    return target
+
+
+def _sum_counters(target: dict, counters: dict):
+    for name, value in counters.items():
+        target[name] = target.get(name, 0) + value
+
+
+def _rounded(counters: dict) -> dict:
+    return {name: round(value, 4) if name == "usd" else value for name, value in counters.items()}
+
+
+def summarize(entries: list[dict]) -> dict:
+    """Merge per-container meters and add totals per round type and for the whole game."""
+    merged = {}
+    for entry in entries:
+        merge(merged, entry)
+
+    round_types = {}
+    totals = {}
+    for round_type, kinds in sorted(merged.items()):
+        round_totals = {}
+        breakdown = {}
+        for kind, use_cases in kinds.items():
+            breakdown[kind] = {}
+            for use_case, counters in use_cases.items():
+                breakdown[kind][use_case] = _rounded(counters)
+                _sum_counters(round_totals, counters)
+        _sum_counters(totals, round_totals)
+        round_types[round_type] = {"totals": _rounded(round_totals), **breakdown}
+    return {"totals": _rounded(totals), "round_types": round_types}
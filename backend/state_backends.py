@@ -0,0 +1,192 @@
+"""
+Pluggable key-value stores for game state.
+
+Every store app.py uses (games, round archive, presence, ...) is opened through
+open_store(name). The backend is picked by the SURVAIVE_STATE_BACKEND env var:
+
+- modal  (default) - modal.Dict.from_name(name), the deployed setup
+- memory           - in-process dict, for single-process dev and load tests
+- sqlite           - one SQLite file in WAL mode (SURVAIVE_SQLITE_PATH), shared by
+                     local processes
+
+The local stores implement the subset of the modal.Dict API the app relies on and,
+like modal.Dict, pickle values so callers always get a private copy.
+
+Stdlib only - this module is shipped next to prompts.py in the Modal image.
+"""
+
+import os
+import pickle
+import sqlite3
+import threading
+
+STATE_BACKEND = os.environ.get("SURVAIVE_STATE_BACKEND", "modal")
+SQLITE_PATH = os.environ.get("SURVAIVE_SQLITE_PATH", "survaive_state.db")
+
+_MISSING = object()
+
+
+class MemoryStore:
+    """Thread-safe in-process store with modal.Dict semantics."""
+
+    def __init__(self, name: str):
+        self.name = name
+        self._data: dict[str, bytes] = {}
+        self._lock = threading.Lock()
+
+    def get(self, key, default=None):
+        with self._lock:
+            raw = self._data.get(key, _MISSING)
+        return default if raw is _MISSING else pickle.loads(raw)
+
+    def put(self, key, value, skip_if_exists: bool = False) -> bool:
+        raw = pickle.dumps(value)
+        with self._lock:
+            if skip_if_exists and key in self._data:
+                return False
+            self._data[key] = raw
+        return True
+
+    def pop(self, key):
+        with self._lock:
+            raw = self._data.pop(key)
+        return pickle.loads(raw)
+
+    def __getitem__(self, key):
+        value = self.get(key, _MISSING)
+        if value is _MISSING:
+            raise KeyError(key)
+        return value
+
+    def __setitem__(self, key, value):
+        self.put(key, value)
+
+    def __delitem__(self, key):
+        self.pop(key)
+
+    def __contains__(self, key) -> bool:
+        with self._lock:
+            return key in self._data
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._data)
+
+    def keys(self):
+        with self._lock:
+            return list(self._data)
+
+    def items(self):
+        with self._lock:
+            snapshot = list(self._data.items())
+        return [(k, pickle.loads(raw)) for k, raw in snapshot]
+
+    def values(self):
+        return [v for _, v in self.items()]
+
+
+class SQLiteStore:
+    """Store backed by one table in a shared SQLite file (WAL mode).
+
+    Each thread gets its own connection; WAL lets pollers read while a writer commits.
+    """
+
+    _local = threading.local()
+
+    def __init__(self, name: str, path: str = SQLITE_PATH):
+        self.name = name
+        self.path = path
+        with self._conn() as conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS kv ("
+                "store TEXT NOT NULL, key TEXT NOT NULL, value BLOB NOT NULL, "
+                "PRIMARY KEY (store, key))"
+            )
+
+    def _conn(self) -> sqlite3.Connection:
+        conns = getattr(self._local, "conns", None)
+        if conns is None:
+            conns = self._local.conns = {}
+        conn = conns.get(self.path)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30.0)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conns[self.path] = conn
+        return conn
+
+    def get(self, key, default=None):
+        row = self._conn().execute(
+            "SELECT value FROM kv WHERE store = ? AND key = ?", (self.name, key)
+        ).fetchone()
+        return default if row is None else pickle.loads(row[0])
+
+    def put(self, key, value, skip_if_exists: bool = False) -> bool:
+        verb = "INSERT OR IGNORE" if skip_if_exists else "INSERT OR REPLACE"
+        with self._conn() as conn:
+            cursor = conn.execute(
+                f"{verb} INTO kv (store, key, value) VALUES (?, ?, ?)",
+                (self.name, key, pickle.dumps(value)),
+            )
+        return cursor.rowcount > 0
+
+    def pop(self, key):
+        with self._conn() as conn:
+            row = conn.execute(
+                "DELETE FROM kv WHERE store = ? AND key = ? RETURNING value", (self.name, key)
+            ).fetchone()
+        if row is None:
+            raise KeyError(key)
+        return pickle.loads(row[0])
+
+    def __getitem__(self, key):
+        value = self.get(key, _MISSING)
+        if value is _MISSING:
+            raise KeyError(key)
+        return value
+
+    def __setitem__(self, key, value):
+        self.put(key, value)
+
+    def __delitem__(self, key):
+        self.pop(key)
+
+    def __contains__(self, key) -> bool:
+        row = self._conn().execute(
+            "SELECT 1 FROM kv WHERE store = ? AND key = ?", (self.name, key)
+        ).fetchone()
+        return row is not None
+
+    def __len__(self) -> int:
+        return self._conn().execute(
+            "SELECT COUNT(*) FROM kv WHERE store = ?", (self.name,)
+        ).fetchone()[0]
+
+    def keys(self):
+        rows = self._conn().execute("SELECT key FROM kv WHERE store = ?", (self.name,))
+        return [k for (k,) in rows]
+
+    def items(self):
+        rows = self._conn().execute("SELECT key, value FROM kv WHERE store = ?", (self.name,))
+        return [(k, pickle.loads(v)) for k, v in rows]
+
+    def values(self):
+        return [v for _, v in self.items()]
+
+
+_memory_stores: dict[str, MemoryStore] = {}
+
+
+def open_store(name: str):
+    """Open the named store on the configured backend."""
+    if STATE_BACKEND == "memory":
+        # One instance per name so every module in the process shares the data
+        if name not in _memory_stores:
+            _memory_stores[name] = MemoryStore(name)
+        return _memory_stores[name]
+    if STATE_BACKEND == "sqlite":
+        return SQLiteStore(name)
+    if STATE_BACKEND == "modal":
+        import modal
+        return modal.Dict.from_name(name, create_if_missing=True)
+    raise ValueError(f"Unknown SURVAIVE_STATE_BACKEND: {STATE_BACKEND!r}")
@@ -0,0 +1,140 @@
+"""
+Structured latency spans for the game backend.
+
+A span times one stage of a request or worker (LLM call, JSON repair, FAL call,
+state read/write, ...). Spans are tagged with whatever context is active - game
+code, round type, player, worker - which app.py sets with tags() as it learns it.
+Context lives in contextvars, so every asyncio task (and each asyncio.gather child)
+carries its own tags.
+
+Each finished span:
+- lands in an in-process histogram (per span name and round type), served by
+  /api/metrics via snapshot()
+- is printed as one JSON line when json_lines is enabled, for log-based export:
+      {"span": "llm", "ms": 812.4, "ok": true, "game": "ABCD", "round_type": "survival", ...}
+
+Histograms are per process: on Modal each container only sees its own spans, so the
+JSON lines are the complete record.
+
+Stdlib only - this module is shipped next to prompts.py in the Modal image.
+"""
+
+import contextlib
+import contextvars
+import json
+import threading
+import time
+
+# Histogram bucket upper bounds in milliseconds (the last bucket is open-ended)
+BUCKETS_MS = (5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000, 30000, 60000, 120000)
+
+_tags: contextvars.ContextVar[dict] = contextvars.ContextVar("telemetry_tags", default={})
+_lock = threading.Lock()
+_histograms: dict[tuple[str, str], dict] = {}
+_json_lines = False
+
+
+def configure(json_lines: bool = False):
+    """Turn JSON-line span output on or off."""
+    global _json_lines
+    _json_lines = json_lines
+
+
+def current_tags() -> dict:
+    return _tags.get()
+
+
+def set_tags(**tags):
+    """Add tags to the current context (and every task started from it from now on)."""
+    _tags.set({**_tags.get(), **{k: v for k, v in tags.items() if v is not None}})
+
+
+@contextlib.contextmanager
+def tags(**tags):
+    """Add tags for the duration of a block."""
+    token = _tags.set({**_tags.get(), **{k: v for k, v in tags.items() if v is not None}})
+    try:
+        yield
+    finally:
+        _tags.reset(token)
+
+
+@contextlib.contextmanager
+def span(name: str, **extra):
+    """Time a block. Exceptions (including cancellation) are recorded as ok=false and re-raised.
+
+    The yielded dict can be filled with extra fields while the block runs.
+    """
+    fields = dict(extra)
+    start = time.perf_counter()
+    ok = True
+    try:
+        yield fields
+    except BaseException:
+        ok = False
+        raise
+    finally:
+        record(name, time.perf_counter() - start, ok=ok, **fields)
+
+
+def record(name: str, seconds: float, ok: bool = True, **extra):
+    """Record a duration measured elsewhere (e.g. spawn-to-start delay)."""
+    ms = seconds * 1000
+    context = _tags.get()
+    key = (name, context.get("round_type") or "-")
+    with _lock:
+        hist = _histograms.get(key)
+        if hist is None:
+            hist = _histograms[key] = {"count": 0, "errors": 0, "sum_ms": 0.0, "max_ms": 0.0,
+                                       "buckets": [0] * (len(BUCKETS_MS) + 1)}
+        hist["count"] += 1
+        hist["errors"] += 0 if ok else 1
+        hist["sum_ms"] += ms
+        hist["max_ms"] = max(hist["max_ms"], ms)
+        hist["buckets"][_bucket_index(ms)] += 1
+
+    if _json_lines:
+        line = {"span": name, "ms": round(ms, 1), "ok": ok, "ts": round(time.time(), 3), **context, **extra}
+        print(json.dumps(line, default=str), flush=True)
+
+
+def _bucket_index(ms: float) -> int:
+    for i, bound in enumerate(BUCKETS_MS):
+        if ms <= bound:
+            return i
+    return len(BUCKETS_MS)
+
+
+def _quantile(buckets: list[int], count: int, q: float) -> float | None:
+    """Upper bound of the bucket holding the q-th quantile (None if in the open bucket)."""
+    target = q * count
+    seen = 0
+    for i, n in enumerate(buckets):
+        seen += n
+        if seen >= target and n:
+            return BUCKETS_MS[i] if i < len(BUCKETS_MS) else None
+    return None
+
+
+def snapshot() -> dict:
+    """Histograms for every span name and round type seen by this process."""
+    with _lock:
+        hists = {key: {**h, "buckets": list(h["buckets"])} for key, h in _histograms.items()}
+    spans = {}
+    for (name, round_type), h in sorted(hists.items()):
+        spans.setdefault(name, {})[round_type] = {
+            "count": h["count"],
+            "errors": h["errors"],
+            "mean_ms": round(h["sum_ms"] / h["count"], 1),
+            "max_ms": round(h["max_ms"], 1),
+            "p50_ms": _quantile(h["buckets"], h["count"], 0.50),
+            "p95_ms": _quantile(h["buckets"], h["count"], 0.95),
+            "p99_ms": _quantile(h["buckets"], h["count"], 0.99),
+            "buckets": dict(zip([str(b) for b in BUCKETS_MS] + ["+Inf"], h["buckets"])),
+        }
+    return {"bucket_bounds_ms": list(BUCKETS_MS), "spans": spans}
+
+
+def reset():
+    with _lock:
+        _histograms.clear()
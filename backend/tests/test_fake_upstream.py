@@ -0,0 +1,142 @@
+"""
+Tests for the fake OpenRouter/FAL upstream used in offline benchmarks.
+
+These tests verify:
+1. Structured LLM responses validate against the backend's response schemas
+2. Malformed responses exercise both the local and the LLM repair paths
+3. The simulated FAL queue reports positions, progress, failures and cancellation
+"""
+
+import json
+import pytest
+import random
+import sys
+import os
+from typing import List
+
+from pydantic import BaseModel
+
+# Add repo root (fake_upstream) and backend (json_repair) to path for imports
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+sys.path.insert(0, os.path.dirname(BACKEND_DIR))
+
+from fake_upstream.content import chat_content, malform, player_ids_from_prompt
+from fake_upstream.fal_queue import FakeQueue
+from fake_upstream.profiles import load_profile, pick_error, sample_latency
+from fake_upstream.server import RecentDigests
+from json_repair import parse_json_tolerant
+
+
+class Entry(BaseModel):
+    player_id: str
+    rank: int
+    commentary: str
+
+
+class Ranked(BaseModel):
+    rankings: List[Entry]
+
+
+def structured_payload(model: type[BaseModel], prompt: str) -> dict:
+    return {
+        "messages": [{"role": "user", "content": prompt}],
+        "response_format": {
+            "type": "json_schema",
+            "json_schema": {"name": model.__name__, "schema": model.model_json_schema()},
+        },
+    }
+
+
+class TestChatContent:
+    """Test synthetic /chat/completions content."""
+
+    def test_fills_schema_with_prompt_player_ids(self):
+        prompt = "Players (player_id: name):\n- p_abc: Alice\n- p_def: Bob\n"
+        content = chat_content(structured_payload(Ranked, prompt), random.Random(1))
+        ranked = Ranked.model_validate_json(content)
+        assert [e.player_id for e in ranked.rankings] == ["p_abc", "p_def"]
+        assert [e.rank for e in ranked.rankings] == [1, 2]
+
+    def test_player_ids_from_sacrifice_prompt(self):
+        prompt = "- Alice (ID: a1) [THE MARTYR WHO FROZE]: brave\n- Bob (ID: b2): sly"
+        assert player_ids_from_prompt(prompt) == ["a1", "b2"]
+
+    def test_plain_prompt_gets_prose(self):
+        content = chat_content({"messages": [{"role": "user", "content": "scenario"}]}, random.Random(1))
+        assert content and not content.startswith("{")
+
+    def test_malformed_content_hits_both_repair_paths(self):
+        valid = json.dumps({"survived": True, "reason": "ran"})
+        outcomes = {parse_json_tolerant(malform(valid, random.Random(seed))) is not None for seed in range(20)}
+        assert outcomes == {True, False}
+
+
+class TestProfiles:
+    """Test latency sampling and error injection."""
+
+    def test_latency_is_seeded_and_capped(self):
+        spec = {"dist": "lognormal", "median": 5.0, "sigma": 2.0, "max": 6.0}
+        first = [sample_latency(spec, random.Random(7)) for _ in range(3)]
+        assert first == [sample_latency(spec, random.Random(7)) for _ in range(3)]
+        assert all(0.0 <= v <= 6.0 for v in first)
+
+    def test_error_rates(self):
+        rng = random.Random(3)
+        errors = [pick_error({"error_rate_429": 0.5, "error_rate_5xx": 0.5}, rng) for _ in range(50)]
+        assert None not in errors and 429 in errors
+        assert pick_error({}, rng) is None
+
+    def test_overrides_do_not_leak_into_presets(self):
+        profile = load_profile("fast", {"llm": {"error_rate_429": 1.0}})
+        assert profile["llm"]["error_rate_429"] == 1.0
+        assert "error_rate_429" not in load_profile("fast")["llm"]
+
+
+class TestFakeQueue:
+    """Test the clock-driven FAL queue simulation."""
+
+    def make_queue(self, **section):
+        self.now = 0.0
+        section.setdefault("processing", {"dist": "fixed", "seconds": 10.0})
+        return FakeQueue(section, random.Random(0), clock=lambda: self.now)
+
+    def test_jobs_wait_for_a_worker(self):
+        queue = self.make_queue(workers=1)
+        first = queue.submit("fal-ai/kling-video", {})
+        second = queue.submit("fal-ai/kling-video", {})
+        third = queue.submit("fal-ai/kling-video", {})
+        assert first["status"] == "IN_PROGRESS"
+        assert second["status"] == "IN_QUEUE" and second["queue_position"] == 0
+        assert third["queue_position"] == 1
+        self.now = 15.0
+        assert queue.status(first["request_id"])["status"] == "COMPLETED"
+        assert queue.status(second["request_id"])["status"] == "IN_PROGRESS"
+
+    def test_failures_and_cancellation(self):
+        queue = self.make_queue(workers=2, failure_rate=1.0)
+        failed = queue.submit("m", {})
+        cancelled = queue.submit("m", {})
+        assert queue.cancel(cancelled["request_id"]) is True
+        self.now = 20.0
+        assert queue.status(failed["request_id"])["status"] == "FAILED"
+        assert queue.cancel(failed["request_id"]) is False
+        assert queue.counts() == {"FAILED": 1, "CANCELLED": 1}
+
+
+class TestDuplicateTracking:
+    """Test the bounded memory of request bodies used to count duplicates."""
+
+    def test_repeats_are_seen_and_oldest_forgotten(self):
+        digests = RecentDigests(maxlen=2)
+        assert not digests.seen("a")
+        assert not digests.seen("b")
+        assert digests.seen("a")        # Refreshes "a", so "b" is now the oldest
+        assert not digests.seen("c")
+        assert len(digests) == 2
+        assert not digests.seen("b")    # Forgotten
+        assert digests.seen("c")
+
+
+if __name__ == '__main__':
+    pytest.main([__file__, '-v'])
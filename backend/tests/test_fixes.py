@@ -152,32 +152,67 @@ class TestGameStateGuards:
 
 
 class TestAsyncImageGeneration:
-    """Test that submit_trap uses async image generation."""
+    """Test that trap images are generated off the submit_trap request path."""
     
-    def test_submit_trap_uses_async_image_gen(self):
-        """Verify submit_trap uses generate_image_fal_async instead of sync version."""
+    def test_submit_trap_spawns_image_worker(self):
+        """Verify submit_trap records the text and spawns the image instead of awaiting FAL."""
         app_path = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'app.py')
         with open(app_path, 'r') as f:
             content = f.read()
         
         submit_trap_idx = content.find('async def api_submit_trap')
-        next_func_idx = content.find('async def ', submit_trap_idx + 1)
+        next_func_idx = content.find('@web_app', submit_trap_idx + 1)
         if next_func_idx == -1:
             next_func_idx = len(content)
         submit_trap_code = content[submit_trap_idx:next_func_idx]
         
-        # Should use async version
-        assert 'generate_image_fal_async' in submit_trap_code, \
-            "submit_trap should use generate_image_fal_async"
-        assert 'await generate_image_fal_async' in submit_trap_code, \
-            "submit_trap should await generate_image_fal_async"
+        assert 'generate_image_fal_async' not in submit_trap_code, \
+            "submit_trap should not wait for image generation"
+        assert 'generate_trap_image.spawn' in submit_trap_code, \
+            "submit_trap should spawn the trap image worker"
+
+    def test_trap_image_worker_uses_async_image_gen(self):
+        """Verify the trap image worker awaits generate_image_fal_async."""
+        app_path = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'app.py')
+        with open(app_path, 'r') as f:
+            content = f.read()
+        
+        task_idx = content.find('async def generate_trap_image_task')
+        next_func_idx = content.find('\nasync def ', task_idx + 1)
+        task_code = content[task_idx:next_func_idx]
+        
+        assert 'await generate_image_fal_async' in task_code, \
+            "generate_trap_image_task should await generate_image_fal_async"
+
+    def test_coop_fill_in_pass_runs_when_everyone_submits(self):
+        """Verify failed speculative coop images are redrawn on the normal all-submitted path."""
+        app_path = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'app.py')
+        with open(app_path, 'r') as f:
+            content = f.read()
+
+        submit_idx = content.find('async def api_submit_strategy')
+        submit_code = content[submit_idx:content.find('@web_app', submit_idx + 1)]
+        assert 'generate_coop_strategy_images.spawn(code, side_effects["round_idx"], True)' in submit_code, \
+            "submit_strategy should spawn the coop fill-in pass once everyone has submitted"
+
+    def test_coop_fill_in_pass_waits_for_speculative_images(self):
+        """Verify no coop fill-in spawn (timer or all-submitted) redraws images still in flight."""
+        import re
+        app_path = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'app.py')
+        with open(app_path, 'r') as f:
+            content = f.read()
+
+        spawns = re.findall(r'generate_coop_strategy_images\.spawn\(([^)]*)\)', content)
+        assert len(spawns) >= 4
+        for args in spawns:
+            assert args.endswith(', True'), f"fill-in spawn ({args}) should wait for speculative images"
 
 
 class TestAsyncScenarioGeneration:
-    """Test that scenario generation uses asyncio.to_thread."""
+    """Test that scenario generation awaits the async pooled path."""
     
-    def test_start_game_uses_to_thread(self):
-        """Verify start_game uses asyncio.to_thread for scenario generation."""
+    def test_start_game_awaits_async_scenario(self):
+        """Verify start_game awaits generate_scenario_llm_async instead of a worker thread."""
         app_path = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'app.py')
         with open(app_path, 'r') as f:
             content = f.read()
@@ -188,12 +223,13 @@ class TestAsyncScenarioGeneration:
             next_func_idx = len(content)
         start_game_code = content[start_game_idx:next_func_idx]
         
-        # Should use asyncio.to_thread for sync scenario generation
-        assert 'asyncio.to_thread' in start_game_code, \
-            "start_game should use asyncio.to_thread for scenario generation"
+        assert 'await generate_scenario_llm_async' in start_game_code, \
+            "start_game should await generate_scenario_llm_async"
+        assert 'asyncio.to_thread' not in start_game_code, \
+            "start_game should not block a threadpool worker on the LLM"
     
-    def test_next_round_uses_to_thread(self):
-        """Verify next_round uses asyncio.to_thread for scenario generation."""
+    def test_next_round_awaits_async_scenario(self):
+        """Verify next_round awaits generate_scenario_llm_async instead of a worker thread."""
         app_path = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'app.py')
         with open(app_path, 'r') as f:
             content = f.read()
@@ -204,9 +240,41 @@ class TestAsyncScenarioGeneration:
             next_func_idx = len(content)
         next_round_code = content[next_round_idx:next_func_idx]
         
-        # Should use asyncio.to_thread for sync scenario generation
-        assert 'asyncio.to_thread' in next_round_code, \
-            "next_round should use asyncio.to_thread for scenario generation"
+        assert 'await generate_scenario_llm_async' in next_round_code, \
+            "next_round should await generate_scenario_llm_async"
+        assert 'asyncio.to_thread' not in next_round_code, \
+            "next_round should not block a threadpool worker on the LLM"
+
+    def test_no_sync_llm_clients(self):
+        """Verify the per-call sync openai/requests clients are gone."""
+        app_path = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'app.py')
+        with open(app_path, 'r') as f:
+            content = f.read()
+
+        assert 'def get_http_client' in content, "Pooled async client getter should exist"
+        assert 'openai.OpenAI' not in content, "Sync openai client should not be used"
+        assert 'requests.post' not in content, "Sync requests should not be used"
+
+    def test_client_of_closed_loop_is_closed(self):
+        """Verify a client left behind by a closed event loop gets its pool closed."""
+        pytest.importorskip("modal")
+        os.environ.setdefault("SURVAIVE_STATE_BACKEND", "memory")
+        import asyncio
+        import app
+
+        async def get_client():
+            return app.get_http_client()
+
+        async def replace_client():
+            client = app.get_http_client()
+            await asyncio.sleep(0.05)
+            await app.close_http_client()
+            return client
+
+        stale = asyncio.run(get_client())
+        fresh = asyncio.run(replace_client())
+        assert fresh is not stale
+        assert stale.is_closed
 
 
 class TestPrewarmRetryLogic:
@@ -343,6 +411,322 @@ class TestUpdateGameWithRetry:
         assert 'update_game_with_retry' in submit_trap_code, \
             "submit_trap should use update_game_with_retry helper"
 
+    def test_actor_mode_owner_writes_without_verify(self, monkeypatch):
+        """Verify the owner applies writes once, on top of whole-document saves from workers."""
+        pytest.importorskip("modal")
+        os.environ.setdefault("SURVAIVE_STATE_BACKEND", "memory")
+        import app
+        from state_backends import MemoryStore
+
+        # The stores were opened at import time, possibly on the modal backend
+        monkeypatch.setattr(app, "games", MemoryStore("games"))
+        monkeypatch.setattr(app, "game_revisions", MemoryStore("revisions"))
+        monkeypatch.setattr(app, "game_shards", [MemoryStore(f"games-{i}") for i in range(app.GAME_SHARD_COUNT)])
+        monkeypatch.setattr(app, "WRITE_MODE", "actor")
+        monkeypatch.setattr(app, "_owned_shards", set(range(app.GAME_SHARD_COUNT)))
+
+        code = "ACTR"
+        app.create_game_record(app.GameState(id="g1", code=code))
+
+        def set_field(name, value):
+            def mutator(game):
+                setattr(game, name, value)
+                return True, value
+            return mutator
+
+        def no_verify(game):
+            raise AssertionError("actor mode should not verify")
+
+        async def no_sleep(delay):
+            raise AssertionError("actor mode should not sleep or back off")
+
+        async def run():
+            try:
+                await app.update_game_with_retry(code, set_field("video_theme", "noir"), no_verify)
+                # A worker's whole-document save goes through the owner too...
+                worker_copy = app.get_game(code)
+                worker_copy.videos_status = "generating"
+                app.save_game(worker_copy)
+                # ...so the actor's next write lands on top of it instead of undoing it
+                return await app.update_game_with_retry(code, set_field("winner_id", "p1"), no_verify)
+            finally:
+                app._game_actors.pop(code)._task.cancel()
+
+        monkeypatch.setattr(app.asyncio, "sleep", no_sleep)
+        assert asyncio.run(run()) == "p1"
+        stored = app.get_game(code)
+        assert (stored.video_theme, stored.videos_status, stored.winner_id) == ("noir", "generating", "p1")
+
+    def test_owner_http_errors_survive_pickling(self):
+        """Verify a mutator's HTTPException reaches a remote caller with its status."""
+        pytest.importorskip("modal")
+        os.environ.setdefault("SURVAIVE_STATE_BACKEND", "memory")
+        import pickle
+        import app
+
+        error = pickle.loads(pickle.dumps(app.OwnerHTTPError(409, "Wrong phase")))
+        assert (error.status_code, error.detail) == (409, "Wrong phase")
+
+
+class TestPipelinedJudgement:
+    """Test that judgement workers save each verdict instead of waiting for the whole table."""
+
+    def _task_code(self, name):
+        app_path = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'app.py')
+        with open(app_path, 'r') as f:
+            content = f.read()
+        task_idx = content.find(f'async def {name}(')
+        next_func_idx = content.find('\n\n\nasync def ', task_idx + 1)
+        return content[task_idx:next_func_idx]
+
+    def test_judgement_tasks_persist_per_player(self):
+        """Verify every judgement worker writes through persist_player_judgement."""
+        for name in ['run_round_judgement_task', 'run_last_stand_judgement_task', 'judge_single_player_task']:
+            task_code = self._task_code(name)
+            assert 'persist_player_judgement' in task_code, \
+                f"{name} should save each player's result as it completes"
+        for name in ['run_round_judgement_task', 'run_ranked_judgement_task', 'run_last_stand_judgement_task',
+                     'judge_single_player_task', 'run_revival_judgement_task', 'run_sacrifice_judgement_task']:
+            assert 'save_game(' not in self._task_code(name), \
+                f"{name} should not overwrite the whole game with save_game"
+
+    def test_verdict_published_before_image(self):
+        """Verify verdicts are saved before the result image is generated."""
+        task_code = self._task_code('judge_single_player_task')
+        assert 'generate_image_fal_async' not in task_code, \
+            "judge_single_player should hand the image to render_result_image"
+        assert task_code.find('persist_player_judgement') < task_code.find('render_result_image'), \
+            "judge_single_player should save the verdict before rendering the image"
+
+        revival_code = self._task_code('run_revival_judgement_task')
+        assert revival_code.find('update_game_with_retry') < revival_code.find('generate_image_fal_async'), \
+            "run_revival_judgement should publish the verdict before rendering the image"
+
+    def test_persist_only_applies_pending_players(self):
+        """Verify a replayed verdict can't award points twice."""
+        persist_code = self._task_code('persist_player_judgement')
+        assert 'if not player.judgement_pending' in persist_code
+        assert 'update_game_with_retry' in persist_code
+
+    def test_sacrifice_verdict_applied_atomically(self):
+        """Verify the sacrifice verdict lands on the current document, not the pre-LLM read."""
+        task_code = self._task_code('run_sacrifice_judgement_task')
+        assert 'update_game_with_retry' in task_code
+        assert task_code.find('asyncio.gather') < task_code.find('def mutator'), \
+            "images should be rendered before the verdict is applied in one write"
+
+    def test_last_stand_judged_on_submission(self):
+        """Verify last_stand strategies go through early judgement with the harsh judge."""
+        app_path = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'app.py')
+        with open(app_path, 'r') as f:
+            content = f.read()
+        assert 'EARLY_JUDGEMENT_ROUND_TYPES = ["survival", "blind_architect", "last_stand"]' in content
+        task_code = self._task_code('judge_single_player_task')
+        assert 'judge_strategy_harsh_async' in task_code and 'finish_last_stand_judgement' in task_code
+
+    def test_coop_judgement_reuses_speculative_verdict(self):
+        """Verify run_coop_judgement only calls the LLM when no matching prejudgement exists."""
+        task_code = self._task_code('run_coop_judgement_task')
+        assert 'coop_prejudgements.get' in task_code
+        assert 'prejudged["strategy"] == winning_strategy' in task_code
+
+    def test_ranked_prompt_names_player_ids(self, monkeypatch):
+        """Verify the ranking prompt carries the IDs the rankings are validated against."""
+        pytest.importorskip("modal")
+        os.environ.setdefault("SURVAIVE_STATE_BACKEND", "memory")
+        import app
+
+        prompts_sent = []
+
+        async def fake_completion(use_case, prompt, **kwargs):
+            prompts_sent.append(prompt)
+            raise RuntimeError("no LLM in tests")
+
+        monkeypatch.setattr(app, "chat_completion_async", fake_completion)
+        strategies = [{"player_id": "p-abc", "name": "Ann", "strategy": "run"},
+                      {"player_id": "p-def", "name": "Bo", "strategy": "hide"}]
+        asyncio.run(app.rank_all_strategies_llm_async("zombies", strategies))
+        assert "(ID: p-abc)" in prompts_sent[0] and "(ID: p-def)" in prompts_sent[0]
+
+    def test_coop_verdict_keeps_images_drawn_meanwhile(self):
+        """Verify the coop verdict reads strategy_images from the document it writes."""
+        task_code = self._task_code('run_coop_judgement_task')
+        task_code = task_code[:task_code.find('\n@web_app')]
+        mutator_code = task_code[task_code.find('def mutator'):task_code.find('def verify')]
+        assert 'strategy_images.get(winning_pid)' in mutator_code
+        assert 'update_game_with_retry' in task_code and 'save_game(' not in task_code
+
+    def test_coop_prejudge_never_stores_fallback_verdict(self):
+        """Verify a failed speculative judgement isn't reused as the team verdict."""
+        task_code = self._task_code('prejudge_coop_strategy_task')
+        assert task_code.find('prompts.FALLBACK_STRATEGY_JUDGEMENT') < task_code.find('coop_prejudgements['), \
+            "prejudge_coop_strategy should skip the fallback verdict before saving"
+
+    def test_stale_judgement_claim_gets_fallback_verdict(self):
+        """Verify a claim whose worker died is settled instead of freezing the round."""
+        pytest.importorskip("modal")
+        os.environ.setdefault("SURVAIVE_STATE_BACKEND", "memory")
+        import time
+        import app
+
+        game = app.GameState(id="g", code="STAL", status="playing", current_round_idx=0)
+        game.rounds.append(app.Round(number=1, type="survival", status="judgement"))
+        for pid in ("dead", "live"):
+            game.players[pid] = app.Player(id=pid, name=pid, in_lobby=True, strategy="run")
+            app.claim_player(game.players[pid])
+        game.players["dead"].judgement_claimed_at = time.time() - 3600
+
+        assert app.expire_stale_judgement_claims(game, game.rounds[0]) == ["dead"]
+        dead = game.players["dead"]
+        assert not dead.judgement_pending and not dead.is_alive and dead.death_reason
+        assert game.players["live"].judgement_pending, "a fresh claim must be left to its worker"
+
+        app_source = open(app.__file__).read()
+        start = app_source.find('# FALLBACK: Detect stuck judgement phase')
+        fallback_code = app_source[start:app_source.find('\n        elif ', app_source.find('elif ', start) + 1)]
+        assert 'expire_stale_judgement_claims' in fallback_code
+        assert 'finish_last_stand_judgement' in fallback_code and 'finish_standard_judgement' in fallback_code
+
+
+class TestSpawnRegistry:
+    """Test that round-level workers are spawned at most once per round."""
+
+    def _read_app(self):
+        app_path = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'app.py')
+        with open(app_path, 'r') as f:
+            return f.read()
+
+    def test_spawn_reserves_key_atomically(self):
+        """Verify WorkerHandle.spawn reserves its key with put(skip_if_exists=True)."""
+        content = self._read_app()
+        handle_idx = content.find('class WorkerHandle')
+        handle_code = content[handle_idx:content.find('\ndef ', handle_idx)]
+        assert 'spawned_calls.put(key' in handle_code and 'skip_if_exists=True' in handle_code
+        assert 'call.object_id' in handle_code, "spawn should record the Modal call ID"
+
+    def test_round_workers_are_deduped(self):
+        """Verify the workers that get spawned from several code paths are deduped."""
+        content = self._read_app()
+        for name in ['run_round_judgement', 'run_coop_judgement', 'run_revival_judgement']:
+            assert f'{name} = WorkerHandle("{name}", JudgementWorker, {name}_task, dedup_args=2' in content
+        assert 'prewarm_player_videos_task, dedup_args=1)' in content
+        assert 'prewarm_player_videos.release(code)' in content, "video retry must be allowed to respawn"
+
+    def test_sacrifice_prerender_never_resets_images(self):
+        """Verify a duplicate or late prerender can't wipe or recreate the prerender entry."""
+        content = self._read_app()
+        assert 'prerender_sacrifice_outcomes_task, dedup_args=2' in content
+        task_idx = content.find('async def prerender_sacrifice_outcomes_task')
+        task_code = content[task_idx:content.find('\n\n\nasync def ', task_idx)]
+        assert 'current_round.status != "sacrifice_submission"' in task_code
+        assert 'skip_if_exists=True' in task_code
+
+
+class TestStaleWorkCancellation:
+    """Test that background work for a finished round is cancelled."""
+
+    def _read_app(self):
+        app_path = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'app.py')
+        with open(app_path, 'r') as f:
+            return f.read()
+
+    def test_next_round_cancels_previous_round_calls(self):
+        """Verify api_next_round cancels the calls tracked for the round it leaves."""
+        content = self._read_app()
+        next_round_idx = content.find('async def api_next_round')
+        next_round_code = content[next_round_idx:content.find('@web_app', next_round_idx)]
+        assert next_round_code.count('await cancel_round_calls_async(code, previous_idx)') == 2, \
+            "both the next-round and game-finished paths should cancel stale work off the event loop"
+
+    def test_local_calls_cancelled_from_worker_thread(self):
+        """Verify cancelling a local call from the to_thread path cancels the task on its loop."""
+        pytest.importorskip("modal")
+        os.environ.setdefault("SURVAIVE_STATE_BACKEND", "memory")
+        import app
+
+        async def run():
+            task = asyncio.get_running_loop().create_task(asyncio.sleep(60))
+            app._local_calls["local-test"] = task
+            assert await asyncio.to_thread(app.cancel_call, "local-test")
+            try:
+                await task
+            except asyncio.CancelledError:
+                return True
+            return False
+
+        assert asyncio.run(run())
+
+    def test_round_scoped_workers_are_tracked(self):
+        """Verify per-player round workers record their calls for cancellation."""
+        content = self._read_app()
+        for name in ['generate_coop_strategy_image', 'prejudge_coop_strategy', 'generate_trap_image']:
+            handle_idx = content.find(f'{name} = WorkerHandle(')
+            assert 'round_arg=1' in content[handle_idx:content.find('\n', handle_idx)]
+        assert 'judge_single_player.spawn(code, player_id, side_effects["round_idx"])' in content
+
+    def test_video_poll_cancels_fal_request(self):
+        """Verify abandoned video polls cancel their FAL queue request."""
+        content = self._read_app()
+        poll_idx = content.find('async def poll_video_status_async')
+        poll_code = content[poll_idx:content.find('\nasync def ', poll_idx + 1)]
+        assert 'asyncio.CancelledError' in poll_code
+        assert 'cancel_video_request_async' in poll_code
+
+
+class TestCompactGameStorage:
+    """Test the compact game-state storage encoding."""
+
+    def _read_app(self):
+        app_path = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'app.py')
+        with open(app_path, 'r') as f:
+            return f.read()
+
+    def test_save_game_uses_compact_encoding(self):
+        """Verify save_game stores sparse JSON bytes instead of a model_dump() dict."""
+        content = self._read_app()
+
+        save_idx = content.find('def write_game')
+        save_code = content[save_idx:content.find('\n\n', save_idx)]
+        assert 'encode_game(game)' in save_code, "write_game should use encode_game"
+        assert 'exclude_defaults=True' in content, "encode_game should drop default-valued fields"
+
+    def test_round_plan_survives_config_change(self):
+        """Verify a stored game keeps its round plan when config.yaml changes before it is read."""
+        pytest.importorskip("modal")
+        os.environ.setdefault("SURVAIVE_STATE_BACKEND", "memory")
+        import app
+
+        game = app.GameState(id="g1", code="ABCD")
+        planned = list(game.round_config)
+        data = app.encode_game(game)
+
+        original = app.CONFIG["rounds"]["config"]
+        app.CONFIG["rounds"]["config"] = ["survival"]
+        try:
+            decoded = app.decode_game(data)
+        finally:
+            app.CONFIG["rounds"]["config"] = original
+        assert decoded.round_config == planned
+        assert decoded.max_rounds == len(planned)
+
+    def test_revision_stamped_before_document(self):
+        """Verify new and updated games both write the revision stamp before the document."""
+        content = self._read_app()
+        for name in ('def write_game', 'def create_game_record'):
+            start = content.find(name)
+            body = content[start:content.find('\ndef ', start + 1)]
+            assert body.find('game_revisions') < body.find('encode_game(game)'), \
+                f"{name} should stamp the revision before writing the document"
+
+    def test_get_game_reads_legacy_dicts(self):
+        """Verify games stored in the old dict format still load."""
+        content = self._read_app()
+
+        decode_idx = content.find('def decode_game')
+        decode_code = content[decode_idx:content.find('\ndef ', decode_idx + 1)]
+        assert 'isinstance(data, dict)' in decode_code, "decode_game should accept legacy dicts"
+        assert 'model_validate_json' in decode_code, "decode_game should parse JSON bytes directly"
+
 
 if __name__ == '__main__':
     pytest.main([__file__, '-v'])
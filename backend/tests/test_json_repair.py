@@ -0,0 +1,77 @@
+"""
+Tests for the local tolerant JSON parser used on LLM responses.
+
+These tests verify:
+1. JSON is extracted from markdown code fences and surrounding prose
+2. Control characters, trailing commas and unescaped quotes are repaired locally
+3. Unrecoverable responses return None so callers can fall back to LLM repair
+"""
+
+import pytest
+import sys
+import os
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from json_repair import extract_json, repair_json, parse_json_tolerant
+
+
+class TestExtractJson:
+    """Test pulling the JSON object out of an LLM response."""
+
+    def test_extracts_from_code_fence(self):
+        content = 'Here you go:\n```json\n{"survived": true}\n```\nGood luck!'
+        assert extract_json(content) == '{"survived": true}'
+
+    def test_extracts_from_prose(self):
+        content = 'Verdict: {"survived": false, "reason": "ouch"} -- end'
+        assert extract_json(content) == '{"survived": false, "reason": "ouch"}'
+
+    def test_returns_none_without_object(self):
+        assert extract_json("no json here") is None
+        assert extract_json("") is None
+
+
+class TestRepairJson:
+    """Test local repair of common LLM JSON mistakes."""
+
+    def test_escapes_control_characters(self):
+        repaired = repair_json('{"audio": "line one\nline two\tend"}')
+        assert repaired == '{"audio": "line one\\nline two\\tend"}'
+
+    def test_drops_trailing_commas(self):
+        assert repair_json('{"a": [1, 2, ], "b": 3,}') == '{"a": [1, 2 ], "b": 3}'
+
+    def test_escapes_inner_quotes(self):
+        repaired = repair_json('{"audio": "They call it "THE PIT" for a reason", "sfx": "boom"}')
+        assert repaired == '{"audio": "They call it \\"THE PIT\\" for a reason", "sfx": "boom"}'
+
+    def test_leaves_valid_json_untouched(self):
+        valid = '{"a": "x, y", "b": [true, null, -1], "c": {"d": "e"}}'
+        assert repair_json(valid) == valid
+
+
+class TestParseJsonTolerant:
+    """Test the full local parse path."""
+
+    def test_parses_messy_judgement(self):
+        content = '```json\n{"survived": true, "reason": "She yelled "RUN!" and ran,\nfast", "visual_prompt": "a sprint",}\n```'
+        result = parse_json_tolerant(content)
+        assert result == {
+            "survived": True,
+            "reason": 'She yelled "RUN!" and ran,\nfast',
+            "visual_prompt": "a sprint",
+        }
+
+    def test_inner_quote_followed_by_comma(self):
+        result = parse_json_tolerant('{"audio": "He said "hi", then left", "x": true}')
+        assert result == {"audio": 'He said "hi", then left', "x": True}
+
+    def test_unrecoverable_returns_none(self):
+        assert parse_json_tolerant('{"survived": true, "reason": ') is None
+        assert parse_json_tolerant("I refuse to answer in JSON") is None
+
+
+if __name__ == '__main__':
+    pytest.main([__file__, '-v'])
@@ -0,0 +1,130 @@
+"""
+Tests for the spend meters module.
+
+These tests verify:
+1. LLM cost comes from the per-model, per-million-token price table
+2. Counters accumulate per round type, kind and use case
+3. Per-container meters merge into per-round-type and game totals
+"""
+
+import pytest
+import sys
+import os
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import spend
+
+
+class TestPricing:
+    """Test LLM cost calculation."""
+
+    def test_llm_usd_per_million_tokens(self):
+        prices = {"model-a": {"prompt": 1.0, "completion": 4.0}}
+        assert spend.llm_usd(prices, "model-a", 500_000, 250_000) == pytest.approx(1.5)
+
+    def test_unpriced_model_is_free(self):
+        assert spend.llm_usd({}, "unknown", 1000, 1000) == 0
+
+
+class TestMeters:
+    """Test accumulating and summarizing meters."""
+
+    def test_add_accumulates_per_use_case(self):
+        meters = {}
+        spend.add(meters, "survival", "images", "result_image", images=1, usd=0.025)
+        spend.add(meters, "survival", "images", "result_image", images=1, usd=0.025)
+        spend.add(meters, None, "images", "character_image", images=1, usd=0.025)
+        assert meters["survival"]["images"]["result_image"] == {"images": 2, "usd": 0.05}
+        assert meters["-"]["images"]["character_image"]["images"] == 1
+
+    def test_summarize_merges_containers(self):
+        container_a, container_b = {}, {}
+        spend.add(container_a, "ranked", "llm", "ranked_judgement",
+                  llm_calls=1, prompt_tokens=1000, completion_tokens=200, usd=0.001)
+        spend.add(container_b, "ranked", "llm", "ranked_judgement",
+                  llm_calls=1, prompt_tokens=800, completion_tokens=100, usd=0.001)
+        spend.add(container_b, "ranked", "images", "result_image", images=4, usd=0.1)
+        spend.add(container_b, None, "video", "player_video", videos=2, video_seconds=20, usd=2.8)
+
+        summary = spend.summarize([container_a, container_b])
+        ranked = summary["round_types"]["ranked"]
+        assert ranked["llm"]["ranked_judgement"]["prompt_tokens"] == 1800
+        assert ranked["totals"] == {"llm_calls": 2, "prompt_tokens": 1800, "completion_tokens": 300,
+                                    "usd": 0.102, "images": 4}
+        assert summary["totals"]["video_seconds"] == 20
+        assert summary["totals"]["usd"] == pytest.approx(2.902)
+
+    def test_merge_copies_and_accumulates(self):
+        meters = {}
+        spend.add(meters, "survival", "images", "result_image", images=1, usd=0.025)
+        copy = spend.merge({}, meters)
+        spend.merge(copy, meters)
+        assert copy["survival"]["images"]["result_image"]["images"] == 2
+        assert meters["survival"]["images"]["result_image"]["images"] == 1
+
+    def test_summarize_empty(self):
+        assert spend.summarize([]) == {"totals": {}, "round_types": {}}
+
+
+class TestSpendPublishing:
+    """Test how app.py buffers and publishes a container's meters."""
+
+    def test_record_buffers_and_flush_publishes_to_own_slot(self, monkeypatch):
+        pytest.importorskip("modal")
+        os.environ.setdefault("SURVAIVE_STATE_BACKEND", "memory")
+        import app
+        import telemetry
+        from state_backends import MemoryStore
+
+        store = MemoryStore("spend")
+        other = {"source": "other-container", "meters": {"-": {"images": {"character_image": {"images": 1, "usd": 0.025}}}}}
+        store["SPND:0"] = other
+        monkeypatch.setattr(app, "game_spend", store)
+
+        with telemetry.tags(game="SPND", round_type="survival"):
+            app.meter_image("result_image")
+            app.meter_image("result_image")
+        assert "SPND:1" not in store, "record_spend should not write the store"
+        assert app.load_spend("SPND")["totals"]["images"] == 3, "load_spend should include unpublished meters"
+
+        app.flush_spend("SPND")
+        published = store["SPND:1"]
+        assert published["source"] == app.SPEND_SOURCE
+        assert published["meters"]["survival"]["images"]["result_image"]["images"] == 2
+        assert store["SPND:0"] == other, "a flush must not rewrite another container's slot"
+
+        with telemetry.tags(game="SPND", round_type="survival"):
+            app.meter_image("result_image")
+        app.flush_spend("SPND")
+        assert store["SPND:1"]["meters"]["survival"]["images"]["result_image"]["images"] == 3
+        assert "SPND:2" not in store
+        assert app.load_spend("SPND")["containers"] == 2
+
+        app.forget_spend("SPND")
+        assert "SPND:0" not in store and "SPND:1" not in store
+        assert app.load_spend("SPND")["containers"] == 0
+
+    def test_evicted_meters_continue_stored_slot(self, monkeypatch):
+        pytest.importorskip("modal")
+        os.environ.setdefault("SURVAIVE_STATE_BACKEND", "memory")
+        import app
+        import telemetry
+        from state_backends import MemoryStore
+
+        store = MemoryStore("spend")
+        store["EVCT:0"] = {"source": app.SPEND_SOURCE, "meters": {"survival": {"images": {"result_image": {"images": 4, "usd": 0.1}}}}}
+        monkeypatch.setattr(app, "game_spend", store)
+
+        with telemetry.tags(game="EVCT", round_type="survival"):
+            app.meter_image("result_image")
+        assert app.load_spend("EVCT")["totals"]["images"] == 5
+        app.flush_spend("EVCT")
+        assert store["EVCT:0"]["meters"]["survival"]["images"]["result_image"]["images"] == 5
+        assert "EVCT:1" not in store
+        app.forget_spend("EVCT")
+
+
+if __name__ == '__main__':
+    pytest.main([__file__, '-v'])
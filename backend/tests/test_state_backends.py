@@ -0,0 +1,83 @@
+"""
+Tests for the local game-state backends.
+
+These tests verify:
+1. Memory and SQLite stores follow the modal.Dict semantics app.py relies on
+2. put(skip_if_exists=True) only reserves a key once (game code allocation)
+3. Values are copied on read, like modal.Dict's pickling
+"""
+
+import pytest
+import sys
+import os
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from state_backends import MemoryStore, SQLiteStore
+
+
+@pytest.fixture(params=["memory", "sqlite"])
+def store(request, tmp_path):
+    if request.param == "memory":
+        return MemoryStore("test")
+    return SQLiteStore("test", path=str(tmp_path / "state.db"))
+
+
+class TestStoreSemantics:
+    """Test the modal.Dict subset shared by every backend."""
+
+    def test_get_set_contains(self, store):
+        assert store.get("ABCD") is None
+        assert "ABCD" not in store
+        store["ABCD"] = b"game"
+        assert store.get("ABCD") == b"game"
+        assert store["ABCD"] == b"game"
+        assert "ABCD" in store
+        assert len(store) == 1
+
+    def test_missing_key_raises(self, store):
+        with pytest.raises(KeyError):
+            store["NOPE"]
+        with pytest.raises(KeyError):
+            store.pop("NOPE")
+
+    def test_pop_and_delete(self, store):
+        store["A"] = 1
+        store["B"] = 2
+        assert store.pop("A") == 1
+        del store["B"]
+        assert len(store) == 0
+
+    def test_put_skip_if_exists(self, store):
+        assert store.put("CODE", "first", skip_if_exists=True) is True
+        assert store.put("CODE", "second", skip_if_exists=True) is False
+        assert store["CODE"] == "first"
+
+    def test_items_and_values(self, store):
+        store["A"] = {"players": 1}
+        store["B"] = {"players": 2}
+        assert dict(store.items()) == {"A": {"players": 1}, "B": {"players": 2}}
+        assert sorted(v["players"] for v in store.values()) == [1, 2]
+
+    def test_reads_return_copies(self, store):
+        store["P"] = {"p1": 1.0}
+        value = store["P"]
+        value["p2"] = 2.0
+        assert store["P"] == {"p1": 1.0}
+
+
+class TestStoreIsolation:
+    """Test that named stores don't see each other's keys."""
+
+    def test_sqlite_stores_share_file_not_keys(self, tmp_path):
+        path = str(tmp_path / "state.db")
+        games = SQLiteStore("games", path=path)
+        presence = SQLiteStore("presence", path=path)
+        games["ABCD"] = "game"
+        assert "ABCD" not in presence
+        assert SQLiteStore("games", path=path)["ABCD"] == "game"
+
+
+if __name__ == '__main__':
+    pytest.main([__file__, '-v'])
@@ -0,0 +1,97 @@
+"""
+Tests for the telemetry spans module.
+
+These tests verify:
+1. Spans land in per-name, per-round-type histograms with error counts
+2. Tags are scoped per asyncio task (gather children don't leak into each other)
+3. JSON-line output carries the active tags
+"""
+
+import asyncio
+import json
+import pytest
+import sys
+import os
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import telemetry
+
+
+@pytest.fixture(autouse=True)
+def clean_telemetry():
+    telemetry.reset()
+    telemetry.configure(json_lines=False)
+    yield
+    telemetry.reset()
+    telemetry.configure(json_lines=False)
+
+
+class TestHistograms:
+    """Test span recording and the /api/metrics snapshot."""
+
+    def test_span_counts_and_errors(self):
+        with telemetry.tags(round_type="survival"):
+            with telemetry.span("llm"):
+                pass
+            with pytest.raises(ValueError):
+                with telemetry.span("llm"):
+                    raise ValueError("boom")
+        stats = telemetry.snapshot()["spans"]["llm"]["survival"]
+        assert stats["count"] == 2
+        assert stats["errors"] == 1
+
+    def test_round_types_kept_apart(self):
+        telemetry.record("fal_image", 0.2)
+        with telemetry.tags(round_type="ranked"):
+            telemetry.record("fal_image", 3.0)
+        spans = telemetry.snapshot()["spans"]["fal_image"]
+        assert spans["-"]["p50_ms"] == 250
+        assert spans["ranked"]["p50_ms"] == 5000
+
+    def test_quantiles_from_buckets(self):
+        for _ in range(99):
+            telemetry.record("state_read", 0.004)
+        telemetry.record("state_read", 200.0)  # Past the last bound
+        stats = telemetry.snapshot()["spans"]["state_read"]["-"]
+        assert stats["p50_ms"] == 5
+        assert stats["p99_ms"] == 5
+        assert stats["buckets"]["+Inf"] == 1
+        assert stats["max_ms"] == 200000.0
+
+
+class TestTags:
+    """Test context-scoped tags."""
+
+    def test_gather_children_have_own_tags(self):
+        seen = {}
+
+        async def child(pid):
+            telemetry.set_tags(player=pid)
+            await asyncio.sleep(0)
+            seen[pid] = telemetry.current_tags()["player"]
+
+        async def main():
+            telemetry.set_tags(game="ABCD")
+            await asyncio.gather(child("p1"), child("p2"))
+            return telemetry.current_tags()
+
+        parent_tags = asyncio.run(main())
+        assert seen == {"p1": "p1", "p2": "p2"}
+        assert parent_tags == {"game": "ABCD"}
+
+    def test_json_lines_include_tags(self, capsys):
+        telemetry.configure(json_lines=True)
+        with telemetry.tags(game="ABCD", player=None):
+            with telemetry.span("json_parse", label="judge") as span:
+                span["parsed"] = True
+        line = json.loads(capsys.readouterr().out.strip())
+        assert line["span"] == "json_parse"
+        assert line["game"] == "ABCD"
+        assert line["label"] == "judge" and line["parsed"] is True
+        assert "player" not in line
+
+
+if __name__ == '__main__':
+    pytest.main([__file__, '-v'])
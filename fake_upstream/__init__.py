@@ -0,0 +1,11 @@
+"""
+Local stand-ins for the OpenRouter and FAL APIs used by backend/app.py.
+
+Run with `python -m fake_upstream --profile realistic` and point the backend at it
+(see backend/local_server.py) to benchmark the game loop offline and reproducibly.
+The app itself is built by fake_upstream.server.create_app(profile).
+"""
+
+from fake_upstream.profiles import PROFILES, load_profile
+
+__all__ = ["PROFILES", "load_profile"]
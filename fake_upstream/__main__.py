@@ -0,0 +1,56 @@
+"""
+Run the fake upstream server.
+
+    python -m fake_upstream --profile realistic --port 9000 --seed 42
+    python -m fake_upstream --profile flaky --set llm.malformed_rate=0.5
+"""
+
+import argparse
+import json
+
+from fake_upstream.profiles import PROFILES, load_profile, merge
+
+
+def parse_override(text: str) -> dict:
+    """Turn "llm.latency.median=2.5" into {"llm": {"latency": {"median": 2.5}}}."""
+    path, _, raw = text.partition("=")
+    try:
+        value = json.loads(raw)
+    except json.JSONDecodeError:
+        value = raw
+    override: dict = {}
+    node = override
+    keys = path.split(".")
+    for key in keys[:-1]:
+        node = node.setdefault(key, {})
+    node[keys[-1]] = value
+    return override
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Fake OpenRouter/FAL upstream for offline benchmarks")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=9000)
+    parser.add_argument("--profile", choices=list(PROFILES), default="realistic")
+    parser.add_argument("--seed", type=int, help="Seed latency/failure sampling for reproducible runs")
+    parser.add_argument("--set", action="append", default=[], metavar="KEY=VALUE",
+                        help="Override a profile value, e.g. queue.workers=2 (repeatable)")
+    args = parser.parse_args()
+
+    overrides: dict = {}
+    for text in args.set:
+        merge(overrides, parse_override(text))
+    profile = load_profile(args.profile, overrides)
+
+    import uvicorn
+    from fake_upstream.server import create_app
+
+    print(f"FAKE UPSTREAM: profile={args.profile} seed={args.seed} on http://{args.host}:{args.port}", flush=True)
+    print(f"FAKE UPSTREAM: SURVAIVE_LLM_BASE_URL=http://{args.host}:{args.port}/llm "
+          f"SURVAIVE_FAL_BASE_URL=http://{args.host}:{args.port}/fal "
+          f"SURVAIVE_FAL_QUEUE_URL=http://{args.host}:{args.port}/queue", flush=True)
+    uvicorn.run(create_app(profile, seed=args.seed), host=args.host, port=args.port, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
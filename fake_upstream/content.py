@@ -0,0 +1,96 @@
+"""
+Synthetic LLM responses.
+
+The backend sends a JSON-schema response_format with every structured call, so the
+fake LLM answers by filling in that schema. Player IDs are lifted from the prompt so
+per-player results (ranked, sacrifice timeout, batched video scripts) line up with the
+real game. Calls without a schema (scenario generation) get a line of prose.
+"""
+
+import json
+import random
+import re
+
+_WORDS = (
+    "the survivor dives behind a burning cart as the horde closes in while a chainsaw "
+    "roars somewhere in the fog and the last flare fizzles out over the frozen lake"
+).split()
+
+# "- <id>: name" (video script batch), "(ID: <id>)" (sacrifice timeout, ranked)
+_ID_PATTERNS = [
+    re.compile(r"^- ([A-Za-z0-9_-]+): ", re.MULTILINE),
+    re.compile(r"\(ID: ([A-Za-z0-9_-]+)\)"),
+]
+_PLAYER_NUMBER = re.compile(r"^PLAYER (\d+) \(", re.MULTILINE)
+
+
+def sentence(rng: random.Random, words: int = 12) -> str:
+    start = rng.randrange(len(_WORDS))
+    picked = [_WORDS[(start + i) % len(_WORDS)] for i in range(words)]
+    return " ".join(picked).capitalize() + "."
+
+
+def player_ids_from_prompt(prompt: str) -> list[str]:
+    """Best-effort list of the player IDs a prompt asks about."""
+    for pattern in _ID_PATTERNS:
+        ids = pattern.findall(prompt)
+        if ids:
+            return list(dict.fromkeys(ids))
+    numbers = _PLAYER_NUMBER.findall(prompt)
+    return [f"id{n}" for n in numbers]
+
+
+def sample_from_schema(schema: dict, rng: random.Random, player_ids: list[str]) -> object:
+    """Build a value that validates against a pydantic-generated JSON schema."""
+    defs = schema.get("$defs", {})
+
+    def build(node: dict, field: str = "", index: int = 0):
+        if "$ref" in node:
+            return build(defs[node["$ref"].rsplit("/", 1)[-1]], field, index)
+        if "anyOf" in node:
+            return build(node["anyOf"][0], field, index)
+        kind = node.get("type")
+        if kind == "object":
+            return {
+                name: build(prop, name, index)
+                for name, prop in node.get("properties", {}).items()
+            }
+        if kind == "array":
+            count = len(player_ids) or 2
+            return [build(node.get("items", {}), field, i) for i in range(count)]
+        if kind == "boolean":
+            return rng.random() < 0.5
+        if kind == "integer":
+            # Only ranks are integers in the backend's schemas
+            return index + 1
+        if kind == "number":
+            return round(rng.random(), 3)
+        if field == "player_id":
+            return player_ids[index] if index < len(player_ids) else f"id{index + 1}"
+        if field == "audio_type":
+            return rng.choice(["dialogue", "narration"])
+        return sentence(rng)
+
+    return build(schema)
+
+
+def chat_content(payload: dict, rng: random.Random) -> str:
+    """Content for a /chat/completions request."""
+    prompt = " ".join(m.get("content", "") for m in payload.get("messages", []))
+    response_format = payload.get("response_format") or {}
+    schema = response_format.get("json_schema", {}).get("schema")
+    if schema is None:
+        return sentence(rng, words=40)
+    return json.dumps(sample_from_schema(schema, rng, player_ids_from_prompt(prompt)))
+
+
+def malform(content: str, rng: random.Random) -> str:
+    """Break a JSON response the way real models do.
+
+    "fenced" is recoverable by the backend's local repair; "truncated" is not and
+    forces the LLM repair round trip.
+    """
+    if rng.random() < 0.5:
+        fenced = re.sub(r"\}$", ",}", content)
+        return f"Here is the JSON:\n```json\n{fenced}\n```"
+    return content[: max(1, len(content) // 2)]
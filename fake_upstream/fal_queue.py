@@ -0,0 +1,72 @@
+"""
+Simulated FAL queue.
+
+Jobs are scheduled onto a fixed number of workers when submitted: each job starts
+when the earliest worker frees up and runs for a duration drawn from the profile.
+Status is derived from the clock on every poll, so there is no background loop.
+"""
+
+import heapq
+import random
+import time
+import uuid
+
+from fake_upstream.profiles import sample_latency
+
+
+class FakeQueue:
+    def __init__(self, section: dict, rng: random.Random, clock=time.monotonic):
+        self.section = section
+        self.rng = rng
+        self.clock = clock
+        self.jobs: dict[str, dict] = {}
+        # Time at which each worker next becomes free
+        self._workers = [0.0] * max(1, section.get("workers", 1))
+
+    def submit(self, model: str, payload: dict) -> dict:
+        now = self.clock()
+        free_at = heapq.heappop(self._workers)
+        start = max(now, free_at)
+        finish = start + sample_latency(self.section.get("processing"), self.rng)
+        heapq.heappush(self._workers, finish)
+
+        request_id = uuid.UUID(int=self.rng.getrandbits(128)).hex
+        self.jobs[request_id] = {
+            "model": model,
+            "payload": payload,
+            "start": start,
+            "finish": finish,
+            "failed": self.rng.random() < self.section.get("failure_rate", 0.0),
+            "cancelled": False,
+        }
+        return {"request_id": request_id, **self.status(request_id)}
+
+    def status(self, request_id: str) -> dict:
+        job = self.jobs[request_id]
+        now = self.clock()
+        if job["cancelled"]:
+            return {"status": "CANCELLED"}
+        if now < job["start"]:
+            ahead = sum(
+                1 for other in self.jobs.values()
+                if not other["cancelled"] and now < other["start"] < job["start"]
+            )
+            return {"status": "IN_QUEUE", "queue_position": ahead}
+        if now < job["finish"]:
+            return {"status": "IN_PROGRESS"}
+        return {"status": "FAILED" if job["failed"] else "COMPLETED"}
+
+    def cancel(self, request_id: str) -> bool:
+        """Cancel a job that hasn't finished. Its worker slot is not handed back."""
+        job = self.jobs[request_id]
+        if self.status(request_id)["status"] in ("COMPLETED", "FAILED"):
+            return False
+        job["cancelled"] = True
+        return True
+
+    def counts(self) -> dict:
+        counts: dict[str, int] = {}
+        for request_id in self.jobs:
+            status = self.status(request_id)["status"]
+            counts[status] = counts.get(status, 0) + 1
+        return counts
@@ -0,0 +1,115 @@
+"""
+Latency and failure profiles for the fake upstream servers.
+
+A profile is a plain dict with one section per endpoint family:
+
+    llm     - POST /llm/chat/completions
+    image   - POST /fal/<model>             (synchronous fal.run)
+    queue   - POST /queue/<model> + status/result/cancel (FAL queue, used for video)
+
+Every section has a "latency" spec and optional "error_rate_429" / "error_rate_5xx".
+The llm section adds "malformed_rate" (JSON the backend has to repair); the queue
+section adds "workers", "processing" (a latency spec for job run time) and
+"failure_rate" (jobs that end in FAILED).
+
+Latency specs:
+    {"dist": "fixed", "seconds": 0.5}
+    {"dist": "uniform", "min": 0.2, "max": 1.0}
+    {"dist": "lognormal", "median": 2.0, "sigma": 0.5, "max": 30.0}
+"""
+
+import copy
+import math
+import random
+
+PROFILES = {
+    # No latency, no failures - for functional smoke tests
+    "fast": {
+        "llm": {"latency": {"dist": "fixed", "seconds": 0.0}},
+        "image": {"latency": {"dist": "fixed", "seconds": 0.0}},
+        "queue": {
+            "latency": {"dist": "fixed", "seconds": 0.0},
+            "workers": 1000,
+            "processing": {"dist": "fixed", "seconds": 1.0},
+        },
+    },
+    # Roughly what production looks like on a good day
+    "realistic": {
+        "llm": {
+            "latency": {"dist": "lognormal", "median": 3.0, "sigma": 0.5, "max": 45.0},
+            "malformed_rate": 0.03,
+        },
+        "image": {"latency": {"dist": "lognormal", "median": 4.0, "sigma": 0.4, "max": 60.0}},
+        "queue": {
+            "latency": {"dist": "uniform", "min": 0.1, "max": 0.4},
+            "workers": 8,
+            "processing": {"dist": "lognormal", "median": 90.0, "sigma": 0.3, "max": 300.0},
+        },
+    },
+    # Rate limits, server errors and broken JSON - exercises every retry/repair path
+    "flaky": {
+        "llm": {
+            "latency": {"dist": "lognormal", "median": 4.0, "sigma": 0.8, "max": 60.0},
+            "error_rate_429": 0.05,
+            "error_rate_5xx": 0.05,
+            "malformed_rate": 0.15,
+        },
+        "image": {
+            "latency": {"dist": "lognormal", "median": 5.0, "sigma": 0.6, "max": 60.0},
+            "error_rate_429": 0.05,
+            "error_rate_5xx": 0.05,
+        },
+        "queue": {
+            "latency": {"dist": "uniform", "min": 0.1, "max": 1.0},
+            "error_rate_5xx": 0.02,
+            "workers": 4,
+            "processing": {"dist": "lognormal", "median": 120.0, "sigma": 0.4, "max": 400.0},
+            "failure_rate": 0.1,
+        },
+    },
+}
+
+
+def load_profile(name: str, overrides: dict | None = None) -> dict:
+    """Return a copy of the named profile with overrides deep-merged on top."""
+    if name not in PROFILES:
+        raise ValueError(f"Unknown profile {name!r} (choose from {', '.join(PROFILES)})")
+    profile = copy.deepcopy(PROFILES[name])
+    merge(profile, overrides or {})
+    return profile
+
+
+def merge(base: dict, overrides: dict):
+    """Deep-merge overrides into base in place."""
+    for key, value in overrides.items():
+        if isinstance(value, dict) and isinstance(base.get(key), dict):
+            merge(base[key], value)
+        else:
+            base[key] = value
+
+
+def sample_latency(spec: dict | None, rng: random.Random) -> float:
+    """Draw one delay in seconds from a latency spec."""
+    if not spec:
+        return 0.0
+    dist = spec.get("dist", "fixed")
+    if dist == "fixed":
+        value = spec.get("seconds", 0.0)
+    elif dist == "uniform":
+        value = rng.uniform(spec["min"], spec["max"])
+    elif dist == "lognormal":
+        value = rng.lognormvariate(math.log(spec["median"]), spec.get("sigma", 0.5))
+    else:
+        raise ValueError(f"Unknown latency distribution {dist!r}")
+    return max(0.0, min(value, spec.get("max", value)))
+
+
+def pick_error(section: dict, rng: random.Random) -> int | None:
+    """Return an HTTP status to inject for this request, or None to serve normally."""
+    roll = rng.random()
+    rate_429 = section.get("error_rate_429", 0.0)
+    if roll < rate_429:
+        return 429
+    if roll < rate_429 + section.get("error_rate_5xx", 0.0):
+        return rng.choice([500, 502, 503])
+    return None
@@ -0,0 +1,196 @@
+"""
+FastAPI app serving fake OpenRouter and FAL endpoints.
+
+Routes (base URLs to configure in the backend in brackets):
+
+    POST /llm/chat/completions                          [llm.base_url = <host>/llm]
+    POST /fal/{model}                                   [image_generation.fal_base_url = <host>/fal]
+    POST /queue/{model}                                 [image_generation.fal_queue_url = <host>/queue]
+    GET  /queue/{owner}/{app}/requests/{id}/status
+    GET  /queue/{owner}/{app}/requests/{id}
+    PUT  /queue/{owner}/{app}/requests/{id}/cancel
+    GET  /files/{name}                                  placeholder media for returned URLs
+    GET  /stats                                         request/error/duplicate counters
+    POST /stats/reset
+"""
+
+import asyncio
+import hashlib
+import random
+import time
+import uuid
+from collections import OrderedDict, defaultdict
+
+from fastapi import FastAPI, HTTPException, Request
+from fastapi.responses import JSONResponse, Response
+
+from fake_upstream.content import chat_content, malform
+from fake_upstream.fal_queue import FakeQueue
+from fake_upstream.profiles import pick_error, sample_latency
+
+# 1x1 transparent PNG
+_PNG = bytes.fromhex(
+    "89504e470d0a1a0a0000000d49484452000000010000000108060000001f15c489"
+    "0000000b49444154789c6360000200000500017a5eab3f0000000049454e44ae426082"
+)
+
+
+# Request-body digests remembered for duplicate counting; the oldest are forgotten first
+SEEN_BODIES_MAX = 100_000
+
+
+class RecentDigests:
+    """Bounded LRU of request-body digests, so a long load test can't grow it without limit."""
+
+    def __init__(self, maxlen: int = SEEN_BODIES_MAX):
+        self.maxlen = maxlen
+        self._digests: OrderedDict[str, None] = OrderedDict()
+
+    def seen(self, digest: str) -> bool:
+        """Record a digest; True if it is still remembered from an earlier request."""
+        if digest in self._digests:
+            self._digests.move_to_end(digest)
+            return True
+        self._digests[digest] = None
+        if len(self._digests) > self.maxlen:
+            self._digests.popitem(last=False)
+        return False
+
+    def clear(self):
+        self._digests.clear()
+
+    def __len__(self) -> int:
+        return len(self._digests)
+
+
+def usage(payload: dict, content: str) -> dict:
+    """OpenAI-style token usage, estimated at ~4 characters per token."""
+    prompt_chars = sum(len(m.get("content", "")) for m in payload.get("messages", []))
+    prompt_tokens = max(1, prompt_chars // 4)
+    completion_tokens = max(1, len(content) // 4)
+    return {
+        "prompt_tokens": prompt_tokens,
+        "completion_tokens": completion_tokens,
+        "total_tokens": prompt_tokens + completion_tokens,
+    }
+
+
+def create_app(profile: dict, seed: int | None = None) -> FastAPI:
+    """Build the fake upstream app for a profile (see profiles.py)."""
+    app = FastAPI(title="SurvAIve fake upstream")
+    rng = random.Random(seed)
+    fal_queue = FakeQueue(profile.get("queue", {}), rng)
+    stats = defaultdict(lambda: defaultdict(int))
+    seen_bodies = RecentDigests()
+
+    async def serve(endpoint: str, section: dict, request: Request) -> JSONResponse | None:
+        """Apply latency and error injection; return an error response or None."""
+        body = await request.body()
+        counters = stats[endpoint]
+        counters["requests"] += 1
+        # Identical bodies are retries or duplicated work (same prompt sent twice)
+        digest = hashlib.sha1(request.url.path.encode() + body).hexdigest()
+        if seen_bodies.seen(digest):
+            counters["duplicates"] += 1
+
+        await asyncio.sleep(sample_latency(section.get("latency"), rng))
+        status = pick_error(section, rng)
+        if status is None:
+            return None
+        counters[f"errors_{status}"] += 1
+        headers = {"Retry-After": "1"} if status == 429 else None
+        return JSONResponse({"detail": f"injected {status}"}, status_code=status, headers=headers)
+
+    def file_url(request: Request, suffix: str) -> str:
+        return f"{str(request.base_url).rstrip('/')}/files/{uuid.uuid4().hex}.{suffix}"
+
+    @app.post("/llm/chat/completions")
+    async def chat_completions(request: Request):
+        section = profile.get("llm", {})
+        error = await serve("llm", section, request)
+        if error is not None:
+            return error
+        payload = await request.json()
+        content = chat_content(payload, rng)
+        if payload.get("response_format") and rng.random() < section.get("malformed_rate", 0.0):
+            stats["llm"]["malformed"] += 1
+            content = malform(content, rng)
+        return {
+            "id": f"chatcmpl-{uuid.uuid4().hex[:12]}",
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": payload.get("model", "fake"),
+            "choices": [{
+                "index": 0,
+                "message": {"role": "assistant", "content": content},
+                "finish_reason": "stop",
+            }],
+            "usage": usage(payload, content),
+        }
+
+    @app.post("/fal/{model:path}")
+    async def fal_run(model: str, request: Request):
+        error = await serve("image", profile.get("image", {}), request)
+        if error is not None:
+            return error
+        return {
+            "images": [{"url": file_url(request, "png"), "content_type": "image/png"}],
+            "seed": rng.randrange(2**31),
+        }
+
+    @app.get("/queue/{owner}/{app_name}/requests/{request_id}/status")
+    async def queue_status(owner: str, app_name: str, request_id: str, request: Request):
+        error = await serve("queue_status", profile.get("queue", {}), request)
+        if error is not None:
+            return error
+        if request_id not in fal_queue.jobs:
+            raise HTTPException(status_code=404, detail="Request not found")
+        return {"request_id": request_id, **fal_queue.status(request_id)}
+
+    @app.get("/queue/{owner}/{app_name}/requests/{request_id}")
+    async def queue_result(owner: str, app_name: str, request_id: str, request: Request):
+        error = await serve("queue_result", profile.get("queue", {}), request)
+        if error is not None:
+            return error
+        if request_id not in fal_queue.jobs:
+            raise HTTPException(status_code=404, detail="Request not found")
+        if fal_queue.status(request_id)["status"] != "COMPLETED":
+            raise HTTPException(status_code=400, detail="Request is not completed")
+        return {"video": {"url": file_url(request, "mp4"), "content_type": "video/mp4"}}
+
+    @app.put("/queue/{owner}/{app_name}/requests/{request_id}/cancel")
+    async def queue_cancel(owner: str, app_name: str, request_id: str):
+        stats["queue_cancel"]["requests"] += 1
+        if request_id not in fal_queue.jobs:
+            raise HTTPException(status_code=404, detail="Request not found")
+        if not fal_queue.cancel(request_id):
+            return JSONResponse({"status": "ALREADY_COMPLETED"}, status_code=400)
+        return {"status": "CANCELLATION_REQUESTED"}
+
+    @app.post("/queue/{model:path}")
+    async def queue_submit(model: str, request: Request):
+        error = await serve("queue_submit", profile.get("queue", {}), request)
+        if error is not None:
+            return error
+        return fal_queue.submit(model, await request.json())
+
+    @app.get("/files/{name}")
+    async def files(name: str):
+        if name.endswith(".png"):
+            return Response(_PNG, media_type="image/png")
+        return Response(b"", media_type="video/mp4")
+
+    @app.get("/stats")
+    async def get_stats():
+        return {
+            "endpoints": {name: dict(counters) for name, counters in stats.items()},
+            "queue": fal_queue.counts(),
+        }
+
+    @app.post("/stats/reset")
+    async def reset_stats():
+        stats.clear()
+        seen_bodies.clear()
+        return {"ok": True}
+
+    return app
@@ -213,5 +213,10 @@ export const api = {
     // Get game configuration
     getConfig: async () => {
         return fetchJson(getUrl("config"));
+    },
+
+    // Full round history - finished rounds are archived out of the game state
+    getRoundHistory: async (code) => {
+        return fetchJson(`${getUrl("round_history")}?code=${code}`);
     }
 };
@@ -32,7 +32,8 @@ export function VotingView({ round, playerId, onVote }) {
         );
     }
 
-    const entries = Object.entries(round.trap_images || {});
+    // One card per proposal; images are rendered in the background and fill in as they land
+    const entries = Object.keys(round.trap_proposals || {}).map((pid) => [pid, (round.trap_images || {})[pid]]);
 
     return (
         <div style={{ width: '100%', maxWidth: '1000px' }}>
@@ -61,7 +62,24 @@ export function VotingView({ round, playerId, onVote }) {
                             position: 'relative'
                         }}
                     >
-                        <img src={url} alt="Trap" style={{ width: '100%', display: 'block' }} />
+                        {url ? (
+                            <img src={url} alt="Trap" style={{ width: '100%', display: 'block' }} />
+                        ) : (
+                            <div style={{
+                                aspectRatio: '4 / 3',
+                                display: 'flex',
+                                flexDirection: 'column',
+                                alignItems: 'center',
+                                justifyContent: 'center',
+                                gap: '1rem',
+                                background: 'rgba(255,255,255,0.05)',
+                                fontFamily: 'monospace',
+                                color: '#ccc'
+                            }}>
+                                <span className="loader"></span>
+                                RENDERING ENVIRONMENT...
+                            </div>
+                        )}
                         {pid === playerId && (
                             <div style={{ position: 'absolute', top: 5, right: 5, background: 'rgba(0,0,0,0.5)', padding: '4px', borderRadius: '4px', fontSize: '10px' }}>
                                 YOU
@@ -0,0 +1,364 @@
+"""
+Load generator: M concurrent games x N players, each played start to finish.
+
+Every simulated player polls get_game_state every 2 s (revalidating with the ETag, as
+the browser does) and acts on each new phase after a random think time: strategies,
+traps, votes, sacrifice volunteering/speeches and revival votes. The first player is
+the admin and starts the game, advances admin-gated phases and calls next_round.
+
+Reports per-endpoint p50/p95/p99 latency, update_game_with_retry retries (from
+/api/update_stats), round-transition latency (start_game/next_round until the new
+round is playable), judgement latency (last submission until results), the
+server's own stage spans from /api/metrics (LLM, FAL, state reads/writes, ...) and
+tokens, images, video seconds and USD per round type summed over the games'
+/api/spend reports.
+
+Run against a local server (backend/local_server.py + python -m fake_upstream) or a
+deployed app:
+
+    python simulate_load.py --base-url http://127.0.0.1:8000 --games 20 --players 6
+    python simulate_load.py --base-url https://<workspace>--survaive-fastapi-app.modal.run \\
+        --upstream-stats http://127.0.0.1:9000/stats
+
+Needs httpx (pip install httpx).
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import time
+from collections import defaultdict
+
+import httpx
+
+POLL_INTERVAL = 2.0
+
+# Round statuses where players have something to do
+ACTION_STATUSES = {
+    "strategy", "trap_creation", "trap_voting", "coop_voting",
+    "sacrifice_volunteer", "sacrifice_voting", "sacrifice_submission", "last_stand_revival",
+}
+
+STRATEGIES = [
+    "I climb onto the roof and wait for the flood to pass.",
+    "I build a decoy out of my jacket and sneak out the back.",
+    "I befriend the monster by sharing my sandwich.",
+    "I use the fire extinguisher to blind it and run.",
+]
+TRAPS = [
+    "The floor is lava and the ceiling is slowly descending.",
+    "A swarm of robotic bees guards the only exit.",
+    "Every door opens onto the same room, which is flooding.",
+]
+
+
+def percentile(values: list[float], pct: float) -> float | None:
+    """Nearest-rank percentile."""
+    if not values:
+        return None
+    ordered = sorted(values)
+    rank = max(1, int(round(pct / 100 * len(ordered))))
+    return ordered[min(rank, len(ordered)) - 1]
+
+
+class Metrics:
+    def __init__(self):
+        self.latencies = defaultdict(list)   # endpoint -> seconds
+        self.statuses = defaultdict(lambda: defaultdict(int))  # endpoint -> status -> count
+        self.round_transitions = []
+        self.judgements = []
+        self.games_finished = 0
+        self.games_failed = 0
+        self.codes = []
+
+    def record(self, endpoint: str, status: int, seconds: float):
+        self.latencies[endpoint].append(seconds)
+        self.statuses[endpoint][status] += 1
+
+
+class Client:
+    """Thin wrapper timing every API call."""
+
+    def __init__(self, http: httpx.AsyncClient, metrics: Metrics):
+        self.http = http
+        self.metrics = metrics
+
+    async def call(self, method: str, endpoint: str, params=None, body=None, headers=None):
+        start = time.perf_counter()
+        try:
+            response = await self.http.request(
+                method, f"/api/{endpoint}", params=params, json=body, headers=headers
+            )
+        except httpx.HTTPError as e:
+            self.metrics.record(endpoint, type(e).__name__, time.perf_counter() - start)
+            return None
+        self.metrics.record(endpoint, response.status_code, time.perf_counter() - start)
+        return response
+
+    async def post(self, endpoint: str, code: str, body: dict):
+        response = await self.call("POST", endpoint, params={"code": code}, body=body)
+        return response is not None and response.status_code < 400
+
+
+class Game:
+    """Shared per-game bookkeeping for latency measurements."""
+
+    def __init__(self, code: str, metrics: Metrics):
+        self.code = code
+        self.metrics = metrics
+        self.transition_started: float | None = None
+        self.last_submission: dict[int, float] = {}
+        self.judged_rounds: set[int] = set()
+        self.finished = asyncio.Event()
+
+    def start_transition(self):
+        self.transition_started = time.perf_counter()
+
+    def observe(self, state: dict):
+        """Called with every fresh state any player sees."""
+        if state["status"] == "finished":
+            self.finished.set()
+            return
+        idx = state["current_round_idx"]
+        if idx < 0 or state["status"] != "playing":
+            return
+        status = state["rounds"][idx]["status"]
+        if self.transition_started is not None and status in ACTION_STATUSES:
+            self.metrics.round_transitions.append(time.perf_counter() - self.transition_started)
+            self.transition_started = None
+        if status == "results" and idx not in self.judged_rounds and idx in self.last_submission:
+            self.judged_rounds.add(idx)
+            self.metrics.judgements.append(time.perf_counter() - self.last_submission[idx])
+
+
+class Bot:
+    def __init__(self, client: Client, game: Game, player_id: str, is_admin: bool, think: tuple[float, float]):
+        self.client = client
+        self.game = game
+        self.player_id = player_id
+        self.is_admin = is_admin
+        self.think = think
+        self.etag = None
+        self.state = None
+        self.handled: set[tuple[int, str]] = set()
+        self.actions: set[asyncio.Task] = set()
+
+    async def poll(self) -> dict | None:
+        headers = {"If-None-Match": self.etag} if self.etag else None
+        response = await self.client.call(
+            "GET", "get_game_state",
+            params={"code": self.game.code, "player_id": self.player_id}, headers=headers,
+        )
+        if response is None:
+            return self.state
+        if response.status_code == 200:
+            self.etag = response.headers.get("etag")
+            self.state = response.json()
+            self.game.observe(self.state)
+        return self.state
+
+    async def run(self):
+        await asyncio.sleep(random.uniform(0, POLL_INTERVAL))
+        while not self.game.finished.is_set():
+            state = await self.poll()
+            if state and state["status"] == "playing" and state["current_round_idx"] >= 0:
+                idx = state["current_round_idx"]
+                key = (idx, state["rounds"][idx]["status"])
+                if key not in self.handled:
+                    self.handled.add(key)
+                    task = asyncio.create_task(self.act(state, idx, key[1]))
+                    self.actions.add(task)
+                    task.add_done_callback(self.actions.discard)
+            await asyncio.sleep(POLL_INTERVAL)
+        for task in self.actions:
+            task.cancel()
+
+    async def submit(self, endpoint: str, body: dict, idx: int):
+        if await self.client.post(endpoint, self.game.code, body):
+            self.game.last_submission[idx] = time.perf_counter()
+
+    async def act(self, state: dict, idx: int, status: str):
+        await asyncio.sleep(random.uniform(*self.think))
+        players = state["players"]
+        me = players.get(self.player_id, {})
+        alive = me.get("is_alive", False)
+        others_alive = [pid for pid, p in players.items() if p["is_alive"] and pid != self.player_id]
+        current = state["rounds"][idx]
+
+        if status == "strategy" and alive:
+            await self.submit("submit_strategy", {"player_id": self.player_id, "strategy": random.choice(STRATEGIES)}, idx)
+        elif status == "trap_creation" and alive:
+            await self.submit("submit_trap", {"player_id": self.player_id, "trap_text": random.choice(TRAPS)}, idx)
+        elif status in ("trap_voting", "coop_voting") and alive and others_alive:
+            endpoint = "vote_trap" if status == "trap_voting" else "vote_coop"
+            await self.submit(endpoint, {"voter_id": self.player_id, "target_id": random.choice(others_alive)}, idx)
+        elif status == "sacrifice_volunteer":
+            if alive and random.random() < 0.5:
+                await self.client.post("volunteer_sacrifice", self.game.code, {"player_id": self.player_id})
+            if self.is_admin:
+                await asyncio.sleep(random.uniform(*self.think))
+                await self.client.post("advance_sacrifice_volunteer", self.game.code, {"player_id": self.player_id})
+        elif status == "sacrifice_voting" and alive:
+            state = await self.poll()
+            volunteers = [pid for pid in state["rounds"][idx].get("sacrifice_volunteers", {}) if pid != self.player_id]
+            if volunteers:
+                await self.submit("vote_sacrifice", {"voter_id": self.player_id, "target_id": random.choice(volunteers)}, idx)
+        elif status == "sacrifice_submission" and current.get("martyr_id") == self.player_id:
+            await self.submit("submit_sacrifice_speech", {"player_id": self.player_id, "speech": "Remember me as I was."}, idx)
+        elif status == "last_stand_revival":
+            dead = [pid for pid, p in players.items() if not p["is_alive"]]
+            if alive and dead:
+                await self.client.post("vote_revival", self.game.code, {"voter_id": self.player_id, "target_id": dead[0]})
+            if self.is_admin:
+                await asyncio.sleep(random.uniform(*self.think))
+                await self.submit("advance_revival", {"player_id": self.player_id}, idx)
+        elif status == "results" and self.is_admin:
+            self.game.start_transition()
+            await self.client.post("next_round", self.game.code, {})
+
+
+async def play_game(client: Client, metrics: Metrics, players: int, think: tuple[float, float], timeout: float):
+    response = await client.call("POST", "create_game", body={})
+    if response is None or response.status_code >= 400:
+        metrics.games_failed += 1
+        return
+    code = response.json()["code"]
+    metrics.codes.append(code)
+    game = Game(code, metrics)
+
+    joins = await asyncio.gather(*[
+        client.call("POST", "join_game", params={"code": code}, body={"name": f"Bot {i + 1}"})
+        for i in range(players)
+    ])
+    bots = []
+    for response in joins:
+        if response is None or response.status_code >= 400:
+            continue
+        data = response.json()
+        bots.append(Bot(client, game, data["player_id"], data["is_admin"], think))
+    if not bots:
+        metrics.games_failed += 1
+        return
+    await asyncio.gather(*[
+        client.post("enter_lobby", code, {"player_id": bot.player_id}) for bot in bots
+    ])
+
+    await asyncio.sleep(random.uniform(*think))
+    game.start_transition()
+    if not await client.post("start_game", code, {}):
+        metrics.games_failed += 1
+        return
+
+    runners = [asyncio.create_task(bot.run()) for bot in bots]
+    try:
+        await asyncio.wait_for(game.finished.wait(), timeout=timeout)
+        metrics.games_finished += 1
+    except asyncio.TimeoutError:
+        print(f"LOAD: Game {code} timed out after {timeout:.0f}s", flush=True)
+        metrics.games_failed += 1
+        game.finished.set()
+    await asyncio.gather(*runners, return_exceptions=True)
+
+
+async def fetch_json(http: httpx.AsyncClient, url: str) -> dict | None:
+    try:
+        response = await http.get(url)
+        response.raise_for_status()
+        return response.json()
+    except (httpx.HTTPError, json.JSONDecodeError):
+        return None
+
+
+def report(metrics: Metrics, elapsed: float, retries_before: dict | None, retries_after: dict | None,
+           upstream: dict | None, server_metrics: dict | None = None, spends: list[dict] | None = None):
+    def ms(value):
+        return "-" if value is None else f"{value * 1000:.0f}"
+
+    print(f"\n=== {metrics.games_finished} games finished, {metrics.games_failed} failed in {elapsed:.1f}s ===")
+    print(f"{'endpoint':28} {'count':>7} {'errors':>7} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8}")
+    for endpoint in sorted(metrics.latencies):
+        values = metrics.latencies[endpoint]
+        errors = sum(n for status, n in metrics.statuses[endpoint].items()
+                     if not isinstance(status, int) or status >= 400)
+        print(f"{endpoint:28} {len(values):>7} {errors:>7} "
+              f"{ms(percentile(values, 50)):>8} {ms(percentile(values, 95)):>8} {ms(percentile(values, 99)):>8}")
+
+    for label, values in (("round transition", metrics.round_transitions), ("judgement", metrics.judgements)):
+        print(f"{label:28} {len(values):>7} {'':>7} "
+              f"{ms(percentile(values, 50)):>8} {ms(percentile(values, 95)):>8} {ms(percentile(values, 99)):>8}")
+
+    if retries_before and retries_after:
+        calls = retries_after["calls"] - retries_before["calls"]
+        retries = retries_after["retries"] - retries_before["retries"]
+        exhausted = retries_after["exhausted"] - retries_before["exhausted"]
+        print(f"\nupdate_game_with_retry ({retries_after.get('write_mode')}): {calls} calls, "
+              f"{retries} retries, {exhausted} exhausted (per container - may undercount on multi-container deploys)")
+    if server_metrics and server_metrics.get("spans"):
+        # Bucket upper bounds, cumulative since the server started (per container)
+        print(f"\n{'server span':28} {'round type':>16} {'count':>7} {'errors':>7} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8}")
+        for name, by_round_type in sorted(server_metrics["spans"].items()):
+            for round_type, stats in sorted(by_round_type.items()):
+                bounds = [stats[q] if stats[q] is not None else ">max" for q in ("p50_ms", "p95_ms", "p99_ms")]
+                print(f"{name:28} {round_type:>16} {stats['count']:>7} {stats['errors']:>7} "
+                      f"{bounds[0]:>8} {bounds[1]:>8} {bounds[2]:>8}")
+    if spends:
+        columns = ("llm_calls", "prompt_tokens", "completion_tokens", "images", "video_seconds", "usd")
+        by_round_type = defaultdict(lambda: defaultdict(float))
+        for game_spend in spends:
+            for round_type, breakdown in game_spend["round_types"].items():
+                for name in columns:
+                    by_round_type[round_type][name] += breakdown["totals"].get(name, 0)
+        print(f"\n{'spend (' + str(len(spends)) + ' games)':28} " + " ".join(f"{name:>17}" for name in columns))
+        for round_type, totals in sorted(by_round_type.items()):
+            print(f"{round_type:28} " + " ".join(
+                f"{totals[name]:>17.4f}" if name == "usd" else f"{totals[name]:>17.0f}" for name in columns))
+        total_usd = sum(game_spend["totals"].get("usd", 0) for game_spend in spends)
+        print(f"{'USD per game':28} {total_usd / len(spends):>17.4f}")
+    if upstream:
+        print(f"\nupstream: {json.dumps(upstream)}")
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="Simulate concurrent SurvAIve games end to end")
+    parser.add_argument("--base-url", default="http://127.0.0.1:8000")
+    parser.add_argument("--games", type=int, default=5, help="Concurrent games (M)")
+    parser.add_argument("--players", type=int, default=4, help="Players per game (N)")
+    parser.add_argument("--think-min", type=float, default=3.0, help="Min think time before acting (s)")
+    parser.add_argument("--think-max", type=float, default=12.0, help="Max think time before acting (s)")
+    parser.add_argument("--ramp", type=float, default=10.0, help="Spread game creation over this many seconds")
+    parser.add_argument("--game-timeout", type=float, default=1800.0, help="Give up on a game after this long (s)")
+    parser.add_argument("--spend-wait", type=float, default=6.0,
+                        help="Wait for containers to publish spend meters before reading /api/spend (s)")
+    parser.add_argument("--upstream-stats", help="fake_upstream /stats URL to include in the report")
+    parser.add_argument("--seed", type=int)
+    args = parser.parse_args()
+
+    random.seed(args.seed)
+    metrics = Metrics()
+    limits = httpx.Limits(max_connections=args.games * args.players * 2)
+    async with httpx.AsyncClient(base_url=args.base_url, timeout=120.0, limits=limits) as http:
+        client = Client(http, metrics)
+        retries_before = await fetch_json(http, "/api/update_stats")
+
+        async def delayed_game(i: int):
+            await asyncio.sleep(args.ramp * i / max(1, args.games))
+            await play_game(client, metrics, args.players, (args.think_min, args.think_max), args.game_timeout)
+
+        print(f"LOAD: {args.games} games x {args.players} players against {args.base_url}", flush=True)
+        start = time.perf_counter()
+        await asyncio.gather(*[delayed_game(i) for i in range(args.games)])
+        elapsed = time.perf_counter() - start
+
+        retries_after = await fetch_json(http, "/api/update_stats")
+        server_metrics = await fetch_json(http, "/api/metrics")
+        await asyncio.sleep(args.spend_wait)
+        spends = [await fetch_json(http, f"/api/spend?code={code}") for code in metrics.codes]
+        upstream = await fetch_json(http, args.upstream_stats) if args.upstream_stats else None
+
+    report(metrics, elapsed, retries_before, retries_after, upstream, server_metrics,
+           [game_spend for game_spend in spends if game_spend])
+
+
+if __name__ == "__main__":
+    asyncio.run(main())